@@ -1,14 +1,18 @@
 """
 Main module in the AcademicNet Dash application.
 Initializes the Dash app, loads organization data, sets up layout and callbacks.
+The default organization is prepared in the background; /ready reports
+whether caches are warm (200) or still cold (503).
 """
 
 from dash import Dash
+from flask import jsonify
 import logging
 
 from src.orgs import load_orgs
 from src.layout import base_layout
 from src.callbacks import get_callbacks
+from src.warmup import start_warmup, readiness
 
 # Default constants
 DEFAULT_ORG = '14346'
@@ -35,12 +39,21 @@ def create_app() -> Dash:
     # Loading organization dropdown options and name mapping
     org_map, org_name_map = load_orgs()
 
-    # Build layout
+    # Build layout (empty shell, filled on page load)
     app.layout = base_layout(org_map, DEFAULT_ORG)
 
     # Register сallbacks
     get_callbacks(app, org_name_map)
 
+    # Prepare default organization without blocking startup
+    start_warmup([DEFAULT_ORG])
+
+    @app.server.route('/ready')
+    def ready():
+        """Readiness probe for the load balancer."""
+        state = readiness()
+        return jsonify(state), 200 if state['ready'] else 503
+
     return app
 
 
@@ -0,0 +1,316 @@
+/*
+ * Helpers shared by clientside callbacks.
+ *
+ * The server sends the graph as compact columns (see 'graph-data' store):
+ * Cytoscape elements are built here, and node metrics are joined into
+ * element data only for the metrics currently used for size and color.
+ * Large graphs are filtered server-side: their edges carry original IDs,
+ * rows of hidden nodes are listed in 'hidden', and control changes
+ * arrive as deltas applied by applyDelta. Large full graphs carry a grid
+ * index of node coordinates ('grid') and are rendered by viewport.
+ */
+window.graphViewer = (function () {
+    // Capitalize every word, as Python str.title() does for author names
+    function titleCase(name) {
+        return String(name)
+            .toLowerCase()
+            .replace(/\p{L}+/gu, w => w.charAt(0).toUpperCase() + w.slice(1));
+    }
+
+    // Cytoscape node of row 'i'
+    function nodeElement(nodes, i) {
+        return {
+            data: {
+                id: nodes.id[i],
+                label: titleCase(nodes.id[i]),
+                row: i,
+                cluster: nodes.cluster[i],
+                color: nodes.color[i],
+                max_edge_weight: nodes.max_edge_weight[i],
+            },
+            position: { x: nodes.x[i], y: nodes.y[i] },
+        };
+    }
+
+    // Cytoscape edge 'k'; edge color is the color of its first author.
+    // Filtered edges keep the ID of their position in the whole graph
+    function edgeElement(nodes, edges, k) {
+        const source = edges.source[k];
+        return {
+            data: {
+                id: `edge-${edges.id ? edges.id[k] : k}`,
+                source: nodes.id[source],
+                target: nodes.id[edges.target[k]],
+                weight: edges.weight[k],
+                color: nodes.color[source],
+            },
+        };
+    }
+
+    // Build Cytoscape nodes and edges from the columnar graph data,
+    // without nodes hidden by the server-side filter
+    function buildElements(graphData) {
+        const nodes = graphData.nodes;
+        const edges = graphData.edges;
+        const hidden = new Uint8Array(nodes.id.length);
+        (graphData.hidden || []).forEach(i => { hidden[i] = 1; });
+
+        const elements = [];
+        for (let i = 0; i < nodes.id.length; i++) {
+            if (!hidden[i]) elements.push(nodeElement(nodes, i));
+        }
+        for (let k = 0; k < edges.weight.length; k++) {
+            elements.push(edgeElement(nodes, edges, k));
+        }
+        return elements;
+    }
+
+    // Cytoscape elements of the aggregated cluster view: supernodes
+    // (IDs 'cluster-N', flagged 'supernode') and edges between clusters
+    function clusterElements(graphData) {
+        const clusters = graphData.clusters;
+        if (!clusters) return [];
+        const nodes = clusters.nodes;
+        const edges = clusters.edges;
+
+        const elements = [];
+        for (let i = 0; i < nodes.cluster.length; i++) {
+            elements.push({
+                data: {
+                    id: `cluster-${nodes.cluster[i]}`,
+                    label: `Кластер ${nodes.cluster[i]}`,
+                    cluster: nodes.cluster[i],
+                    color: nodes.color[i],
+                    authors: nodes.authors[i],
+                    size: nodes.size[i],
+                    supernode: true,
+                },
+                position: { x: nodes.x[i], y: nodes.y[i] },
+            });
+        }
+        for (let k = 0; k < edges.weight.length; k++) {
+            elements.push({
+                data: {
+                    id: `cluster-edge-${k}`,
+                    source: `cluster-${nodes.cluster[edges.source[k]]}`,
+                    target: `cluster-${nodes.cluster[edges.target[k]]}`,
+                    weight: edges.weight[k],
+                    color: nodes.color[edges.source[k]],
+                },
+            });
+        }
+        return elements;
+    }
+
+    // Node rows of cluster 'cl'
+    function clusterRows(graphData, cl) {
+        const rows = [];
+        graphData.nodes.cluster.forEach((c, i) => { if (c === cl) rows.push(i); });
+        return rows;
+    }
+
+    // Elements of the subgraph induced by node 'rows': the nodes and
+    // every edge with both ends among them, in one pass over the edges
+    function inducedSubgraph(graphData, rows) {
+        const nodes = graphData.nodes;
+        const edges = graphData.edges;
+        const selected = new Uint8Array(nodes.id.length);
+        rows.forEach(i => { selected[i] = 1; });
+
+        const elements = [];
+        for (let i = 0; i < nodes.id.length; i++) {
+            if (selected[i]) elements.push(nodeElement(nodes, i));
+        }
+        for (let k = 0; k < edges.weight.length; k++) {
+            if (selected[edges.source[k]] && selected[edges.target[k]]) {
+                elements.push(edgeElement(nodes, edges, k));
+            }
+        }
+        return elements;
+    }
+
+    // Induced subgraph of every cluster, ordered by cluster number:
+    // nodes are grouped by their cluster, and each edge goes to the
+    // cluster of its ends when both ends share it
+    function splitByClusters(graphData) {
+        const nodes = graphData.nodes;
+        const edges = graphData.edges;
+        const groups = new Map();
+        const groupOf = cl => {
+            if (!groups.has(cl)) groups.set(cl, { cluster: cl, nodes: [], edges: [] });
+            return groups.get(cl);
+        };
+
+        for (let i = 0; i < nodes.id.length; i++) {
+            const cl = nodes.cluster[i];
+            if (cl === null || cl === undefined) continue;
+            groupOf(cl).nodes.push(nodeElement(nodes, i));
+        }
+        for (let k = 0; k < edges.weight.length; k++) {
+            const cl = nodes.cluster[edges.source[k]];
+            if (cl === null || cl === undefined || cl !== nodes.cluster[edges.target[k]]) continue;
+            groupOf(cl).edges.push(edgeElement(nodes, edges, k));
+        }
+
+        return Array.from(groups.values())
+            .sort((a, b) => a.cluster - b.cluster)
+            .map(g => ({ cluster: g.cluster, elements: g.nodes.concat(g.edges) }));
+    }
+
+    // Rows of shown nodes in grid cells intersecting box {x1, y1, x2, y2}
+    function gridRows(graphData, box) {
+        const grid = graphData.grid;
+        const hidden = new Set(graphData.hidden || []);
+        const cellOf = (v, v0) => Math.min(grid.side - 1, Math.max(0, Math.floor((v - v0) / grid.cell)));
+        const cx1 = cellOf(box.x1, grid.x0), cx2 = cellOf(box.x2, grid.x0);
+        const cy1 = cellOf(box.y1, grid.y0), cy2 = cellOf(box.y2, grid.y0);
+
+        const rows = [];
+        for (let cy = cy1; cy <= cy2; cy++) {
+            for (let cx = cx1; cx <= cx2; cx++) {
+                const c = cy * grid.side + cx;
+                for (let k = grid.offsets[c]; k < grid.offsets[c + 1]; k++) {
+                    if (!hidden.has(grid.rows[k])) rows.push(grid.rows[k]);
+                }
+            }
+        }
+        return rows;
+    }
+
+    // Opening viewport of a streamed graph: the central part of the grid
+    function initialBox(graphData) {
+        const grid = graphData.grid;
+        const span = grid.cell * grid.side;
+        const quarter = span / 4;
+        return {
+            x1: grid.x0 + span / 2 - quarter / 2,
+            y1: grid.y0 + span / 2 - quarter / 2,
+            x2: grid.x0 + span / 2 + quarter / 2,
+            y2: grid.y0 + span / 2 + quarter / 2,
+        };
+    }
+
+    // Elements to add to 'currentElements' when the viewport moves to
+    // 'extent': nodes near it (a quarter of the extent as margin) that
+    // are not shown yet, and edges joining them to shown nodes
+    function streamElements(graphData, currentElements, extent) {
+        const nodes = graphData.nodes;
+        const edges = graphData.edges;
+        const mx = extent.w / 4, my = extent.h / 4;
+        const box = { x1: extent.x1 - mx, y1: extent.y1 - my, x2: extent.x2 + mx, y2: extent.y2 + my };
+
+        const shown = new Uint8Array(nodes.id.length);
+        currentElements.forEach(e => {
+            if (e.data && e.data.row !== undefined && e.data.row !== null) shown[e.data.row] = 1;
+        });
+        const added = new Uint8Array(nodes.id.length);
+        const elements = [];
+        gridRows(graphData, box).forEach(i => {
+            if (shown[i]) return;
+            added[i] = 1;
+            shown[i] = 1;
+            elements.push(nodeElement(nodes, i));
+        });
+        if (!elements.length) return elements;
+
+        for (let k = 0; k < edges.weight.length; k++) {
+            const a = edges.source[k], b = edges.target[k];
+            if ((added[a] || added[b]) && shown[a] && shown[b]) {
+                elements.push(edgeElement(nodes, edges, k));
+            }
+        }
+        return elements;
+    }
+
+    // Full graph elements: the whole graph, or for a streamed graph the
+    // subgraph induced by the opening viewport or the given node rows
+    function fullElements(graphData, rows) {
+        if (!graphData.grid) return buildElements(graphData);
+        const hidden = new Set(graphData.hidden || []);
+        const shownRows = rows
+            ? rows.filter(i => !hidden.has(i))
+            : gridRows(graphData, initialBox(graphData));
+        return inducedSubgraph(graphData, shownRows);
+    }
+
+    // Same state of the server-side filter
+    function sameFilter(a, b) {
+        if (!a || !b) return false;
+        return ['threshold', 'isolates', 'metric', 'vmin', 'vmax']
+            .every(k => (a[k] ?? null) === (b[k] ?? null));
+    }
+
+    // Graph data with a server-side filter delta applied: removed edges
+    // are dropped, added ones appended, and hidden rows updated
+    function applyDelta(graphData, delta) {
+        const edges = graphData.edges;
+        const removed = new Set(delta.removeEdges);
+        const patched = { id: [], source: [], target: [], weight: [] };
+        for (let k = 0; k < edges.id.length; k++) {
+            if (removed.has(edges.id[k])) continue;
+            patched.id.push(edges.id[k]);
+            patched.source.push(edges.source[k]);
+            patched.target.push(edges.target[k]);
+            patched.weight.push(edges.weight[k]);
+        }
+        const added = delta.addEdges;
+        for (let k = 0; k < added.id.length; k++) {
+            patched.id.push(added.id[k]);
+            patched.source.push(added.source[k]);
+            patched.target.push(added.target[k]);
+            patched.weight.push(added.weight[k]);
+        }
+
+        const hidden = new Set(graphData.hidden || []);
+        delta.showNodes.forEach(i => hidden.delete(i));
+        delta.hideNodes.forEach(i => hidden.add(i));
+
+        return {
+            ...graphData,
+            edges: patched,
+            hidden: Array.from(hidden),
+            filter: delta.to,
+            revision: (graphData.revision || 0) + 1,
+        };
+    }
+
+    // Metric value of the node in row 'row'
+    function metricValue(graphData, metric, row) {
+        const values = graphData && graphData.metrics && graphData.metrics[metric];
+        return values ? values[row] : undefined;
+    }
+
+    // Copy elements, setting 'val' to the size metric and the color
+    // metric under its own name; other joined metrics are dropped
+    function joinMetrics(elements, graphData, sizeMetric, colorMetric) {
+        const metrics = (graphData && graphData.metrics) || {};
+        const sizeValues = metrics[sizeMetric] || metrics.Links;
+        const colorValues = colorMetric ? metrics[colorMetric] : null;
+
+        return elements.map(e => {
+            if (!e.data || e.data.row === undefined || e.data.row === null) {
+                return e;
+            }
+            const data = { ...e.data };
+            Object.keys(metrics).forEach(m => { delete data[m]; });
+            if (sizeValues) data.val = sizeValues[data.row];
+            if (colorValues) data[colorMetric] = colorValues[data.row];
+            return { ...e, data: data };
+        });
+    }
+
+    return {
+        titleCase: titleCase,
+        buildElements: buildElements,
+        clusterElements: clusterElements,
+        streamElements: streamElements,
+        fullElements: fullElements,
+        clusterRows: clusterRows,
+        inducedSubgraph: inducedSubgraph,
+        splitByClusters: splitByClusters,
+        sameFilter: sameFilter,
+        applyDelta: applyDelta,
+        metricValue: metricValue,
+        joinMetrics: joinMetrics,
+    };
+})();
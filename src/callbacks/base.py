@@ -5,8 +5,12 @@ Registers all application callbacks.
 from .canvas_callbacks import canvas_callbacks
 from .graph_callbacks import graph_callbacks
 from .overlay_callbacks import overlay_callbacks
+from .search_callbacks import search_callbacks
+from .stats_callbacks import stats_callbacks
 from .tooltip_callbacks import tooltip_callbacks
 from .upload_org import upload_org
+from .viewport_callbacks import viewport_callbacks
+from .visibility_callbacks import visibility_callbacks
 
 def get_callbacks(app, org_name_map):
     """
@@ -21,3 +25,7 @@ def get_callbacks(app, org_name_map):
     graph_callbacks(app)
     tooltip_callbacks(app)
     canvas_callbacks(app)
+    stats_callbacks(app)
+    visibility_callbacks(app)
+    viewport_callbacks(app)
+    search_callbacks(app)
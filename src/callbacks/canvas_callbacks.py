@@ -9,19 +9,22 @@ def canvas_callbacks(app):
     Registers all clientside callbacks for canvas management:
       - creating new canvases from selected nodes
       - rendering tabs and canvas list
+      - rendering the full graph, the cluster view or a canvas
+        from the compact graph data (large full graphs by viewport,
+        see viewport_callbacks)
+      - opening the canvas of a cluster by tapping its supernode
       - switching, renaming, deleting, duplicating canvases
       - clearing and splitting by clusters
     """
     # Create a new canvas from selected nodes
     app.clientside_callback(
         """
-        function(nClicks, selectedNodes, store) {
+        function(nClicks, selectedNodes, store, graphData) {
             if (nClicks < 1) {
                 return [window.dash_clientside.no_update, {'display': 'none'}, ''];
             }
 
             // Unpack store
-            const full = (store && store.full) || [];
             const canvases = (store && store.canvases) || [];
 
             // Error: already 50 canvas 
@@ -52,16 +55,13 @@ def canvas_callbacks(app):
                 ];
             }
 
-            // Get ID selected nodes
+            // Get rows of selected nodes
             const selected = selectedNodes.slice(0, 300);
-            const nodesIDs = selected.map(n => n.id);
+            const rows = selected.map(n => n.row).filter(row => row !== undefined && row !== null);
 
-            // Filter nodes & edges
-            const nodes = full.filter(e => e.data && nodesIDs.includes(e.data.id)).map(e => ({ ...e }));
-            const edges = full.filter(e => e.data && e.data.source
-                            && nodesIDs.includes(e.data.source)
-                            && nodesIDs.includes(e.data.target))
-                            .map(e => ({ ...e }));
+            // Subgraph induced by the selected nodes
+            const elements = graphData ? window.graphViewer.inducedSubgraph(graphData, rows) : [];
+            const nodes = elements.filter(e => !('source' in e.data));
 
             // Save positions only for selected nodes
             const positions = {};
@@ -74,16 +74,15 @@ def canvas_callbacks(app):
             const newCanvas = {
                 id: `canvas-${indx}`,
                 name: `Холст ${indx}`,
-                elements: nodes.concat(edges),
+                elements: elements,
                 positions: positions
             };
 
             return [
                 {
-                    full: full,
+                    version: store.version,
                     canvases: canvases.concat(newCanvas).slice(-50),
                     nextCanvasIndex: indx,
-                    fullPubInfo: store.fullPubInfo,
                 }, 
                 {
                     'display': 'none'
@@ -101,6 +100,7 @@ def canvas_callbacks(app):
         [
             State('network-graph', 'selectedNodeData'),
             State('canvas-store', 'data'),
+            State('graph-data', 'data'),
         ],
         prevent_initial_call=True
     )
@@ -120,14 +120,17 @@ def canvas_callbacks(app):
 
             const slides = (store && store.canvases) || [];
 
-            const tabs = [ makeTab('Полный граф', 'full') ];
+            const tabs = [ makeTab('Полный граф', 'full'), makeTab('Кластеры', 'clusters') ];
             slides.forEach(c => {
                 tabs.push(makeTab(c.name, c.id));
             });
 
             const options = [];
             const optionsOverlay = [];
-            const allCanvases = [{ id: 'full', name: 'Полный граф' }].concat(slides);
+            const allCanvases = [
+                { id: 'full', name: 'Полный граф' },
+                { id: 'clusters', name: 'Кластеры' },
+            ].concat(slides);
 
             allCanvases.forEach(c => {
                 // label
@@ -184,7 +187,8 @@ def canvas_callbacks(app):
     app.clientside_callback(
         """
         function(newTab, store, currentElements, prevTab) {
-            if (!store) {
+            // No switch: the tab was set along with the active canvas
+            if (!store || newTab === prevTab) {
                 return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
             }
 
@@ -230,272 +234,223 @@ def canvas_callbacks(app):
         prevent_initial_call=True
     )
 
-    # Update info panel when active canvas changes
+    # Update info panel when active canvas changes: the name is built here,
+    # statistics of the node rows are computed server-side (stats_callbacks)
     app.clientside_callback(
         """
-        function(activeID, store, currentName, currentFig) {
-            if (!store) {
-                return [
-                    window.dash_clientside.no_update,
-                    window.dash_clientside.no_update,
-                    window.dash_clientside.no_update,
-                    window.dash_clientside.no_update,
-                    window.dash_clientside.no_update,
-                    window.dash_clientside.no_update,
-                    window.dash_clientside.no_update
-                ];
+        function(activeID, store, graphData, currentName) {
+            if (!store || !graphData) {
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
             }
 
-            // pick elements depending on active canvas
-            let elements = [];
+            // pick node rows depending on active canvas
+            let rows = null;
+            let minAuthors = 1;
+            let canvas = null;
 
-            if (activeID === 'full' || !activeID) {
-                elements = store.full || [];
-            } else {
-                const canvas = (store.canvases || []).find(c => c.id === activeID);
+            // The cluster view shows the whole organization too
+            if (activeID && activeID !== 'full' && activeID !== 'clusters') {
+                canvas = (store.canvases || []).find(c => c.id === activeID);
                 if (!canvas) {
-                    return [
-                        window.dash_clientside.no_update,
-                        window.dash_clientside.no_update,
-                        window.dash_clientside.no_update,
-                        window.dash_clientside.no_update,
-                        window.dash_clientside.no_update,
-                        window.dash_clientside.no_update,
-                        window.dash_clientside.no_update
-                    ];
-                }
-                elements = canvas.elements || [];
-            }
-
-            const nodes = elements.filter(e => e && e.data && !('source' in e.data));
-
-            const numAuthors = nodes.length;
-
-            // Build counts of pubIDs among nodes in the selected elements
-            const pubCount = new Map();
-            nodes.forEach(n => {
-                if (n.data && n.data.pub_ids) {
-                    const arr = n.data.pub_ids;
-                    for (let pubID of arr) {
-                        if (pubID === null || pubID === undefined) continue;
-                        const key = String(pubID);
-                        pubCount.set(key, (pubCount.get(key) || 0) + 1);
-                    }
-                }
-            });
-
-            const pubSet = new Set();
-            if (activeID === 'full' || !activeID) {
-                for (let [k, cnt] of pubCount.entries()) pubSet.add(k);
-            } else {
-                for (let [k, cnt] of pubCount.entries()) {
-                    if (cnt >= 2) pubSet.add(k);
-                }
-            }
-
-            const numPubs = pubSet.size;
-
-            // Sum citations
-            let cntCites = 0;
-            const citesArr = [];
-            const pubInfo = store.fullPubInfo || {};
-
-            pubSet.forEach(pubID => {
-                const info = pubInfo[pubID];
-                let c = 0;
-                if (info) {
-                    if (info['Cited by'] !== undefined) c = Number(info['Cited by']);
-                }
-                if (isNaN(c)) c = 0;
-                cntCites += c;
-                citesArr.push(c);
-            });
-
-            // Compute h-index
-            citesArr.sort((a,b) => b - a);
-            let h = 0;
-            for (let i = 0; i < citesArr.length; i++) {
-                if (citesArr[i] >= i + 1){
-                    h = i + 1;
-                } else {
-                    break;
+                    return [window.dash_clientside.no_update, window.dash_clientside.no_update];
                 }
+                rows = (canvas.elements || [])
+                    .filter(e => e && e.data && !('source' in e.data))
+                    .map(e => e.data.row);
+                minAuthors = 2;
             }
 
             // Build name
             const orgName = currentName.split(',')[0].trim() || '';
             let org_name = orgName;
-            if (activeID && activeID !== 'full') {
-                const canvas = (store.canvases || []).find(c => c.id === activeID);
-                if (canvas && canvas.name) {
-                    org_name = orgName ? (orgName + ', ' + canvas.name) : canvas.name;
-                }
-            }
-            
-            const clusterSet = new Set();
-            nodes.forEach(n => {
-                if (n.data && n.data.cluster !== undefined && n.data.cluster !== null) {
-                    clusterSet.add(n.data.cluster);
-                }
-            });
-            const numClusters = clusterSet.size;
-            
-            const orgInfoAuthors = `Авторов: ${numAuthors}`;
-            const orgInfoPub = `Публикаций: ${numPubs}`;
-            const orgInfoClusters = `Кластеров: ${numClusters}`;
-            const orgInfoCites = `Цитирований: ${cntCites}`;
-            const orgInfoHindex = `Индекс Хирша: ${h}`;
-
-            // Build timeseries (years / counts) for the selected pubSet
-            let baseX = null;
-            if (currentFig && currentFig.data && currentFig.data.length > 0) {
-                const xval = currentFig.data[0].x;
-                if (Array.isArray(xval)) {
-                    baseX = xval.slice();
-                } else if (xval && typeof xval === 'object' && Array.isArray(xval.values)) {
-                    baseX = xval.values.slice();
-                } else {
-                    baseX = null;
-                }
-            }
-            
-            if (!baseX) {
-            let minY = null, maxY = null;
-            pubSet.forEach(pid => {
-                    const info = pubInfo[String(pid)] || pubInfo[pid] || null;
-                    if (!info) return;
-                    const y = Number(info['Year'] || info['year']);
-                    if (!isFinite(y)) return;
-                    if (minY === null || y < minY) minY = y;
-                    if (maxY === null || y > maxY) maxY = y;
-                });
-                if (minY === null) {
-                    baseX = [];
-                } else {
-                    baseX = [];
-                    for (let y = minY; y <= maxY; y++) baseX.push(y);
-                }
-            } else {
-                baseX = baseX.map(v => {
-                    const n = Number(v);
-                    return isFinite(n) ? n : v;
-                });
-            }
-
-            // build year counts
-            const yearCounts = {};
-            pubSet.forEach(pid => {
-                const info = pubInfo[String(pid)] || pubInfo[pid] || null;
-                if (!info) return;
-                const y = Number(info['Year'] || info['year']);
-                if (!isFinite(y)) return;
-                yearCounts[y] = (yearCounts[y] || 0) + 1;
-            });
-
-            // y aligned with baseX
-            const newY = baseX.map(yy => yearCounts[yy] || 0);
-
-            // clone & update only data[0].x/y
-            let newFig = null;
-            if (!currentFig) {
-                newFig = {
-                    data: [{
-                        x: baseX,
-                        y: newY,
-                        type: 'scatter',
-                        mode: 'lines',
-                        line: { color: '#EEECE3', width: 2 },
-                        fill: 'none',
-                        connectgaps: true,
-                        hoverinfo: 'x+y'
-                    }],
-                    layout: { height: 200, paper_bgcolor: '#373539', plot_bgcolor: '#373539' }
-                };
-            } else {
-                newFig = JSON.parse(JSON.stringify(currentFig));
-                if (!newFig.data || newFig.data.length === 0) {
-                    newFig.data = [{
-                        x: baseX, y: newY, type: 'scatter', mode: 'lines',
-                        line: { color: '#EEECE3', width: 2 }, fill: 'none', connectgaps: true, hoverinfo: 'x+y'
-                    }];
-                } else {
-                    newFig.data[0].x = baseX;
-                    newFig.data[0].y = newY;
-                    newFig.data[0].type = newFig.data[0].type || 'scatter';
-                    newFig.data[0].mode = 'lines';
-                    newFig.data[0].fill = newFig.data[0].fill || 'none';
-                    newFig.data[0].connectgaps = true;
-                    if (!newFig.data[0].line) newFig.data[0].line = { color: '#EEECE3', width: 2 };
-                }
+            if (canvas && canvas.name) {
+                org_name = orgName ? (orgName + ', ' + canvas.name) : canvas.name;
             }
 
             return [
                 org_name,
-                orgInfoAuthors,
-                orgInfoPub,
-                orgInfoClusters,
-                orgInfoCites,
-                orgInfoHindex,
-                newFig
+                {version: graphData.version, rows: rows, minAuthors: minAuthors}
             ];
         }
         """,
         [
             Output('name-organization', 'children', allow_duplicate=True),
-            Output('info-organization-authors', 'children', allow_duplicate=True),
-            Output('info-organization-publications', 'children', allow_duplicate=True),
-            Output('info-organization-cluster', 'children', allow_duplicate=True),
-            Output('info-organization-cites', 'children', allow_duplicate=True),
-            Output('info-organization-hindex', 'children', allow_duplicate=True),
-            Output('info-organization-graph', 'figure', allow_duplicate=True),
+            Output('canvas-selection', 'data'),
         ],
         Input('active-canvas', 'data'),
         [
             State('canvas-store', 'data'),
+            State('graph-data', 'data'),
             State('name-organization', 'children'),
-            State('info-organization-graph', 'figure'),
         ],
         prevent_initial_call=True
     )
 
-    # Render selected canvas elements
+    # Render graph: build the full graph or the cluster view of a new
+    # organization, show the selected canvas, and join node metrics
+    # used for size and color. Replacing the view refits the viewport;
+    # patching the full graph in place keeps it (layout without fit)
     app.clientside_callback(
         """
-        function(activeID, store) {
-            if (!store) {
-                return window.dash_clientside.no_update;
+        function(graphData, activeID, sizeValue, colorValue, store, currentElements, extent) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!graphData || !store) {
+                return [noUpdate, noUpdate, noUpdate];
+            }
+            const viewer = window.graphViewer;
+            const triggered = window.dash_clientside.callback_context.triggered.map(t => t.prop_id);
+            const join = els => viewer.joinMetrics(els, graphData, sizeValue, colorValue);
+            const withPositions = (els, positions) => els.map(e => {
+                if (e.data && e.data.id && positions[e.data.id]) {
+                    return {...e, position: positions[e.data.id]};
+                }
+                return e;
+            });
+            const fit = {name: 'preset'};
+            const keepViewport = {name: 'preset', fit: false};
+
+            // Server-side filter delta applied: rebuild the full graph
+            // keeping node positions; canvases keep their elements
+            if (triggered.includes('graph-data.data') && graphData.revision > 0) {
+                if (activeID !== 'full') {
+                    return [noUpdate, noUpdate, noUpdate];
+                }
+                const shown = currentElements || [];
+                const shownPos = {};
+                const shownRows = [];
+                shown.forEach(el => {
+                    if (el.data && el.data.id && el.position) {
+                        shownPos[el.data.id] = el.position;
+                    }
+                    if (el.data && el.data.row !== undefined && el.data.row !== null) {
+                        shownRows.push(el.data.row);
+                    }
+                });
+                let elements = viewer.fullElements(graphData, shownRows);
+                if (graphData.grid && extent) {
+                    elements = elements.concat(viewer.streamElements(graphData, elements, extent));
+                }
+                return [join(withPositions(elements, shownPos)), noUpdate, keepViewport];
+            }
+
+            // New organization: build the opening view and reset canvases
+            if (triggered.includes('graph-data.data')) {
+                const newStore = {
+                    version: graphData.version,
+                    canvases: [],
+                    nextCanvasIndex: 0,
+                };
+                if (activeID === 'clusters') {
+                    return [viewer.clusterElements(graphData), newStore, fit];
+                }
+                return [join(viewer.fullElements(graphData)), newStore, fit];
+            }
+
+            // Size or color metric changed: update shown elements in place
+            if (!triggered.includes('active-canvas.data')) {
+                return [join(currentElements || []), noUpdate, noUpdate];
+            }
+
+            // Cluster view: supernodes carry no node metrics
+            if (activeID === 'clusters') {
+                return [viewer.clusterElements(graphData), noUpdate, fit];
             }
 
             // Return full graph
             if (activeID === 'full') {
-                const fullCanvas = store.full || [];
                 const fullPos = store.fullPositions || {};
-                return fullCanvas.map(e => {
-                    if (e.data && e.data.id && fullPos[e.data.id]) {
-                        return {...e, position: fullPos[e.data.id]};
-                    }
-                    return e;
-                });
+                return [join(withPositions(viewer.fullElements(graphData), fullPos)), noUpdate, fit];
             }
 
             // Search canvas
             const canvas = (store.canvases || []).find(s => s.id === activeID);
-            if (!canvas) {
-                return window.dash_clientside.no_update;
+            if (!canvas || store.version !== graphData.version) {
+                return [noUpdate, noUpdate, noUpdate];
             }
 
             // For Cytoscape: return elements with positions
-            return canvas.elements.map(e => {
-                if (e.data && e.data.id && canvas.positions[e.data.id]) {
-                    return { ...e, position: canvas.positions[e.data.id] };
-                }
-                return e;
-            });
+            return [join(withPositions(canvas.elements, canvas.positions || {})), noUpdate, fit];
         }
         """,
-        Output('network-graph', 'elements', allow_duplicate=True),
-        Input('active-canvas', 'data'),
-        State('canvas-store', 'data'),
+        [
+            Output('network-graph', 'elements', allow_duplicate=True),
+            Output('canvas-store', 'data', allow_duplicate=True),
+            Output('network-graph', 'layout'),
+        ],
+        [
+            Input('graph-data', 'data'),
+            Input('active-canvas', 'data'),
+            Input('size-dropdown', 'value'),
+            Input('color-by-dropdown', 'value'),
+        ],
+        [
+            State('canvas-store', 'data'),
+            State('network-graph', 'elements'),
+            State('network-graph', 'extent'),
+        ],
+        prevent_initial_call=True
+    )
+
+    # Drill down from the cluster view: tapping a supernode opens the
+    # canvas of its cluster, creating it from the induced subgraph once
+    app.clientside_callback(
+        """
+        function(nodeData, store, graphData) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!nodeData || !nodeData.supernode || !store || !graphData) {
+                return [noUpdate, noUpdate, noUpdate, noUpdate];
+            }
+
+            const canvases = store.canvases || [];
+            const cl = nodeData.cluster;
+            const opened = canvases.find(c => c.cluster === cl);
+            if (opened) {
+                return [noUpdate, opened.id, noUpdate, noUpdate];
+            }
+
+            // Error: already 50 canvas
+            if (canvases.length >= 50) {
+                return [
+                    noUpdate,
+                    noUpdate,
+                    {'display': 'flex'},
+                    'Вы достигли максимального количества холстов (50).'
+                ];
+            }
+
+            const viewer = window.graphViewer;
+            const indx = store.nextCanvasIndex + 1;
+            const newCanvas = {
+                id: `canvas-${indx}`,
+                name: `Кластер ${cl}`,
+                cluster: cl,
+                elements: viewer.inducedSubgraph(graphData, viewer.clusterRows(graphData, cl)),
+                positions: {},
+            };
+
+            return [
+                {
+                    ...store,
+                    canvases: canvases.concat(newCanvas),
+                    nextCanvasIndex: indx,
+                },
+                newCanvas.id,
+                {'display': 'none'},
+                '',
+            ];
+        }
+        """,
+        [
+            Output('canvas-store', 'data', allow_duplicate=True),
+            Output('graph-tabs', 'value', allow_duplicate=True),
+            Output('canvas-error', 'style', allow_duplicate=True),
+            Output('canvas-error', 'children', allow_duplicate=True),
+        ],
+        Input('network-graph', 'tapNodeData'),
+        [
+            State('canvas-store', 'data'),
+            State('graph-data', 'data'),
+        ],
         prevent_initial_call=True
     )
 
@@ -538,11 +493,10 @@ def canvas_callbacks(app):
             const action   = selectedAction.substring(indx + 1);
 
             const newStore = {
-                full: store.full,
+                version: store.version,
                 fullPositions: store.fullPositions || {},
                 canvases: store.canvases.map(c => ({ ...c })),
                 nextCanvasIndex: store.nextCanvasIndex + 1,
-                fullPubInfo: store.fullPubInfo,
             };
 
             let inputStyle = { display: 'none' };
@@ -659,11 +613,10 @@ def canvas_callbacks(app):
             }
 
             const newStore = {
-                full: store.full,
+                version: store.version,
                 fullPositions: store.fullPositions || {},
                 canvases: [],
                 nextCanvasIndex: 0,
-                fullPubInfo: store.fullPubInfo,
             };
 
             return [ newStore, 'full' ];
@@ -681,46 +634,29 @@ def canvas_callbacks(app):
     # Split full graph into cluster canvases
     app.clientside_callback(
         """
-        function(nClicks, store) {
-            if (nClicks < 1 || !store || !store.full) {
+        function(nClicks, store, graphData) {
+            if (nClicks < 1 || !store || !graphData) {
                 return window.dash_clientside.no_update;
             }
 
-            const full = store.full;
-
-            const clusters = Array.from(
-                new Set(
-                    full
-                    .filter(el => el.data && el.data.cluster != null)
-                    .map(el => el.data.cluster)
-                )
-            ).sort((a, b) => a - b);
+            // Induced subgraph of every cluster, in one pass over the graph
+            const clusters = window.graphViewer.splitByClusters(graphData);
 
             const newStore = {
-                full: full,
+                version: store.version,
                 fullPositions: store.fullPositions || {},
                 canvases: [],
                 nextCanvasIndex: 0,
-                fullPubInfo: store.fullPubInfo,
             };
 
             const maxCanvases = 50;
             for (let i = 0; i < clusters.length && newStore.canvases.length < maxCanvases; i++) {
-                const cl = clusters[i];
-
-                const nodes = full.filter(e => e.data && e.data.cluster === cl).map(e => ({ ...e }));
-
-                const edges = full.filter(e => e.data && e.data.source != null)
-                            .filter(e =>
-                                nodes.some(n => n.data.id === e.data.source) &&
-                                nodes.some(n => n.data.id === e.data.target)
-                            )
-                            .map(e => ({ ...e }));
+                const cl = clusters[i].cluster;
 
                 newStore.canvases.push({
                     id: `canvas-${newStore.nextCanvasIndex}`,
                     name: `Кластер ${cl}`,
-                    elements: nodes.concat(edges),
+                    elements: clusters[i].elements,
                     positions: {},
                 });
                 newStore.nextCanvasIndex++;
@@ -734,6 +670,9 @@ def canvas_callbacks(app):
             Output('graph-tabs', 'value', allow_duplicate=True)
         ],
         Input('split-by-clusters', 'n_clicks'),
-        State('canvas-store', 'data'),
+        [
+            State('canvas-store', 'data'),
+            State('graph-data', 'data'),
+        ],
         prevent_initial_call=True
     )
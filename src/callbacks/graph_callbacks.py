@@ -45,229 +45,72 @@ def graph_callbacks(app):
         prevent_initial_call=True
     )
 
-    # Client-side graph styling: resize nodes by selected metric
+    # Client-side graph styling: rebuild the stylesheet from the base
+    # stylesheet and the current control values. Each control adds at most
+    # a few rules, so the stylesheet does not grow over the session; later
+    # layers win: size, supernodes, edge threshold & isolates, weights,
+    # metric coloring, search highlight, cluster highlight
     app.clientside_callback(
         """
-        function(sizeValue, basic, sizeLimits) {
-            let graphStyle = JSON.parse(JSON.stringify(basic));
+        function(base, sizeValue, edgeTh, showWeights, showIsolates,
+                 colorMetric, vmin, vmax, matches, clusterValue, sizeLimits, orgId) {
+            if (!base) {
+                return window.dash_clientside.no_update;
+            }
+            const graphStyle = base.slice();
+            const limits = sizeLimits || {};
 
-            // Resize nodes by selected metric
-            const bounds = sizeLimits[sizeValue];
-            const VM = bounds.min;
-            const VX = bounds.max;
-            if(sizeValue && VM != null && VX != null) {
+            // Resize nodes by selected metric (joined into node data as 'val')
+            const bounds = limits[sizeValue];
+            if (sizeValue && bounds && bounds.min != null && bounds.max != null) {
+                const VM = bounds.min;
+                const VX = bounds.max;
                 graphStyle.push({
-                    selector: `node[${sizeValue}]`,
+                    selector: 'node[val]',
                     style: {
-                        'width': `mapData(${sizeValue}, ${VM}, ${VX}, 10, 40)`,
-                        'height': `mapData(${sizeValue}, ${VM}, ${VX}, 10, 40)`,
-                        'font-size': `mapData(${sizeValue}, ${VM}, ${VX}, 7, 17)`
+                        'width': `mapData(val, ${VM}, ${VX}, 10, 40)`,
+                        'height': `mapData(val, ${VM}, ${VX}, 10, 40)`,
+                        'font-size': `mapData(val, ${VM}, ${VX}, 7, 17)`
                     }
                 });
-            };
-
-            return graphStyle;
-        }
-        """,
-        Output('network-graph', 'stylesheet', allow_duplicate=True),
-        Input('size-dropdown', 'value'),
-        [
-            State('network-graph', 'stylesheet'),
-            State('size-limits', 'data'),
-        ],
-        prevent_initial_call=True
-    )
-
-    # Client-side graph styling: hide edges below threshold
-    app.clientside_callback(
-        """
-        function(edgeTh, basic, showIsolates) {
-            let graphStyle = JSON.parse(JSON.stringify(basic));
-
-            // Hide edges below threshold
-            graphStyle.push({
-                selector: `edge[weight < ${edgeTh}]`,
-                style: { 'display': 'none' }
-            });
-            graphStyle.push({
-                selector: `node[max_edge_weight < ${edgeTh}]`,
-                style: { 'display': showIsolates.length ? 'element' : 'none' }
-            });
-            
-            graphStyle.push({
-                selector: `edge[weight >= ${edgeTh}]`,
-                style: { 'display': 'element' }
-            });
-            graphStyle.push({
-                selector: `node[max_edge_weight >= ${edgeTh}]`,
-                style: { 'display': 'element'}
-            });
-
-            return graphStyle;
-        }
-        """,
-        Output('network-graph', 'stylesheet', allow_duplicate=True),
-        Input('edge-threshold', 'value'),
-        [
-            State('network-graph', 'stylesheet'),
-            State('show-isolates', 'value'),
-        ],
-        prevent_initial_call=True
-    )
-
-    # Client-side graph styling: show edge labels
-    app.clientside_callback(
-        """
-        function(showWeight, basic) {
-            let graphStyle = JSON.parse(JSON.stringify(basic));
-
-            // Show edge labels
-            graphStyle.push({
-                selector: 'edge',
-                style: { 'text-opacity': showWeight.length ? 1 : 0 }
-            });
-
-            return graphStyle;
-        }
-        """,
-        Output('network-graph', 'stylesheet', allow_duplicate=True),
-        Input('show-weights', 'value'),
-        State('network-graph', 'stylesheet'),
-        prevent_initial_call=True
-    )
-
-    # Client-side graph styling: show isolate nodes
-    app.clientside_callback(
-        """
-        function(showIsolates, edgeTh, basic) {
-            let graphStyle = JSON.parse(JSON.stringify(basic));
+            }
 
-            // Show isolate nodes
+            // Supernodes of the cluster view: sized by their number of authors
             graphStyle.push({
-                selector: `node[max_edge_weight < ${edgeTh}]`,
-                style: { 'display': showIsolates.length ? 'element' : 'none' }
-            });
-            graphStyle.push({
-                selector: `node[max_edge_weight >= ${edgeTh}]`,
-                style: { 'display': 'element'}
+                selector: 'node[?supernode]',
+                style: {
+                    'width': 'data(size)',
+                    'height': 'data(size)',
+                    'font-size': 14
+                }
             });
 
-            return graphStyle;
-        }
-        """,
-        Output('network-graph', 'stylesheet', allow_duplicate=True),
-        Input('show-isolates', 'value'),
-        [
-            State('edge-threshold', 'value'),
-            State('network-graph', 'stylesheet'),
-        ],
-        prevent_initial_call=True
-    )
-
-    # Client-side graph styling: highlight nodes matching search
-    app.clientside_callback(
-        """
-        function(person, basic) {
-            let graphStyle = JSON.parse(JSON.stringify(basic));
-
-            // Highlight nodes matching search
-            if(person) {
-                const low = person.toLowerCase();
+            // Hide edges below threshold and, unless shown, isolate nodes
+            if (edgeTh !== null && edgeTh !== undefined && edgeTh !== '') {
                 graphStyle.push({
-                    selector: `node[id *= "${low}"]`,
-                    style: { 'background-color': 'red' }
+                    selector: `edge[weight < ${edgeTh}]`,
+                    style: { 'display': 'none' }
                 });
-                graphStyle.push({
-                    selector: `node[id !*= "${low}"]`,
-                    style: { 'background-color': '#b0daff' }
-                });
-            }
-
-            return graphStyle;
-        }
-        """,
-        Output('network-graph', 'stylesheet', allow_duplicate=True),
-        Input('person-search', 'value'),
-        State('network-graph', 'stylesheet'),
-        prevent_initial_call=True
-    )
-
-    # Client-side graph styling: highlight nodes by cluster and select others
-    app.clientside_callback(
-        """
-        function(clusterValue, elements, basic) {
-            // Highlight all nodes in the chosen cluster and lock others
-            if (clusterValue === null || clusterValue === '') {
-                return [window.dash_clientside.no_update, window.dash_clientside.no_update];
-            }
-            const clusterNum = Number(clusterValue);
-            let graphStyle = JSON.parse(JSON.stringify(basic));
-            const updated = JSON.parse(JSON.stringify(elements));
-            for (let el of updated) {
-                if (el.data && el.data.cluster !== undefined) {
-                    el.selected = (el.data.cluster === clusterNum);
+                if (!showIsolates || !showIsolates.length) {
+                    graphStyle.push({
+                        selector: `node[max_edge_weight < ${edgeTh}]`,
+                        style: { 'display': 'none' }
+                    });
                 }
             }
-            graphStyle.push({
-                selector: `node[cluster = ${clusterValue}]`,
-                style: { 'background-color': 'red' }
-            });
-            graphStyle.push({
-                selector: `node[cluster != ${clusterValue}]`,
-                style: { 'background-color': '#b0daff' }
-            });
-            return [graphStyle, updated];
-        }
-        """,
-        [
-            Output('network-graph', 'stylesheet', allow_duplicate=True),
-            Output('network-graph', 'elements', allow_duplicate=True),
-        ],
-        Input('cluster-filter', 'value'),
-        [
-            State('network-graph', 'elements'),
-            State('network-graph', 'stylesheet'),
-        ],
-        prevent_initial_call=True
-    )
-
-    # Reset filters: restore original styles and clear search/cluster inputs
-    app.clientside_callback(
-        """
-        function(clickReset, basic) {
-            // On reset, restore original node colors and clear filters
-            let graphStyle = JSON.parse(JSON.stringify(basic));
 
-            if(clickReset) {
+            // Edge labels
+            if (!showWeights || !showWeights.length) {
                 graphStyle.push({
-                    selector: `node[label]`,
-                    style: { 'background-color': 'data(color)' }
+                    selector: 'edge',
+                    style: { 'text-opacity': 0 }
                 });
-                return [graphStyle, '', ''];
             }
-            return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
-        }
-        """,
-        [
-            Output('network-graph', 'stylesheet', allow_duplicate=True),
-            Output('person-search', 'value', allow_duplicate=True),
-            Output('cluster-filter', 'value', allow_duplicate=True),
-        ],
-        Input('reset-button', 'n_clicks'),
-        State('network-graph', 'stylesheet'),
-        prevent_initial_call=True
-    )
 
-    # Client-side graph styling: color nodes by chosen metric
-    app.clientside_callback(
-        """
-        function(colorMetric, vmin, vmax, basic, sizeLimits) {
-            let graphStyle = JSON.parse(JSON.stringify(basic));
-
-            // Color nodes by chosen metric
-            if(colorMetric) {
-                let minVal = sizeLimits[colorMetric].min;
-                let maxVal = sizeLimits[colorMetric].max;
+            // Color nodes by chosen metric, hide nodes outside the limits
+            if (colorMetric && limits[colorMetric]) {
+                let minVal = limits[colorMetric].min;
+                let maxVal = limits[colorMetric].max;
 
                 minVal = Math.max(minVal, vmin);
                 maxVal = Math.min(maxVal, vmax);
@@ -277,15 +120,13 @@ def graph_callbacks(app):
                     graphStyle.push({
                         selector: `node[${colorMetric} <= ${midVal}][${colorMetric} >= ${minVal}]`,
                         style: {
-                            'background-color': `mapData(${colorMetric}, ${minVal}, ${midVal}, #440154, #26828E)`,
-                            'display': 'element'
+                            'background-color': `mapData(${colorMetric}, ${minVal}, ${midVal}, #440154, #26828E)`
                         }
                     });
                     graphStyle.push({
                         selector: `node[${colorMetric} > ${midVal}][${colorMetric} <= ${maxVal}]`,
                         style: {
-                            'background-color': `mapData(${colorMetric}, ${midVal}, ${maxVal}, #26828E, #FDE725)`,
-                            'display': 'element'
+                            'background-color': `mapData(${colorMetric}, ${midVal}, ${maxVal}, #26828E, #FDE725)`
                         }
                     });
 
@@ -298,54 +139,128 @@ def graph_callbacks(app):
                         style: { 'display': 'none' }
                     });
                 }
-            };
+            }
+
+            // Highlight nodes matching search (rows ranked server-side)
+            if (matches && matches.version === orgId) {
+                graphStyle.push({
+                    selector: 'node',
+                    style: { 'background-color': '#b0daff' }
+                });
+                if (matches.rows.length) {
+                    graphStyle.push({
+                        selector: matches.rows.map(row => `node[row = ${row}]`).join(', '),
+                        style: { 'background-color': 'red' }
+                    });
+                }
+            }
+
+            // Highlight nodes of the chosen cluster
+            if (clusterValue !== null && clusterValue !== undefined && clusterValue !== '') {
+                graphStyle.push({
+                    selector: `node[cluster = ${clusterValue}]`,
+                    style: { 'background-color': 'red' }
+                });
+                graphStyle.push({
+                    selector: `node[cluster != ${clusterValue}]`,
+                    style: { 'background-color': '#b0daff' }
+                });
+            }
 
             return graphStyle;
         }
         """,
-        Output('network-graph', 'stylesheet', allow_duplicate=True),
+        Output('network-graph', 'stylesheet'),
         [
+            Input('base-stylesheet', 'data'),
+            Input('size-dropdown', 'value'),
+            Input('edge-threshold', 'value'),
+            Input('show-weights', 'value'),
+            Input('show-isolates', 'value'),
             Input('color-by-dropdown', 'value'),
             Input('node-color-min', 'value'),
             Input('node-color-max', 'value'),
+            Input('search-matches', 'data'),
+            Input('cluster-filter', 'value'),
         ],
         [
-            State('network-graph', 'stylesheet'),
-            State('size-limits', 'data')
+            State('size-limits', 'data'),
+            State('current-org', 'data'),
         ],
         prevent_initial_call=True
     )
 
+    # Select nodes of the chosen cluster (highlighting is done by the stylesheet)
+    app.clientside_callback(
+        """
+        function(clusterValue, elements) {
+            // Select all nodes in the chosen cluster and unselect others
+            if (clusterValue === null || clusterValue === '') {
+                return window.dash_clientside.no_update;
+            }
+            const clusterNum = Number(clusterValue);
+            // Copy only nodes whose selection changes, reuse the others
+            let changed = false;
+            const updated = (elements || []).map(el => {
+                if (!el.data || el.data.cluster === undefined) {
+                    return el;
+                }
+                const selected = el.data.cluster === clusterNum;
+                if (Boolean(el.selected) === selected) {
+                    return el;
+                }
+                changed = true;
+                return {...el, selected: selected};
+            });
+            return changed ? updated : window.dash_clientside.no_update;
+        }
+        """,
+        Output('network-graph', 'elements', allow_duplicate=True),
+        Input('cluster-filter', 'value'),
+        State('network-graph', 'elements'),
+        prevent_initial_call=True
+    )
+
+    # Reset filters: clear search/cluster inputs (the stylesheet follows them)
+    app.clientside_callback(
+        """
+        function(clickReset) {
+            // On reset, clear filters
+            if(clickReset) {
+                return ['', ''];
+            }
+            return [window.dash_clientside.no_update, window.dash_clientside.no_update];
+        }
+        """,
+        [
+            Output('person-search', 'value', allow_duplicate=True),
+            Output('cluster-filter', 'value', allow_duplicate=True),
+        ],
+        Input('reset-button', 'n_clicks'),
+        prevent_initial_call=True
+    )
+
     # Toggle metric coloring controls
     app.clientside_callback(
         """
-        function(clickColor, basic) {
-            // Toggle display of the metric-coloring controls
+        function(clickColor) {
+            // Toggle display of the metric-coloring controls; clearing
+            // the metric removes its coloring from the stylesheet
             if (!clickColor) {
-                return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
+                return [window.dash_clientside.no_update, window.dash_clientside.no_update, window.dash_clientside.no_update];
             }
-            let graphStyle = JSON.parse(JSON.stringify(basic));
             if (clickColor % 2 == 1) {
-                return [graphStyle, {'display': 'block'}, {'display': 'flex'}, ''];
+                return [{'display': 'block'}, {'display': 'flex'}, ''];
             }
-            graphStyle.push({
-                selector: `node[label]`,
-                style: {
-                    'background-color': 'data(color)',
-                    'display': 'element'
-                }
-            });
-            return [graphStyle, {'display': 'none'}, {'display': 'none'}, ''];
+            return [{'display': 'none'}, {'display': 'none'}, ''];
         }
         """,
         [
-            Output('network-graph', 'stylesheet', allow_duplicate=True),
             Output('color-by-container', 'style', allow_duplicate=True),
             Output('color-thresholds-container', 'style', allow_duplicate=True),
             Output('color-by-dropdown', 'value', allow_duplicate=True),
         ],
         Input('color-button', 'n_clicks'),
-        State('network-graph', 'stylesheet'),
         prevent_initial_call=True
     )
 
@@ -5,7 +5,7 @@ confirmation dialogs, and detailed info overlays).
 """
 from dash import html, Input, Output, State, exceptions
 import pandas as pd
-from src.data_prepare import load_cache_authors, load_cache_coauthors
+from src.data_prepare import load_author_publications, load_edge_publications
 
 def overlay_callbacks(app):
     """
@@ -106,8 +106,7 @@ def overlay_callbacks(app):
 
         if item_label[0][:5] == 'edge-':
             # Search common pub
-            data = load_cache_coauthors(org_id)
-            coauthors_list = data.get(int(item_label[0][5:]), None)
+            coauthors_list = load_edge_publications(org_id, int(item_label[0][5:]))
 
             header = html.Div(item_label[1], className='info-overlay__header')
 
@@ -142,20 +141,18 @@ def overlay_callbacks(app):
                 ], className='info-overlay__text')
         else:
             # Search author
-            data = load_cache_authors(org_id)
-            author_dict = data.get(item_label[0].lower(), None)
+            author_list = load_author_publications(org_id, item_label[0].lower())
 
             header = html.Div(item_label[0], className='info-overlay__header')
 
-            if not author_dict:
+            if not author_list:
                 table = [html.Div('Публикации не найдены')]
                 description = html.Div([])
             else:
-                df = pd.DataFrame({
-                    'Title': author_dict['Title'],
-                    'Year': author_dict['Year'],
-                    'Cited by': author_dict['Cited by']
-                }).sort_values('Cited by', ascending=False)
+                df = pd.DataFrame(
+                    author_list,
+                    columns=['Title', 'Year', 'Source title', 'Cited by', 'Link']
+                ).sort_values('Cited by', ascending=False)
 
                 description = html.Div([
                     html.Div([f'Число публикаций: {len(df)}']),
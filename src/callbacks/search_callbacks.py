@@ -0,0 +1,43 @@
+"""
+Module: search_callbacks
+Defines the server-side callback for author search.
+"""
+from dash import Input, Output, State
+from src.data_prepare import get_network_elements, search_authors
+
+def search_callbacks(app):
+    """
+    Register the callback that matches the 'person-search' query against
+    the author search index of the organization (fuzzy and
+    transliteration-aware, see data_prepare.search). Ranked node rows
+    go to the 'search-matches' store, highlighted by the stylesheet.
+    """
+    @app.callback(
+        Output('search-matches', 'data'),
+        Input('person-search', 'value'),
+        State('current-org', 'data'),
+        prevent_initial_call=True
+    )
+    def match_authors(query, org_id):
+        """
+        Server-side callback. Returns {'version', 'query', 'rows', 'ids'}:
+        rows and labels of matching nodes, best first; None when the
+        query is empty.
+
+        Args:
+            query: text of the author search input
+            org_id: selected organization identifier
+        """
+        if not query or not query.strip():
+            return None
+
+        data = get_network_elements(org_id)
+        rows = search_authors(data['search_index'], query)
+        labels = data['nodes']['label']
+
+        return {
+            'version': org_id,
+            'query': query,
+            'rows': rows,
+            'ids': labels.iloc[rows].tolist(),
+        }
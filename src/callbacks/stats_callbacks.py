@@ -0,0 +1,70 @@
+"""
+Module: stats_callbacks
+Defines the server-side callback computing sidebar statistics
+of the active canvas.
+"""
+from dash import Input, Output, State, exceptions
+import pandas as pd
+from src.data_prepare import get_network_elements, subgraph_statistics
+from src.layout.sidebar import publication_figure
+
+def stats_callbacks(app):
+    """
+    Register the callback that updates the sidebar statistics (authors,
+    publications, clusters, citations, h-index and publications per year)
+    for the node rows of the active canvas. Publications stay on the server:
+    the browser only sends node rows.
+    """
+    @app.callback(
+        Output('info-organization-authors', 'children', allow_duplicate=True),
+        Output('info-organization-publications', 'children', allow_duplicate=True),
+        Output('info-organization-cluster', 'children', allow_duplicate=True),
+        Output('info-organization-cites', 'children', allow_duplicate=True),
+        Output('info-organization-hindex', 'children', allow_duplicate=True),
+        Output('info-organization-graph', 'figure', allow_duplicate=True),
+        Input('canvas-selection', 'data'),
+        State('current-org', 'data'),
+        prevent_initial_call=True
+    )
+    def update_canvas_stats(selection, org_id):
+        """
+        Server-side callback. Computes statistics of the selected nodes:
+        the full graph counts publications with at least one of its authors,
+        a canvas only publications with at least two selected authors.
+
+        Args:
+            selection: {'version', 'rows' (None for the full graph), 'minAuthors'}
+            org_id: selected organization identifier
+        """
+        if not selection or selection.get('version') != org_id:
+            raise exceptions.PreventUpdate
+
+        data = get_network_elements(org_id)
+        rows = selection.get('rows')
+        if rows is not None:
+            rows = [int(row) for row in rows if 0 <= int(row) < len(data['nodes'])]
+
+        stats = subgraph_statistics(
+            data['pub_offsets'],
+            data['pub_ids'],
+            data['publications'],
+            data['years'],
+            rows=rows,
+            min_authors=int(selection.get('minAuthors', 1)),
+        )
+
+        clusters = data['nodes']['cluster']
+        if rows is not None:
+            clusters = clusters.iloc[rows]
+        num_clusters = pd.Series(clusters).nunique()
+
+        fig = publication_figure(data['years'], stats['counts_publication_by_year'])
+
+        return (
+            f'Авторов: {stats["num_authors"]}',
+            f'Публикаций: {stats["num_publication"]}',
+            f'Кластеров: {num_clusters}',
+            f'Цитирований: {stats["num_cites"]}',
+            f'Индекс Хирша: {stats["h_index"]}',
+            fig,
+        )
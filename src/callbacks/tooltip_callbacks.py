@@ -17,11 +17,19 @@ def tooltip_callbacks(app):
     # Hover tooltip
     app.clientside_callback(
         """
-        function(mouseoverData, sizeValue, sizeOptions) {
+        function(mouseoverData, sizeValue, sizeOptions, graphData) {
+            // Supernode of the cluster view: cluster and its number of authors
+            if (mouseoverData && mouseoverData.supernode) {
+                const description = [
+                    window.React.createElement('span', {}, mouseoverData.label),
+                    window.React.createElement('span', {}, `Авторов: ${mouseoverData.authors}`)
+                ];
+                return [{'display': 'flex'}, description, {'display': 'none'}];
+            }
             // Show small tooltip with node name, chosen metric value, and cluster on hover
             if (mouseoverData) {
                 const name = mouseoverData.id || '';
-                const val = mouseoverData[sizeValue] || '0';
+                const val = window.graphViewer.metricValue(graphData, sizeValue, mouseoverData.row) || '0';
                 const label = sizeOptions.find(o => o.value === sizeValue)?.label || 'None';
                 const cluster = mouseoverData.cluster;
                 const description = [
@@ -52,24 +60,32 @@ def tooltip_callbacks(app):
             Input('network-graph', 'mouseoverNodeData'),
             Input('size-dropdown', 'value'),
         ],
-        State('size-dropdown', 'options'),
+        [
+            State('size-dropdown', 'options'),
+            State('graph-data', 'data'),
+        ],
         prevent_initial_call=True
     )
 
     # Click tooltip for nodes
     app.clientside_callback(
         """
-        function(nodeData, sizeOptions) {
+        function(nodeData, sizeOptions, graphData) {
+            // Supernodes open their cluster canvas instead (canvas_callbacks)
+            if (nodeData && nodeData.supernode) {
+                return [{'display': 'none'}, '', {'display': 'none'}, ''];
+            }
             // Show detailed tooltip with all node metrics and publication years
             if (nodeData) {
+                const metric = m => window.graphViewer.metricValue(graphData, m, nodeData.row);
                 const name = nodeData.id || '';
-                const links = nodeData.Links || '0';
-                const indLinks = nodeData.Strength || '0';
-                const documents = nodeData.Documents || '0';
-                const citations = nodeData.Citations || '0';
-                const first_pub_year = nodeData.First_pub_year || '0';
-                const avg_pub_year = nodeData.Avg_pub_year || '0';
-                const last_pub_year = nodeData.Last_pub_year || '0';
+                const links = metric('Links') || '0';
+                const indLinks = metric('Strength') || '0';
+                const documents = metric('Documents') || '0';
+                const citations = metric('Citations') || '0';
+                const first_pub_year = metric('First_pub_year') || '0';
+                const avg_pub_year = metric('Avg_pub_year') || '0';
+                const last_pub_year = metric('Last_pub_year') || '0';
                 const cluster = nodeData.cluster || '0';
                 const description = [
                     window.React.createElement('span', {}, name),
@@ -104,7 +120,10 @@ def tooltip_callbacks(app):
             Output('selected-item', 'data'),
         ],
         Input('network-graph', 'tapNodeData'),
-        State('size-dropdown','options'),
+        [
+            State('size-dropdown','options'),
+            State('graph-data', 'data'),
+        ],
         prevent_initial_call=True
     )
 
@@ -112,6 +131,16 @@ def tooltip_callbacks(app):
     app.clientside_callback(
         """
         function(edgeData) {
+            // Edge between clusters: summed weight, no publication list
+            if (edgeData && String(edgeData.id).startsWith('cluster-')) {
+                const from = String(edgeData.source).replace('cluster-', 'Кластер ');
+                const to = String(edgeData.target).replace('cluster-', 'Кластер ');
+                const description = [
+                    window.React.createElement('span', {}, `${from} — ${to}`),
+                    window.React.createElement('span', {}, `Суммарный вес связей: ${edgeData.weight}`),
+                ];
+                return [{'display': 'flex'}, description, {'display': 'none'}, ''];
+            }
             // Show tooltip with source-target and weight on edge click
             if (edgeData) {
                 const from = edgeData.source || '';
@@ -4,13 +4,16 @@ Defines the server-side callback for loading and updating all main graph element
 sidebar metrics and controls when the selected organization changes.
 """
 from dash import Input, Output
-import plotly.express as px
-from src.data_prepare import prepare_network_elements
+from src.data_prepare import (
+    get_network_elements, filter_graph_data,
+    SERVER_FILTER_MIN_EDGES, CLUSTER_VIEW_MIN_NODES, VIEWPORT_STREAM_MIN_NODES
+)
+from src.layout.sidebar import publication_figure
 
 def upload_org(app, org_name_map):
     @app.callback(
-        Output('network-graph', 'elements'),
-        Output('network-graph', 'stylesheet'),
+        Output('graph-data', 'data'),
+        Output('base-stylesheet', 'data'),
         Output('network-graph', 'mouseoverNodeData'),
 
         Output('name-organization', 'children'),
@@ -22,12 +25,14 @@ def upload_org(app, org_name_map):
 
         Output('info-organization-graph', 'figure'),
 
-        Output('canvas-store', 'data'),
         Output('active-canvas', 'data'),
+        Output('graph-tabs', 'value'),
         Output('canvas-error', 'style'),
         Output('canvas-error', 'children'),
 
+        Output('size-dropdown', 'options'),
         Output('size-dropdown', 'value'),
+        Output('color-by-dropdown', 'options'),
 
         Output('edge-threshold', 'min'),
         Output('edge-threshold', 'max'),
@@ -70,9 +75,9 @@ def upload_org(app, org_name_map):
         Returns:
             Values matching all Outputs defined above.
         """
-        # Load new data
-        data = prepare_network_elements(org_id)
-        elements = data['elements']
+        # Load new data (shared cached result: copy before modifying)
+        data = get_network_elements(org_id)
+        graph_data = data['graph_data']
         stylesheet = data['stylesheet']
         size_options = data['size_options']
         metrics_bounds = data['metrics_bounds']
@@ -84,7 +89,6 @@ def upload_org(app, org_name_map):
         h_index = data['h_index']
         years = data['years']
         counts_publication_by_year = data['counts_publication_by_year']
-        pub_info = data['pub_info']
 
         # Name organization
         org_name = org_name_map.get(org_id, org_id)
@@ -96,64 +100,19 @@ def upload_org(app, org_name_map):
         org_info_hindex = f'Индекс Хирша: {h_index}'
 
         # Create graph publications over time
-        fig = (
-            px.line(
-                x=years,
-                y=counts_publication_by_year,
-            )
-            .update_traces(line=dict(color='#EEECE3'))
-            .update_layout(
-                height=200,
-                title=None,
-                font_family='Arial',
-                paper_bgcolor='#373539',
-                plot_bgcolor='#373539',
-                margin=dict(l=0, r=13, t=0, b=0),
-                xaxis=dict(
-                    showgrid=False,
-                    zeroline=False,
-                    showticklabels=True,
-                    title=None,
-                    showline=True,
-                    linecolor='#EEECE3',
-                    linewidth=1,
-                    ticks='outside',
-                    ticklen=3,
-                    tickcolor='#EEECE3',
-                    tickfont=dict(
-                        color='#EEECE3',
-                        family='Arial',
-                        size=10,
-                    ),
-                    tickson='labels',
-                    ticklabelposition='outside'
-                ),
-                yaxis=dict(
-                    showgrid=False,
-                    zeroline=False,
-                    showticklabels=True,
-                    title=None,
-                    showline=True,
-                    linecolor='#EEECE3',
-                    linewidth=1,
-                    ticklen=3,
-                    tickcolor='#EEECE3',
-                    ticks='outside',
-                    tickfont=dict(
-                        color='#EEECE3',
-                        family='Arial',
-                        size=10,
-                    ),
-                    tickson='labels',
-                    ticklabelposition='outside'
-                ),
-                dragmode=False,
-            )
-        )
+        fig = publication_figure(years, counts_publication_by_year)
+
+        # Compact graph: elements are built and the canvas store is
+        # reset client-side. The canvas store keeps only 'version'
+        # to tell which graph its canvases belong to
+        graph_data = {**graph_data, 'version': org_id}
+
+        # Large orgs render the full graph by viewport (viewport_callbacks)
+        if len(nodes) >= VIEWPORT_STREAM_MIN_NODES:
+            graph_data['grid'] = data['grid']
 
-        # Initialize canvas store with full graph only
-        empty_store = {'full': elements, 'canvases': [], 'nextCanvasIndex': 0, 'fullPubInfo': pub_info}
-        default_active = 'full'
+        # Large orgs open in the cluster view
+        default_active = 'clusters' if len(nodes) >= CLUSTER_VIEW_MIN_NODES else 'full'
 
         # Default size option
         default_size = size_options[0]['value']
@@ -178,15 +137,18 @@ def upload_org(app, org_name_map):
             init_w = 1
         init_w = max(min_w, min(init_w, max_w))
 
-        stylesheet.append({
-            'selector': f'edge[weight < {init_w}]',
-            'style': {'display': 'none'}
-        })
-        stylesheet.append({
-            'selector': f'edge[weight >= {init_w}]',
-            'style': {'display': 'element'}
-        })
-        
+        # Large orgs: send only elements visible at the initial threshold,
+        # later control changes arrive as deltas (visibility_callbacks)
+        if len(edges) >= SERVER_FILTER_MIN_EDGES:
+            filter_state = {
+                'threshold': init_w,
+                'isolates': True,
+                'metric': None,
+                'vmin': None,
+                'vmax': None,
+            }
+            graph_data = filter_graph_data(graph_data, nodes, edges, data['edge_index'], filter_state)
+
         # Cluster
         min_cluster = int(nodes['cluster'].min())
         max_cluster = int(nodes['cluster'].max())
@@ -201,8 +163,8 @@ def upload_org(app, org_name_map):
         default_node_color_limits = {'vmin': None, 'vmax': None}
 
         return (
-            elements,  # network-graph elements
-            stylesheet,  # network-graph stylesheet
+            graph_data,  # graph-data data
+            stylesheet,  # base-stylesheet data (control rules are added client-side)
             None,  # network-graph mouseoverNodeData
 
             org_name,  # name-organization children
@@ -214,12 +176,14 @@ def upload_org(app, org_name_map):
 
             fig,  # info-organization-graph figure
 
-            empty_store,  # canvas-store data
             default_active,  # active-canvas data
+            default_active,  # graph-tabs value
             hidden_style,  # canvas-error style
             '',  # canvas-error children
 
+            size_options,  # size-dropdown options
             default_size,  # size-dropdown value
+            color_options,  # color-by-dropdown options
 
             min_w,  # edge-threshold min
             max_w,  # edge-threshold max
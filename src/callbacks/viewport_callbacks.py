@@ -0,0 +1,52 @@
+"""
+Module: viewport_callbacks
+Defines the clientside callback streaming elements of large full
+graphs by viewport.
+"""
+from dash import Input, Output, State
+
+def viewport_callbacks(app):
+    """
+    Register the callback that adds nodes and edges of the full graph
+    as the viewport moves. Applies to graphs carrying a grid index in
+    graph data ('grid', see data_prepare.spatial): the full graph opens
+    with the nodes of its central part, and nodes near the viewport are
+    added on pan and zoom. Added elements are never removed, so the
+    graph only grows towards the full one.
+    """
+    app.clientside_callback(
+        """
+        function(extent, graphData, activeID, currentElements, sizeValue, colorValue) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!extent || !graphData || !graphData.grid || activeID !== 'full') {
+                return [noUpdate, noUpdate];
+            }
+
+            const viewer = window.graphViewer;
+            const shown = currentElements || [];
+            const added = viewer.streamElements(graphData, shown, extent);
+            if (!added.length) {
+                return [noUpdate, noUpdate];
+            }
+
+            // Keep the viewport: refitting would widen it and stream more
+            return [
+                shown.concat(viewer.joinMetrics(added, graphData, sizeValue, colorValue)),
+                {name: 'preset', fit: false},
+            ];
+        }
+        """,
+        [
+            Output('network-graph', 'elements', allow_duplicate=True),
+            Output('network-graph', 'layout', allow_duplicate=True),
+        ],
+        Input('network-graph', 'extent'),
+        [
+            State('graph-data', 'data'),
+            State('active-canvas', 'data'),
+            State('network-graph', 'elements'),
+            State('size-dropdown', 'value'),
+            State('color-by-dropdown', 'value'),
+        ],
+        prevent_initial_call=True
+    )
@@ -0,0 +1,138 @@
+"""
+Module: visibility_callbacks
+Defines callbacks filtering large graphs server-side: control changes
+are sent to the server, which answers with element deltas patched
+into the graph data client-side.
+"""
+from dash import Input, Output, State, exceptions
+from src.data_prepare import get_network_elements, visibility_delta
+
+def visibility_callbacks(app):
+    """
+    Register the callbacks of server-side filtering (graphs with
+    'serverFilter' set in graph data; smaller graphs are filtered
+    by the stylesheet only):
+      - turning the threshold, isolates and color limit controls
+        into a filter request
+      - computing the delta between the shown and requested state
+      - applying the delta to the graph data
+    """
+    # Filter request: the state the graph data shows and the requested one
+    app.clientside_callback(
+        """
+        function(edgeTh, showIsolates, colorMetric, vmin, vmax, graphData) {
+            if (!graphData || !graphData.serverFilter) {
+                return window.dash_clientside.no_update;
+            }
+
+            // Color limits apply only to a valid range, as in the stylesheet
+            const limited = colorMetric && vmin != null && vmax != null && vmin <= vmax;
+            const state = {
+                threshold: edgeTh ?? null,
+                isolates: !!(showIsolates && showIsolates.length),
+                metric: limited ? colorMetric : null,
+                vmin: limited ? vmin : null,
+                vmax: limited ? vmax : null,
+            };
+            if (window.graphViewer.sameFilter(graphData.filter, state)) {
+                return window.dash_clientside.no_update;
+            }
+            return {version: graphData.version, from: graphData.filter, to: state};
+        }
+        """,
+        Output('filter-request', 'data'),
+        [
+            Input('edge-threshold', 'value'),
+            Input('show-isolates', 'value'),
+            Input('color-by-dropdown', 'value'),
+            Input('node-color-min', 'value'),
+            Input('node-color-max', 'value'),
+        ],
+        State('graph-data', 'data'),
+        prevent_initial_call=True
+    )
+
+    @app.callback(
+        Output('graph-delta', 'data'),
+        Input('filter-request', 'data'),
+        State('current-org', 'data'),
+        prevent_initial_call=True
+    )
+    def compute_graph_delta(request, org_id):
+        """
+        Server-side callback. Computes elements to add and remove when
+        the filter moves from the state shown in the browser to the
+        requested one. Stateless: the browser sends both states.
+
+        Args:
+            request: {'version', 'from', 'to'} with filter states
+            org_id: selected organization identifier
+        """
+        if not request or request.get('version') != org_id:
+            raise exceptions.PreventUpdate
+
+        data = get_network_elements(org_id)
+        old = _filter_state(request.get('from'))
+        new = _filter_state(request.get('to'))
+        delta = visibility_delta(data['nodes'], data['edges'], data['edge_index'], old, new)
+
+        return {
+            'version': org_id,
+            'from': request.get('from'),
+            'to': request.get('to'),
+            **delta,
+        }
+
+    # Apply delta. A delta computed from a state the graph no longer
+    # shows (responses crossing) is re-requested from the shown state;
+    # a newer request still pending is sent after applying
+    app.clientside_callback(
+        """
+        function(delta, graphData, request) {
+            const noUpdate = window.dash_clientside.no_update;
+            if (!delta || !graphData || delta.version !== graphData.version) {
+                return [noUpdate, noUpdate];
+            }
+            const viewer = window.graphViewer;
+            const latest = (request && request.version === graphData.version) ? request.to : delta.to;
+
+            if (!viewer.sameFilter(delta.from, graphData.filter)) {
+                if (viewer.sameFilter(graphData.filter, latest)) {
+                    return [noUpdate, noUpdate];
+                }
+                return [noUpdate, {version: graphData.version, from: graphData.filter, to: latest}];
+            }
+
+            const pending = viewer.sameFilter(delta.to, latest)
+                ? noUpdate
+                : {version: graphData.version, from: delta.to, to: latest};
+            return [viewer.applyDelta(graphData, delta), pending];
+        }
+        """,
+        [
+            Output('graph-data', 'data', allow_duplicate=True),
+            Output('filter-request', 'data', allow_duplicate=True),
+        ],
+        Input('graph-delta', 'data'),
+        [
+            State('graph-data', 'data'),
+            State('filter-request', 'data'),
+        ],
+        prevent_initial_call=True
+    )
+
+
+def _filter_state(state) -> dict:
+    """Filter state from the browser with numeric values coerced."""
+    state = state or {}
+
+    def number(value):
+        return None if value is None else float(value)
+
+    return {
+        'threshold': number(state.get('threshold')),
+        'isolates': bool(state.get('isolates', True)),
+        'metric': state.get('metric') or None,
+        'vmin': number(state.get('vmin')),
+        'vmax': number(state.get('vmax')),
+    }
@@ -1,8 +1,23 @@
-from .base import prepare_network_elements
-from .cache import load_cache_authors, load_cache_coauthors
+from .base import prepare_network_elements, get_fresh_cache
+from .cache import load_author_publications, load_edge_publications
+from .memory import get_network_elements, org_cache
+from .constants import SERVER_FILTER_MIN_EDGES, CLUSTER_VIEW_MIN_NODES, VIEWPORT_STREAM_MIN_NODES
+from .processing import subgraph_statistics
+from .search import search_authors
+from .visibility import filter_graph_data, visibility_delta
 
 __all__ = [
     "prepare_network_elements",
-    "load_cache_authors",
-    "load_cache_coauthors",
+    "get_fresh_cache",
+    "get_network_elements",
+    "org_cache",
+    "load_author_publications",
+    "load_edge_publications",
+    "subgraph_statistics",
+    "search_authors",
+    "filter_graph_data",
+    "visibility_delta",
+    "SERVER_FILTER_MIN_EDGES",
+    "CLUSTER_VIEW_MIN_NODES",
+    "VIEWPORT_STREAM_MIN_NODES",
 ]
\ No newline at end of file
@@ -5,40 +5,187 @@ for the given organization. Builds node & edge data structures
 for Dash Cytoscape, as well as author/co-author maps.
 
 Cache files:
-  - cache.pkl: full result dict from prepare_network_elements
-  - cache_authors.pkl: mapping author -> list of their publications
-  - cache_coauthors.pkl: mapping edge_id -> list of joint publications
+  - cache/: columnar bundle (see columnar) with nodes, edges,
+    publications, the author -> pub_ids mapping in CSR form and
+    indexes derived from them: node -> pub_ids (CSR), the edge index,
+    the cluster graph, the grid index of node coordinates and the
+    author search index
+  - cache_lookup.sqlite: publications of each author and joint
+    publications of each edge, indexed for per-key lookups
+  - cache_manifest.json: fingerprints of source files the caches were built from
 """
 import os
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime
-from .cache import is_cache, load_cache, save_cache
-from .constants import BASE_PATH, CACHE_FILE, AUTHORS_CACHE_FILE, COAUTHORS_CACHE_FILE
+from .cache import is_cache, is_source_fresh, save_lookup, build_manifest, fingerprint_file, save_manifest
+from .columnar import current_generation, save_bundle, load_bundle, prefix_arrays, select_arrays
+from .constants import BASE_PATH, CACHE_DIR, LOOKUP_FILE, MANIFEST_FILE
+from .incidence import build_incidence
+from .incremental import update_network_bundle
 from .loading import *
 from .processing import *
 from .utils import get_source_paths
+from .visibility import build_edge_index
+from .clusters import build_cluster_graph
+from .spatial import build_grid_index
+from .search import build_search_index
 
-def prepare_network_elements(org_id: str):
+def prepare_network_elements(org_id: str, force: bool = False):
     """
-    Main function: returns a dict with keys:
-      - elements: list of cyto elements
+    Main function: returns a dict (NetworkElements) with keys:
+      - graph_data: compact columnar nodes, edges and node metrics
+        (see processing.build_graph_data), with the aggregated
+        cluster graph in 'clusters' (see clusters); built on first access
       - stylesheet: base stylesheet
       - size_options, color_options, metrics_bounds
-      - nodes, edges, num_publication
-    Caches entire result in cache.pkl, and separately
-    author/coauthor maps.
+      - nodes, edges, publications, num_publication
+      - pub_offsets, pub_ids: node -> pub_ids CSR (int32) aligned
+        with node rows of graph_data
+      - edge_index: edges sorted by weight for server-side filtering
+        (see visibility)
+      - grid: grid index of node coordinates for viewport streaming
+        (see spatial)
+      - search_index: trigram index of node labels for author search
+        (see search)
+    Caches the prepared tables as a columnar bundle in cache/,
+    and separately author/coauthor publications. Caches are rebuilt when
+    any source file differs from its fingerprint in the manifest,
+    or always when 'force' is set; rows appended to publications.csv
+    are merged into the existing caches instead (see incremental).
     """
-    # Check cache
     source_paths = get_source_paths(org_id)
-    cache_path = f'{BASE_PATH}/{org_id}/{CACHE_FILE}'
-    cache_path_authors = f'{BASE_PATH}/{org_id}/{AUTHORS_CACHE_FILE}'
-    cache_path_coauthors = f'{BASE_PATH}/{org_id}/{COAUTHORS_CACHE_FILE}'
-    if is_cache(cache_path, source_paths) and os.path.exists(cache_path_authors) and os.path.exists(cache_path_coauthors):
+    cache_dir = f'{BASE_PATH}/{org_id}/{CACHE_DIR}'
+    manifest_path = f'{BASE_PATH}/{org_id}/{MANIFEST_FILE}'
+
+    # Check cache
+    cache_path = None if force else get_fresh_cache(org_id)
+    if cache_path:
         try:
-            return load_cache(cache_path)
+            return assemble_network_elements(load_bundle(cache_path))
         except Exception:
             pass
 
+    # Fingerprint sources before reading them: an edit made during the
+    # build must not be recorded as the content the caches hold
+    ensure_thesaurus(org_id)
+    manifest = build_manifest(source_paths)
+
+    # Only new publication rows: extend the current generation
+    bundle = None
+    if not force:
+        try:
+            bundle = update_network_bundle(org_id)
+        except Exception:
+            bundle = None
+    if bundle is not None:
+        # The update extended the thesaurus itself
+        manifest['sources']['thesaurus'] = fingerprint_file(source_paths['thesaurus'])
+    else:
+        bundle = build_network_bundle(org_id)
+
+    try:
+        cache_path = save_bundle(cache_dir, bundle['tables'], bundle['arrays'], bundle['meta'])
+        # A source changed while being read: keep the old manifest, so
+        # the new generation is not taken as fresh and gets rebuilt
+        if all(is_source_fresh(p, manifest['sources'][key])[0] for key, p in source_paths.items()):
+            manifest['generation'] = os.path.basename(cache_path)
+            save_manifest(manifest_path, manifest)
+        bundle = load_bundle(cache_path)
+    except Exception:
+        pass
+
+    return assemble_network_elements(bundle)
+
+
+def get_fresh_cache(org_id: str):
+    """
+    Return the path of the current cache generation of 'org_id'
+    if all caches exist and match the source fingerprints, else None.
+    """
+    source_paths = get_source_paths(org_id)
+    cache_path = current_generation(f'{BASE_PATH}/{org_id}/{CACHE_DIR}')
+    lookup_path = f'{BASE_PATH}/{org_id}/{LOOKUP_FILE}'
+    manifest_path = f'{BASE_PATH}/{org_id}/{MANIFEST_FILE}'
+    if cache_path and is_cache(cache_path, source_paths, manifest_path) and os.path.exists(lookup_path):
+        return cache_path
+    return None
+
+
+class NetworkElements(dict):
+    """
+    The prepare_network_elements result: a dict whose derived entries
+    are built on first access by 'factories' (key -> function),
+    so a load reads no table columns until a callback needs them.
+    'revision' counts the entries built so far.
+    """
+    def __init__(self, values: dict, factories: dict):
+        super().__init__(values)
+        self._factories = factories
+        self._lock = threading.Lock()
+        self.revision = 0
+
+    def __missing__(self, key):
+        if key not in self._factories:
+            raise KeyError(key)
+        with self._lock:
+            if not dict.__contains__(self, key):
+                self[key] = self._factories[key]()
+                self.revision += 1
+        return dict.__getitem__(self, key)
+
+
+def assemble_network_elements(bundle: dict) -> NetworkElements:
+    """
+    Build the prepare_network_elements result from a bundle
+    (either freshly built DataFrames or a loaded columnar cache).
+    Indexes are taken from the bundle as they are; graph data is
+    built on first access.
+    """
+    tables = bundle['tables']
+    arrays = bundle['arrays']
+    meta = bundle['meta']
+    nodes = tables['nodes']
+    edges = tables['edges']
+
+    def graph_data():
+        data = build_graph_data(nodes, edges)
+        data['clusters'] = meta['clusters']
+        return data
+
+    return NetworkElements({
+        'stylesheet': meta['stylesheet'],
+        'size_options': meta['size_options'],
+        'metrics_bounds': meta['metrics_bounds'],
+        'color_options': meta['color_options'],
+        'nodes': nodes,
+        'edges': edges,
+        'num_publication': meta['num_publication'],
+        'num_cites': meta['num_cites'],
+        'h_index': meta['h_index'],
+        'years': meta['years'],
+        'counts_publication_by_year': meta['counts_publication_by_year'],
+        'publications': tables['publications'],
+        'pub_offsets': arrays['node_pub_offsets'],
+        'pub_ids': arrays['node_pub_ids'],
+        'edge_index': select_arrays(arrays, 'edge'),
+        'grid': {**meta['grid'], **select_arrays(arrays, 'grid')},
+        'search_index': select_arrays(arrays, 'search'),
+    }, {'graph_data': graph_data})
+
+
+def build_network_bundle(org_id: str) -> dict:
+    """
+    Load source files of 'org_id' and compute all tables for the cache:
+    nodes, edges, publications, author -> pub_ids (CSR) and UI metadata.
+    Also writes the author/coauthor lookup store.
+
+    Returns:
+        dict with keys 'tables', 'arrays', 'meta' (see columnar.save_bundle).
+    """
+    lookup_path = f'{BASE_PATH}/{org_id}/{LOOKUP_FILE}'
+
     # Load data
     replace_dict = load_thesaurus(org_id)
     publication = load_publication(org_id)
@@ -47,47 +194,11 @@ def prepare_network_elements(org_id: str):
 
     publication['pub_id'] = range(1, len(publication) + 1)
 
-    # Build authors info and years map
-    authors_info = build_authors_with_inform(publication, replace_dict)
-    years_map = authors_info.set_index('Authors')[['First_pub_year', 'Last_pub_year']].to_dict('index')
-
-    authors_map = (
-        authors_info
-        .set_index('Authors')
-        [['Title', 'Year', 'Cited by']]
-        .to_dict('index')
-    )
-    save_cache(cache_path_authors, authors_map)
-
-    # Build pub_info: dict pub_id -> dict of fields we need (Cited by etc.)
-    pub_info = (
-        publication
-        .set_index('pub_id')
-        [['Title', 'Year', 'Cited by']]
-        .to_dict('index')
-    )
-
-    # Map authors -> list(pub_id)
-    pub_with_authors = publication.assign(
-        Authors = lambda df: df['Authors'].apply(
-            standardize_author_names, replace_dict=replace_dict
-        )
-    ).explode('Authors')
-
-    author_pubids = (
-        pub_with_authors
-        .groupby('Authors', as_index=True)['pub_id']
-        .agg(list)
-        .to_dict()
-    )
+    # Normalize authors once: author x publication incidence (CSR)
+    incidence = build_incidence(publication, replace_dict)
 
     # Convert IDs to names
-    edges['first_author'] = edges['first_author'].apply(
-        lambda ID: nodes.loc[nodes['id'] == ID, 'label'].iloc[0]
-    )
-    edges['second_author'] = edges['second_author'].apply(
-        lambda ID: nodes.loc[nodes['id'] == ID, 'label'].iloc[0]
-    )
+    edges = map_edge_ids_to_labels(nodes, edges)
 
     # Calculate max edge weight for each node
     max_edges = (
@@ -97,9 +208,12 @@ def prepare_network_elements(org_id: str):
         ], ignore_index=True)
         .groupby('label')['weight']
         .max()
-        .to_dict()
     )
-    nodes['max_edge_weight'] = nodes['label'].map(lambda lbl: max_edges.get(lbl, 0))
+    nodes['max_edge_weight'] = (
+        max_edges
+        .reindex(nodes['label'], fill_value=0)
+        .to_numpy()
+    )
 
     # Impossible years
     YEAR_NOW = datetime.now().year
@@ -126,8 +240,9 @@ def prepare_network_elements(org_id: str):
     nodes['node_color'] = nodes['cluster'].map(cluster_colors_map)
 
     # Append first and last pub years
-    nodes['First_pub_year'] = nodes['label'].map(lambda lbl: years_map.get(lbl, {}).get('First_pub_year'))
-    nodes['Last_pub_year']  = nodes['label'].map(lambda lbl: years_map.get(lbl, {}).get('Last_pub_year'))
+    pub_years = publication['Year'].to_numpy()
+    nodes['First_pub_year'] = incidence.reduce_by_names(nodes['label'], pub_years, np.minimum)
+    nodes['Last_pub_year'] = incidence.reduce_by_names(nodes['label'], pub_years, np.maximum)
 
     # Range years
     min_year = publication['Year'].min()
@@ -142,54 +257,10 @@ def prepare_network_elements(org_id: str):
             .tolist()
     )
 
-    # Build elements
-    nodes_records = nodes.to_dict('records')
-    edges_records = edges.to_dict('records')
-
-    node_color_map = nodes.set_index('label')['node_color'].to_dict()
-
-    nodes_elements = [
-        {
-            'data': {
-                'id': node['label'],
-                'label': node['label'].title(),
-                'val': node['Links'],
-                'Links': node['Links'],
-                'Strength': node['Strength'],
-                'Documents': node['Documents'],
-                'Citations': node['Citations'],
-                'Norm_citations': node['Norm_citations'],
-                'Avg_pub_year': node['Avg_pub_year'],
-                'First_pub_year': node['First_pub_year'],
-                'Last_pub_year': node['Last_pub_year'],
-                'Avg_citations': node['Avg_citations'],
-                'Avg_norm_citations': node['Avg_norm_citations'],
-                'color': node['node_color'],
-                'cluster': node['cluster'],
-                'max_edge_weight': node['max_edge_weight'],
-                'pub_ids': author_pubids.get(node['label'], []),
-            },
-            'position': {'x': node['x'], 'y': node['y']}
-        }
-        for node in nodes_records
-    ]
-    edges_elements = [
-        {
-            'data': {
-                'id': f'edge-{ind}',
-                'source': edge['first_author'],
-                'target': edge['second_author'],
-                'weight': edge['weight'],
-                'color': node_color_map[edge['first_author']]
-            },
-        }
-        for ind, edge in enumerate(edges_records)
-    ]
-    elements = nodes_elements + edges_elements
-
-    # Build edge descriptions
-    coauthors_info_map = build_coauthors_map(publication, replace_dict, edges_records)
-    save_cache(cache_path_coauthors, coauthors_info_map)
+    # Build edge descriptions and per-key lookup store
+    edge_pubs = build_coauthors_map(incidence, edges)
+    author_pubs = pd.DataFrame({'author': incidence.incidence_authors(), 'pub_id': incidence.pub_ids})
+    save_lookup(lookup_path, publication, author_pubs, edge_pubs)
 
     val_min = nodes['Links'].min()
     val_max = nodes['Links'].max()
@@ -263,26 +334,41 @@ def prepare_network_elements(org_id: str):
     # Counting citations for publications
     total_citations = publication['Cited by'].sum()
     h_index = compute_h_index(publication['Cited by'])
-    
-    result = {
-        'elements': elements,
-        'stylesheet': basic_stylesheet,
-        'size_options': size_options,
-        'metrics_bounds': metrics_bounds,
-        'color_options': color_options,
-        'nodes': nodes,
-        'edges': edges,
-        'num_publication': len(publication),
-        'num_cites': total_citations,
-        'h_index': h_index,
-        'years': years,
-        'counts_publication_by_year': counts_by_year,
-        'pub_info': pub_info,
+
+    # Indexes of the graph, stored with the bundle
+    pub_offsets, pub_ids = node_publication_csr(
+        nodes['label'], incidence.authors, incidence.offsets, incidence.pub_ids
+    )
+    edge_index = build_edge_index(nodes, edges)
+    grid = build_grid_index(nodes)
+
+    return {
+        'tables': {
+            'nodes': nodes,
+            'edges': edges,
+            'publications': publication[['pub_id', 'Title', 'Year', 'Cited by']],
+            'authors': pd.DataFrame({'name': incidence.authors}),
+        },
+        'arrays': {
+            'author_offsets': incidence.offsets,
+            'author_pub_ids': incidence.pub_ids,
+            'node_pub_offsets': pub_offsets,
+            'node_pub_ids': pub_ids,
+            **prefix_arrays('edge', edge_index),
+            **prefix_arrays('search', build_search_index(nodes['label'])),
+            **prefix_arrays('grid', {key: grid[key] for key in ['rows', 'offsets']}),
+        },
+        'meta': {
+            'clusters': build_cluster_graph(nodes, edges, edge_index),
+            'grid': {key: grid[key] for key in ['x0', 'y0', 'cell', 'side']},
+            'stylesheet': basic_stylesheet,
+            'size_options': size_options,
+            'metrics_bounds': metrics_bounds,
+            'color_options': color_options,
+            'num_publication': len(publication),
+            'num_cites': total_citations,
+            'h_index': h_index,
+            'years': years,
+            'counts_publication_by_year': counts_by_year,
+        },
     }
-    
-    try:
-        save_cache(cache_path, result)
-    except Exception:
-        pass
-    
-    return result
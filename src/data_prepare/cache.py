@@ -1,15 +1,123 @@
 """
 Module: cache
 Defines functions for checking, loading, and saving caches.
+
+Per-author and per-edge publication lists live in a SQLite lookup store
+(cache_lookup.sqlite) indexed by author name and edge ID, so a single
+author's or edge's publications are read without loading the whole map.
+
+Cache freshness is tracked by a manifest (cache_manifest.json) that stores
+size, mtime and a content hash of every source file. A source is considered
+unchanged when size and mtime match; if only mtime differs, the content
+hash decides, so touching a file does not force a rebuild. A grown file
+whose old content is unchanged is recognized as an append (see incremental).
 """
 import os
-import pickle
-from .constants import BASE_PATH, AUTHORS_CACHE_FILE, COAUTHORS_CACHE_FILE
+import json
+import shutil
+import sqlite3
+import hashlib
+import uuid
+import pandas as pd
+from .constants import BASE_PATH, LOOKUP_FILE
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def hash_file(path: str, size: int = None) -> str:
+    """
+    Return a fast content hash (BLAKE2b, 128 bit) of the file at 'path',
+    or of its first 'size' bytes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = size
+    with open(path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            chunk = f.read(HASH_CHUNK_SIZE if remaining is None else min(HASH_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            digest.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_file(path: str) -> dict:
+    """Return size, mtime and content hash of the file at 'path'."""
+    stat = os.stat(path)
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': hash_file(path),
+    }
+
+
+def build_manifest(source_paths: dict, generation: str = None) -> dict:
+    """
+    Fingerprint every file in 'source_paths'. 'generation' names the
+    cache generation built from them.
+    """
+    return {
+        'sources': {key: fingerprint_file(p) for key, p in source_paths.items()},
+        'generation': generation,
+    }
 
-def is_cache(cache_path: str, source_paths: dict) -> bool:
+
+def load_manifest(manifest_path: str):
+    """Load and return a manifest, or None if it is missing or unreadable."""
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(manifest_path: str, manifest: dict):
+    """Atomically write 'manifest' as JSON to 'manifest_path'."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = f'{manifest_path}.tmp-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def is_source_fresh(path: str, fingerprint: dict):
+    """
+    Compare the file at 'path' with its stored 'fingerprint'.
+    Returns a pair (fresh, touched): 'touched' is True when the content
+    is unchanged but mtime moved, so the stored fingerprint needs refreshing.
+    """
+    stat = os.stat(path)
+    if stat.st_size != fingerprint.get('size'):
+        return False, False
+    if stat.st_mtime_ns == fingerprint.get('mtime_ns'):
+        return True, False
+    if hash_file(path) != fingerprint.get('hash'):
+        return False, False
+    return True, True
+
+
+def is_source_appended(path: str, fingerprint: dict) -> bool:
     """
-    Check if 'cache_path' and all cache files exist.
-    Returns False if cache is missing.
+    Return True if the file at 'path' is its fingerprinted version with
+    complete lines appended: it grew, the old content ended with a
+    newline and the first 'size' bytes still hash to the stored value.
+    """
+    old_size = fingerprint.get('size')
+    if not old_size or os.stat(path).st_size <= old_size:
+        return False
+    with open(path, 'rb') as f:
+        f.seek(old_size - 1)
+        if f.read(1) != b'\n':
+            return False
+    return hash_file(path, old_size) == fingerprint.get('hash')
+
+
+def is_cache(cache_path: str, source_paths: dict, manifest_path: str) -> bool:
+    """
+    Check that 'cache_path' and all source files exist and that every
+    source still matches its fingerprint in the manifest.
+    Returns False if cache is missing or stale.
     """
     if not os.path.exists(cache_path):
         return False
@@ -18,31 +126,140 @@ def is_cache(cache_path: str, source_paths: dict) -> bool:
         if not os.path.exists(p):
             return False
 
+    manifest = load_manifest(manifest_path)
+    if not manifest:
+        return False
+
+    fingerprints = manifest.get('sources', {})
+    if set(fingerprints) != set(source_paths):
+        return False
+
+    touched = False
+    for key, p in source_paths.items():
+        fresh, moved = is_source_fresh(p, fingerprints[key])
+        if not fresh:
+            return False
+        if moved:
+            fingerprints[key]['mtime_ns'] = os.stat(p).st_mtime_ns
+            touched = True
+
+    # Content unchanged: remember new mtimes to keep next check stat-only
+    if touched:
+        try:
+            save_manifest(manifest_path, manifest)
+        except OSError:
+            pass
+
     return True
 
 
-def load_cache(cache_path: str):
-    """Load and return a cache"""
-    with open(cache_path, 'rb') as f:
-        return pickle.load(f)
-    
+def save_lookup(lookup_path: str, publication: pd.DataFrame, author_pubs: pd.DataFrame, edge_pubs: pd.DataFrame):
+    """
+    Write the SQLite lookup store atomically.
 
-def load_cache_authors(org_id: str) -> dict:
-    """Load and return a authors cache"""
-    path = f'{BASE_PATH}/{org_id}/{AUTHORS_CACHE_FILE}'
-    with open(path, 'rb') as f:
-        return pickle.load(f)
+    Args:
+        lookup_path: destination file.
+        publication: publications with columns pub_id, Title, Year,
+            Source title, Cited by, Link.
+        author_pubs: rows (author, pub_id).
+        edge_pubs: rows (edge_id, pub_id).
+    """
+    os.makedirs(os.path.dirname(lookup_path), exist_ok=True)
+    tmp_path = f'{lookup_path}.tmp-{os.getpid()}'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
 
+    columns = ['pub_id', 'Title', 'Year', 'Source title', 'Cited by', 'Link']
+    pubs = publication[columns].astype(object)
+    pubs = pubs.where(pubs.notna(), None)
 
-def load_cache_coauthors(org_id: str) -> dict:
-    """Load and return a coauthors cache"""
-    path = f'{BASE_PATH}/{org_id}/{COAUTHORS_CACHE_FILE}'
-    with open(path, 'rb') as f:
-        return pickle.load(f)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("""
+            CREATE TABLE publications (
+                pub_id INTEGER PRIMARY KEY,
+                title TEXT, year INTEGER, source_title TEXT, cited_by INTEGER, link TEXT
+            );
+            CREATE TABLE author_pubs (author TEXT NOT NULL, pub_id INTEGER NOT NULL);
+            CREATE TABLE edge_pubs (edge_id INTEGER NOT NULL, pub_id INTEGER NOT NULL);
+        """)
+        conn.executemany('INSERT INTO publications VALUES (?, ?, ?, ?, ?, ?)', pubs.itertuples(index=False))
+        conn.executemany('INSERT INTO author_pubs VALUES (?, ?)', author_pubs.itertuples(index=False))
+        conn.executemany('INSERT INTO edge_pubs VALUES (?, ?)', edge_pubs.itertuples(index=False))
+        conn.executescript("""
+            CREATE INDEX author_pubs_author ON author_pubs (author);
+            CREATE INDEX edge_pubs_edge ON edge_pubs (edge_id);
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, lookup_path)
 
 
-def save_cache(cache_path: str, data):
-    """Save 'data' to 'path' as pickle, creating folders as needed."""
-    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    with open(cache_path, 'wb') as f:
-        pickle.dump(data, f)
+def append_lookup(lookup_path: str, publication: pd.DataFrame, author_pubs: pd.DataFrame,
+                  edge_pubs: pd.DataFrame, num_existing: int):
+    """
+    Add new publications and their author/edge rows to the lookup store.
+    The store is updated on a copy and swapped in atomically.
+    Raises ValueError if the store does not hold exactly 'num_existing'
+    publications (e.g. the rows were already appended).
+    """
+    tmp_path = f'{lookup_path}.tmp-{os.getpid()}'
+    shutil.copyfile(lookup_path, tmp_path)
+
+    columns = ['pub_id', 'Title', 'Year', 'Source title', 'Cited by', 'Link']
+    pubs = publication[columns].astype(object)
+    pubs = pubs.where(pubs.notna(), None)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        (count,) = conn.execute('SELECT COUNT(*) FROM publications').fetchone()
+        if count != num_existing:
+            raise ValueError(f'Lookup store holds {count} publications, expected {num_existing}')
+        conn.executemany('INSERT INTO publications VALUES (?, ?, ?, ?, ?, ?)', pubs.itertuples(index=False))
+        conn.executemany('INSERT INTO author_pubs VALUES (?, ?)', author_pubs.itertuples(index=False))
+        conn.executemany('INSERT INTO edge_pubs VALUES (?, ?)', edge_pubs.itertuples(index=False))
+        conn.commit()
+    except Exception:
+        conn.close()
+        os.remove(tmp_path)
+        raise
+    else:
+        conn.close()
+    os.replace(tmp_path, lookup_path)
+
+
+def _query_lookup(org_id: str, query: str, key) -> list:
+    """Run 'query' against the lookup store of 'org_id' (read-only)."""
+    path = os.path.abspath(f'{BASE_PATH}/{org_id}/{LOOKUP_FILE}')
+    conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+    try:
+        return conn.execute(query, (key,)).fetchall()
+    finally:
+        conn.close()
+
+
+def load_author_publications(org_id: str, author: str) -> list:
+    """
+    Return publications of 'author' as tuples
+    (Title, Year, Source title, Cited by, Link).
+    """
+    return _query_lookup(org_id, """
+        SELECT p.title, p.year, p.source_title, p.cited_by, p.link
+        FROM author_pubs a JOIN publications p ON p.pub_id = a.pub_id
+        WHERE a.author = ?
+        ORDER BY a.rowid
+    """, author)
+
+
+def load_edge_publications(org_id: str, edge_id: int) -> list:
+    """
+    Return joint publications of edge 'edge_id' as tuples
+    (Title, Year, Source title, Cited by, Link).
+    """
+    return _query_lookup(org_id, """
+        SELECT p.title, p.year, p.source_title, p.cited_by, p.link
+        FROM edge_pubs e JOIN publications p ON p.pub_id = e.pub_id
+        WHERE e.edge_id = ?
+        ORDER BY e.rowid
+    """, edge_id)
@@ -0,0 +1,64 @@
+"""
+Module: clusters
+Builds the aggregated cluster view of a graph: one supernode per
+cluster, placed at the centroid of its nodes and sized by its number
+of authors, and one edge per pair of clusters weighted by the summed
+weight of co-authorship edges between them.
+"""
+import numpy as np
+
+
+def build_cluster_graph(nodes, edges, edge_index: dict, min_size: int = 30, max_size: int = 120) -> dict:
+    """
+    Build the columnar cluster graph sent along with graph data.
+
+    Args:
+        nodes: nodes table with 'cluster', 'x', 'y' and 'node_color'.
+        edges: edges table with 'weight'.
+        edge_index: edge index of the graph (see visibility.build_edge_index),
+            used for node rows of edge endpoints.
+        min_size, max_size: supernode diameter range; the area grows
+            with the number of authors.
+
+    Returns:
+        dict with 'nodes' (columns 'cluster', 'x', 'y', 'color', 'authors',
+        'size') and 'edges' (columns 'source', 'target' as supernode rows,
+        'weight').
+    """
+    clusters, codes = np.unique(nodes['cluster'].to_numpy(), return_inverse=True)
+    authors = np.bincount(codes, minlength=len(clusters))
+    x = np.bincount(codes, weights=nodes['x'].to_numpy(dtype=float), minlength=len(clusters)) / authors
+    y = np.bincount(codes, weights=nodes['y'].to_numpy(dtype=float), minlength=len(clusters)) / authors
+
+    # Color of a cluster is the color of its nodes
+    first_rows = np.full(len(clusters), len(codes), dtype=np.int64)
+    np.minimum.at(first_rows, codes, np.arange(len(codes)))
+    colors = nodes['node_color'].to_numpy()[first_rows]
+
+    size = min_size + (max_size - min_size) * np.sqrt(authors / authors.max())
+
+    # Sum weights of edges joining different clusters, per unordered pair
+    source = codes[edge_index['source']]
+    target = codes[edge_index['target']]
+    between = source != target
+    low = np.minimum(source, target)[between]
+    high = np.maximum(source, target)[between]
+    weights = edges['weight'].to_numpy()[between]
+    pairs, inverse = np.unique(low * len(clusters) + high, return_inverse=True)
+    pair_weights = np.bincount(inverse, weights=weights, minlength=len(pairs))
+
+    return {
+        'nodes': {
+            'cluster': clusters.tolist(),
+            'x': np.round(x, 2).tolist(),
+            'y': np.round(y, 2).tolist(),
+            'color': colors.tolist(),
+            'authors': authors.tolist(),
+            'size': np.round(size, 1).tolist(),
+        },
+        'edges': {
+            'source': (pairs // len(clusters)).tolist(),
+            'target': (pairs % len(clusters)).tolist(),
+            'weight': pair_weights.astype(edges['weight'].dtype).tolist(),
+        },
+    }
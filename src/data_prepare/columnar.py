@@ -0,0 +1,271 @@
+"""
+Module: columnar
+Defines the on-disk columnar cache format.
+
+A bundle is a directory of .npy files plus a small JSON header:
+  - header.json: format version, table schemas and JSON metadata
+  - {table}.{column}.npy: numeric column
+  - {table}.{column}.data.npy / .offsets.npy: UTF-8 string column
+    (concatenated bytes and int64 offsets), with optional .valid.npy mask
+  - {name}.npy: standalone array (e.g. CSR offsets and indices); arrays
+    of one index share a name prefix (see prefix_arrays)
+
+Arrays are opened with memory mapping and never through pickle, so
+loading a bundle only reads the header; column data is paged in
+on first access.
+
+Bundles are written as generations: each save creates a new
+gen-XXXXXX-<writer> directory (unique per writer, so concurrent builders
+never publish into the same directory) and then atomically switches the
+CURRENT pointer. The previous generation is kept, so readers that loaded
+it before the switch (e.g. cached in memory, or a request in flight)
+can still open its lazily loaded columns; older generations are removed.
+"""
+import os
+import sys
+import json
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 5
+HEADER_FILE = 'header.json'
+CURRENT_FILE = 'CURRENT'
+
+# Generations kept on disk after a save: the new one and its predecessor
+KEEP_GENERATIONS = 2
+
+
+class ColumnTable:
+    """
+    Read-only table backed by memory-mapped column files.
+    Supports the DataFrame subset used by callers: len(), .columns,
+    table[col] -> pd.Series and to_frame().
+    """
+    def __init__(self, path: str, name: str, spec: dict):
+        self._path = path
+        self._name = name
+        self._spec = spec
+        self._cache = {}
+
+    def __len__(self) -> int:
+        return self._spec['length']
+
+    @property
+    def columns(self) -> list:
+        return list(self._spec['columns'])
+
+    def __contains__(self, col) -> bool:
+        return col in self._spec['columns']
+
+    def __getitem__(self, col: str) -> pd.Series:
+        if col not in self._cache:
+            kind = self._spec['columns'][col]
+            prefix = os.path.join(self._path, f'{self._name}.{col}')
+            if kind == 'string':
+                values = _load_strings(prefix)
+            else:
+                values = _load_array(f'{prefix}.npy')
+            self._cache[col] = pd.Series(values, name=col, copy=False)
+        return self._cache[col]
+
+    def memory_usage(self) -> int:
+        """
+        Bytes the table holds once all its columns are loaded: loaded
+        columns are measured, the others estimated from their files
+        (a decoded string also costs a str object and a pointer).
+        """
+        total = 0
+        for col, kind in self._spec['columns'].items():
+            if col in self._cache:
+                total += self._cache[col].memory_usage(index=True, deep=True)
+                continue
+            prefix = os.path.join(self._path, f'{self._name}.{col}')
+            try:
+                if kind == 'string':
+                    total += os.path.getsize(f'{prefix}.data.npy') + len(self) * (sys.getsizeof('') + 8)
+                else:
+                    total += os.path.getsize(f'{prefix}.npy')
+            except OSError:
+                pass
+        return int(total)
+
+    def to_frame(self, columns: list = None) -> pd.DataFrame:
+        """Materialize 'columns' (default: all) as a DataFrame."""
+        columns = columns or self.columns
+        return pd.DataFrame({col: self[col].to_numpy() for col in columns})
+
+
+def _load_array(path: str) -> np.ndarray:
+    """Open a saved array as a read-only memory map (empty arrays are read directly)."""
+    try:
+        return np.load(path, mmap_mode='r', allow_pickle=False)
+    except ValueError:
+        return np.load(path, allow_pickle=False)
+
+
+def _save_strings(prefix: str, series: pd.Series):
+    """Save an object column as UTF-8 bytes + offsets (+ validity mask)."""
+    valid = series.notna().to_numpy()
+    encoded = [str(v).encode('utf-8') if ok else b'' for v, ok in zip(series.tolist(), valid)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(f'{prefix}.data.npy', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(f'{prefix}.offsets.npy', offsets)
+    if not valid.all():
+        np.save(f'{prefix}.valid.npy', valid)
+
+
+def _load_strings(prefix: str) -> np.ndarray:
+    """Decode a string column saved by _save_strings into an object array."""
+    data = _load_array(f'{prefix}.data.npy')
+    offsets = np.load(f'{prefix}.offsets.npy', allow_pickle=False)
+    raw = data.tobytes() if len(data) else b''
+    values = np.empty(len(offsets) - 1, dtype=object)
+    values[:] = [raw[a:b].decode('utf-8') for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+    if os.path.exists(f'{prefix}.valid.npy'):
+        valid = np.load(f'{prefix}.valid.npy', allow_pickle=False)
+        values[~valid] = None
+    return values
+
+
+def prefix_arrays(prefix: str, values: dict) -> dict:
+    """Name the arrays of 'values' (e.g. an index) '{prefix}_{key}' for save_bundle."""
+    return {f'{prefix}_{key}': value for key, value in values.items()}
+
+
+def select_arrays(arrays: dict, prefix: str) -> dict:
+    """Inverse of prefix_arrays: the arrays named '{prefix}_{key}', by key."""
+    start = len(prefix) + 1
+    return {name[start:]: value for name, value in arrays.items() if name.startswith(f'{prefix}_')}
+
+
+def _json_default(value):
+    """Convert numpy scalars to native Python values for JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def current_generation(cache_dir: str):
+    """Return the path of the current generation in 'cache_dir', or None."""
+    try:
+        with open(os.path.join(cache_dir, CURRENT_FILE), 'r', encoding='utf-8') as f:
+            name = f.read().strip()
+    except OSError:
+        return None
+    path = os.path.join(cache_dir, name)
+    if not name or not os.path.exists(os.path.join(path, HEADER_FILE)):
+        return None
+    return path
+
+
+def save_bundle(cache_dir: str, tables: dict, arrays: dict, meta: dict) -> str:
+    """
+    Write a new bundle generation into 'cache_dir' and make it current.
+
+    Args:
+        cache_dir: directory holding all generations.
+        tables: name -> DataFrame; object columns are stored as strings.
+        arrays: name -> 1-D numpy array.
+        meta: JSON-serializable metadata (numpy scalars are converted).
+
+    Returns:
+        Path to the new generation directory.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    existing = [d for d in os.listdir(cache_dir) if _generation_number(d) is not None]
+    number = max((_generation_number(d) for d in existing), default=0) + 1
+    name = f'gen-{number:06d}-{os.getpid()}-{uuid.uuid4().hex[:8]}'
+    tmp_path = os.path.join(cache_dir, f'.{name}.tmp-{os.getpid()}')
+    os.makedirs(tmp_path)
+
+    header = {'version': FORMAT_VERSION, 'tables': {}, 'arrays': [], 'meta': meta}
+    for table_name, df in tables.items():
+        columns = {}
+        for col in df.columns:
+            prefix = os.path.join(tmp_path, f'{table_name}.{col}')
+            series = df[col]
+            if series.dtype == object:
+                _save_strings(prefix, series)
+                columns[col] = 'string'
+            else:
+                np.save(f'{prefix}.npy', series.to_numpy(), allow_pickle=False)
+                columns[col] = 'numeric'
+        header['tables'][table_name] = {'length': len(df), 'columns': columns}
+
+    for array_name, values in arrays.items():
+        np.save(os.path.join(tmp_path, f'{array_name}.npy'), np.asarray(values), allow_pickle=False)
+        header['arrays'].append(array_name)
+
+    with open(os.path.join(tmp_path, HEADER_FILE), 'w', encoding='utf-8') as f:
+        json.dump(header, f, default=_json_default)
+
+    # Publish: move generation into place, then switch the pointer atomically
+    gen_path = os.path.join(cache_dir, name)
+    os.replace(tmp_path, gen_path)
+    pointer_tmp = os.path.join(cache_dir, f'{CURRENT_FILE}.tmp-{os.getpid()}')
+    with open(pointer_tmp, 'w', encoding='utf-8') as f:
+        f.write(name)
+    os.replace(pointer_tmp, os.path.join(cache_dir, CURRENT_FILE))
+
+    # Keep the previous generation for readers that loaded it before the
+    # switch; remove older ones
+    remove_old_generations(cache_dir, keep=[name])
+
+    return gen_path
+
+
+def _generation_number(dir_name: str):
+    """Number of a generation directory name ('gen-XXXXXX[-writer]'), or None."""
+    if not dir_name.startswith('gen-'):
+        return None
+    number = dir_name[4:].split('-', 1)[0]
+    return int(number) if number.isdigit() else None
+
+
+def remove_old_generations(cache_dir: str, keep: list = ()):
+    """
+    Delete all but the newest KEEP_GENERATIONS generations of 'cache_dir'
+    (by number, then modification time). Generations named in 'keep' and
+    the current one are never deleted.
+    """
+    current = current_generation(cache_dir)
+    protected = set(keep) | ({os.path.basename(current)} if current else set())
+
+    def age(d):
+        return _generation_number(d), os.path.getmtime(os.path.join(cache_dir, d))
+
+    generations = sorted(
+        (d for d in os.listdir(cache_dir) if _generation_number(d) is not None),
+        key=age,
+        reverse=True,
+    )
+    for d in generations[KEEP_GENERATIONS:]:
+        if d not in protected:
+            shutil.rmtree(os.path.join(cache_dir, d), ignore_errors=True)
+
+
+def load_bundle(gen_path: str) -> dict:
+    """
+    Open a bundle generation. Only the header is read; tables are
+    returned as ColumnTable and arrays as read-only memory maps.
+
+    Returns:
+        dict with keys 'tables', 'arrays', 'meta'.
+    """
+    with open(os.path.join(gen_path, HEADER_FILE), 'r', encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f'Unsupported cache format version: {header.get("version")}')
+
+    tables = {
+        name: ColumnTable(gen_path, name, spec)
+        for name, spec in header['tables'].items()
+    }
+    arrays = {
+        name: _load_array(os.path.join(gen_path, f'{name}.npy'))
+        for name in header['arrays']
+    }
+    return {'tables': tables, 'arrays': arrays, 'meta': header['meta']}
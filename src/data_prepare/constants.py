@@ -6,10 +6,25 @@ Holds all file- and directory-related constants for data preparation.
 BASE_PATH: str = 'org_data/processed'
 
 # Constants for file names under org_data/processed/{org_id}/
-CACHE_FILE: str = 'cache.pkl'
-AUTHORS_CACHE_FILE: str = 'cache_authors.pkl'
-COAUTHORS_CACHE_FILE: str = 'cache_coauthors.pkl'
+CACHE_DIR: str = 'cache'
+LOOKUP_FILE: str = 'cache_lookup.sqlite'
+MANIFEST_FILE: str = 'cache_manifest.json'
 THESAURUS_FILE: str = 'thesaurus_authors.txt'
 PUBLICATIONS_FILE: str = 'publications.csv'
 NODES_FILE: str = 'map.txt'
 EDGES_FILE: str = 'network.txt'
+
+# Memory budget of the in-process cache of prepared orgs (bytes)
+ORG_CACHE_BUDGET: int = 1024 * 1024 * 1024
+
+# Orgs with at least this many edges are filtered server-side:
+# the browser receives only edges visible at the current threshold
+SERVER_FILTER_MIN_EDGES: int = 20000
+
+# Orgs with at least this many nodes open in the cluster view
+# (one supernode per cluster) instead of the full graph
+CLUSTER_VIEW_MIN_NODES: int = 4000
+
+# Orgs with at least this many nodes stream the full graph by viewport:
+# only nodes near the visible area are rendered, more as the user pans
+VIEWPORT_STREAM_MIN_NODES: int = 2000
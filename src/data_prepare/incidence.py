@@ -0,0 +1,140 @@
+"""
+Module: incidence
+Author-publication incidence table shared by all build stages.
+
+Author names are normalized once per build (standardize_author_series),
+interned to integer author IDs and stored in CSR form:
+publications of author i are pub_ids[offsets[i]:offsets[i + 1]],
+sorted ascending. All per-author and per-pair aggregations consume
+this structure instead of re-parsing the 'Authors' column.
+"""
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from .processing import standardize_author_series
+
+
+@dataclass
+class AuthorIncidence:
+    """
+    CSR incidence of authors x publications.
+
+    Attributes:
+        authors: normalized author names; position is the author ID.
+        offsets: int64 array of length len(authors) + 1.
+        pub_ids: int32 array of publication IDs (1-based, as in 'pub_id').
+        num_pubs: total number of publications (including author-less ones).
+    """
+    authors: np.ndarray
+    offsets: np.ndarray
+    pub_ids: np.ndarray
+    num_pubs: int
+    _author_index: pd.Index = field(default=None, init=False, repr=False)
+
+    @property
+    def num_authors(self) -> int:
+        return len(self.authors)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of publications of each author."""
+        return np.diff(self.offsets)
+
+    @property
+    def author_index(self) -> pd.Index:
+        """Index over author names for vectorized name -> author ID lookups."""
+        if self._author_index is None:
+            self._author_index = pd.Index(self.authors)
+        return self._author_index
+
+    def author_ids(self, names) -> np.ndarray:
+        """Return author IDs of 'names' (-1 for unknown names)."""
+        return self.author_index.get_indexer(names)
+
+    def incidence_authors(self) -> np.ndarray:
+        """Author name of every incidence, aligned with 'pub_ids'."""
+        return np.repeat(self.authors, self.counts)
+
+    def to_matrix(self) -> sparse.csr_matrix:
+        """Binary authors x publications matrix (column = pub_id - 1)."""
+        data = np.ones(len(self.pub_ids), dtype=np.int32)
+        return sparse.csr_matrix(
+            (data, self.pub_ids - 1, self.offsets),
+            shape=(self.num_authors, self.num_pubs)
+        )
+
+    def reduce_by_author(self, values: np.ndarray, ufunc) -> np.ndarray:
+        """
+        Reduce per-publication 'values' (indexed by pub_id - 1) over each
+        author's publications with 'ufunc' (e.g. np.minimum).
+        Every author has at least one publication.
+        """
+        per_incidence = np.asarray(values)[self.pub_ids - 1]
+        return ufunc.reduceat(per_incidence, self.offsets[:-1])
+
+    def reduce_by_names(self, names, values: np.ndarray, ufunc) -> np.ndarray:
+        """
+        reduce_by_author for authors 'names', as a float array:
+        NaN for names without publications (also when there are no authors).
+        """
+        ids = self.author_ids(names)
+        result = np.full(len(ids), np.nan)
+        found = ids >= 0
+        if found.any():
+            result[found] = self.reduce_by_author(values, ufunc)[ids[found]]
+        return result
+
+
+def build_incidence(publication: pd.DataFrame, replace_dict: dict, num_pubs: int = None) -> AuthorIncidence:
+    """
+    Normalize the 'Authors' column once and build the incidence table.
+    Empty names are dropped and repeated (author, publication) pairs
+    are counted once. 'num_pubs' defaults to len(publication); pass the
+    total count when 'publication' holds only some of the org's rows.
+    """
+    rows, names = standardize_author_series(publication['Authors'], replace_dict)
+    pub_ids = publication['pub_id'].to_numpy()[rows]
+
+    keep = names != ''
+    return incidence_from_pairs(
+        names[keep], pub_ids[keep],
+        len(publication) if num_pubs is None else num_pubs
+    )
+
+
+def merge_incidence(old: AuthorIncidence, added: AuthorIncidence) -> AuthorIncidence:
+    """
+    Combine two incidence tables over the same publication ID space
+    (e.g. the cached one and one built from appended rows).
+    """
+    return incidence_from_pairs(
+        np.concatenate([old.incidence_authors(), added.incidence_authors()]),
+        np.concatenate([old.pub_ids, added.pub_ids]),
+        max(old.num_pubs, added.num_pubs)
+    )
+
+
+def incidence_from_pairs(names: np.ndarray, pub_ids: np.ndarray, num_pubs: int) -> AuthorIncidence:
+    """Build the CSR incidence from aligned (author name, pub_id) pairs."""
+    codes, authors = pd.factorize(names, sort=True)
+    order = np.lexsort((pub_ids, codes))
+    codes = codes[order]
+    pub_ids = np.asarray(pub_ids)[order].astype(np.int32)
+
+    # Drop duplicated (author, publication) pairs
+    if len(codes):
+        unique = np.ones(len(codes), dtype=bool)
+        unique[1:] = (codes[1:] != codes[:-1]) | (pub_ids[1:] != pub_ids[:-1])
+        codes = codes[unique]
+        pub_ids = pub_ids[unique]
+
+    offsets = np.zeros(len(authors) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(authors)), out=offsets[1:])
+
+    return AuthorIncidence(
+        authors=np.asarray(authors, dtype=object),
+        offsets=offsets,
+        pub_ids=pub_ids,
+        num_pubs=num_pubs,
+    )
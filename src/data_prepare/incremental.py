@@ -0,0 +1,181 @@
+"""
+Module: incremental
+Updates the caches of an organization when rows were only appended
+to publications.csv (the weekly Scopus export), without a full rebuild.
+
+Only the appended rows are parsed and normalized (new author name
+variants are first added to the thesaurus). They are merged into
+the cached author -> pub_ids incidence, publication table, per-author
+first/last years, year histogram and citation totals; joint publications
+are computed for the new rows only and added to the lookup store.
+Publications of every node are selected again from the merged
+incidence; nodes and edges do not change, so their indexes are
+carried over.
+The caller writes the result as a new cache generation.
+
+Any other source change (thesaurus, nodes, edges, or edited/removed
+publication rows) requires a full rebuild, and so does a thesaurus
+that cannot be extended (see thesaurus_builder.update_author_thesaurus).
+"""
+import io
+import os
+import numpy as np
+import pandas as pd
+from .cache import load_manifest, is_source_fresh, is_source_appended, append_lookup
+from .columnar import current_generation, load_bundle
+from .constants import BASE_PATH, CACHE_DIR, LOOKUP_FILE, MANIFEST_FILE
+from .incidence import AuthorIncidence, build_incidence, merge_incidence
+from .loading import load_thesaurus
+from .processing import build_coauthors_map, compute_h_index, node_publication_csr
+from .utils import get_source_paths
+from src.thesaurus_builder import IDS_COL, NAMES_COL, update_author_thesaurus
+
+
+def find_appended_publications(org_id: str):
+    """
+    Return the byte offset where appended rows of publications.csv start,
+    or None if the caches cannot be updated incrementally.
+    """
+    source_paths = get_source_paths(org_id)
+    manifest = load_manifest(f'{BASE_PATH}/{org_id}/{MANIFEST_FILE}')
+    cache_path = current_generation(f'{BASE_PATH}/{org_id}/{CACHE_DIR}')
+    if not manifest or not cache_path or not os.path.exists(f'{BASE_PATH}/{org_id}/{LOOKUP_FILE}'):
+        return None
+
+    # The manifest must describe the generation we would extend
+    if manifest.get('generation') != os.path.basename(cache_path):
+        return None
+
+    fingerprints = manifest.get('sources', {})
+    if set(fingerprints) != set(source_paths):
+        return None
+    for key, p in source_paths.items():
+        if not os.path.exists(p):
+            return None
+        if key == 'publications':
+            if not is_source_appended(p, fingerprints[key]):
+                return None
+        elif not is_source_fresh(p, fingerprints[key])[0]:
+            return None
+
+    return fingerprints['publications']['size']
+
+
+def load_appended_publications(org_id: str, offset: int) -> pd.DataFrame:
+    """
+    Parse rows of publications.csv starting at byte 'offset' (with the
+    file's header). Author columns stay text even if all appended rows
+    have no authors.
+    """
+    path = get_source_paths(org_id)['publications']
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(offset)
+        tail = f.read()
+    return pd.read_csv(io.BytesIO(header + tail), dtype={NAMES_COL: object, IDS_COL: object})
+
+
+def update_network_bundle(org_id: str):
+    """
+    Extend the current cache generation of 'org_id' with appended
+    publication rows and update the lookup store.
+
+    Returns:
+        dict with keys 'tables', 'arrays', 'meta' (as build_network_bundle),
+        or None if the sources changed in a way that needs a full rebuild.
+    """
+    offset = find_appended_publications(org_id)
+    if offset is None:
+        return None
+
+    bundle = load_bundle(current_generation(f'{BASE_PATH}/{org_id}/{CACHE_DIR}'))
+    tables = bundle['tables']
+    arrays = bundle['arrays']
+    meta = dict(bundle['meta'])
+
+    old_publication = tables['publications'].to_frame()
+    num_old = len(old_publication)
+    added = load_appended_publications(org_id, offset)
+    added['pub_id'] = range(num_old + 1, num_old + len(added) + 1)
+    for col in ['Year', 'Cited by']:
+        added[col] = added[col].astype(old_publication[col].dtype)
+    publication = pd.concat([old_publication, added[old_publication.columns]], ignore_index=True)
+    num_pubs = len(publication)
+
+    # Variants of newly seen names go to the thesaurus (existing mappings
+    # stay as they are), then only the new rows are normalized and merged.
+    # Without a thesaurus index (or with IDs missing from the new rows)
+    # the thesaurus cannot be extended: rebuild everything
+    if not update_author_thesaurus(org_id, added):
+        return None
+    replace_dict = load_thesaurus(org_id)
+    added_incidence = build_incidence(added, replace_dict, num_pubs=num_pubs)
+    old_incidence = AuthorIncidence(
+        authors=tables['authors']['name'].to_numpy(),
+        offsets=np.asarray(arrays['author_offsets']),
+        pub_ids=np.asarray(arrays['author_pub_ids']),
+        num_pubs=num_pubs,
+    )
+    incidence = merge_incidence(old_incidence, added_incidence)
+
+    nodes = tables['nodes'].to_frame()
+    edges = tables['edges'].to_frame()
+    pub_offsets, pub_ids = node_publication_csr(
+        nodes['label'], incidence.authors, incidence.offsets, incidence.pub_ids
+    )
+
+    # First and last pub years: combine cached values with the new rows
+    pub_years = publication['Year'].to_numpy()
+    nodes['First_pub_year'] = np.fmin(
+        nodes['First_pub_year'].to_numpy(),
+        added_incidence.reduce_by_names(nodes['label'], pub_years, np.minimum)
+    )
+    nodes['Last_pub_year'] = np.fmax(
+        nodes['Last_pub_year'].to_numpy(),
+        added_incidence.reduce_by_names(nodes['label'], pub_years, np.maximum)
+    )
+    metrics_bounds = dict(meta['metrics_bounds'])
+    for col in ['First_pub_year', 'Last_pub_year']:
+        metrics_bounds[col] = {
+            'min': nodes[col].min(),
+            'max': nodes[col].max()
+        }
+
+    # Year histogram
+    counts_by_year = (
+        pd.Series(meta['counts_publication_by_year'], index=meta['years'])
+        .add(added.groupby('Year').size(), fill_value=0)
+    )
+    years = list(range(publication['Year'].min(), publication['Year'].max() + 1))
+    counts_by_year = counts_by_year.reindex(years, fill_value=0).astype(int).tolist()
+
+    # Joint publications and lookup rows of the new publications only
+    edge_pubs = build_coauthors_map(added_incidence, edges)
+    author_pubs = pd.DataFrame({'author': added_incidence.incidence_authors(), 'pub_id': added_incidence.pub_ids})
+    append_lookup(f'{BASE_PATH}/{org_id}/{LOOKUP_FILE}', added, author_pubs, edge_pubs, num_old)
+
+    meta.update({
+        'metrics_bounds': metrics_bounds,
+        'num_publication': num_pubs,
+        'num_cites': publication['Cited by'].sum(),
+        'h_index': compute_h_index(publication['Cited by']),
+        'years': years,
+        'counts_publication_by_year': counts_by_year,
+    })
+
+    return {
+        'tables': {
+            'nodes': nodes,
+            'edges': edges,
+            'publications': publication,
+            'authors': pd.DataFrame({'name': incidence.authors}),
+        },
+        'arrays': {
+            **arrays,
+            'author_offsets': incidence.offsets,
+            'author_pub_ids': incidence.pub_ids,
+            'node_pub_offsets': pub_offsets,
+            'node_pub_ids': pub_ids,
+        },
+        'meta': meta,
+    }
@@ -8,14 +8,19 @@ import pandas as pd
 from .constants import BASE_PATH, THESAURUS_FILE, PUBLICATIONS_FILE, NODES_FILE, EDGES_FILE
 from src.thesaurus_builder import build_author_thesaurus
 
+def ensure_thesaurus(org_id: str):
+    """Build the thesaurus of 'org_id' if it does not exist yet."""
+    if not os.path.exists(f'{BASE_PATH}/{org_id}/{THESAURUS_FILE}'):
+        build_author_thesaurus(org_id=org_id)
+
+
 def load_thesaurus(org_id: str) -> dict:
     """
     Check thesaurus exists (build if not),
     load and return dict[label -> replace_by].
     """
     thesaurus_path = f'{BASE_PATH}/{org_id}/{THESAURUS_FILE}'
-    if not os.path.exists(thesaurus_path):
-        build_author_thesaurus(org_id=org_id)
+    ensure_thesaurus(org_id)
 
     replace_dict = (
         pd.read_csv(thesaurus_path, sep='\t')
@@ -0,0 +1,192 @@
+"""
+Module: memory
+Process-wide LRU cache of prepared organizations.
+
+Entries are prepare_network_elements results keyed by org ID. The cache
+keeps the most recently used entries within a byte budget. Memory-mapped
+tables are charged at their fully loaded size when an entry is stored,
+and an entry is measured again when it has built derived data on
+access (see base.NetworkElements). Entries are validated against a stat
+signature of the org source files (size and mtime only) taken before
+loading, so switching back to a recently viewed org needs no file reads
+and no deserialization. Concurrent requests for the same org share a
+single load.
+
+Cached results are shared between callers and must be treated as read-only.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from .base import prepare_network_elements
+from .columnar import ColumnTable
+from .constants import ORG_CACHE_BUDGET
+from .utils import get_source_paths
+
+
+def estimate_size(obj, seen: set = None) -> int:
+    """
+    Estimate memory footprint of 'obj' in bytes, following containers.
+    DataFrames and arrays (memory maps included) are measured by their
+    buffers; memory-mapped tables count as if all columns were loaded.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, ColumnTable):
+        return obj.memory_usage()
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, seen) for v in obj)
+    return size
+
+
+def source_signature(org_id: str) -> tuple:
+    """Return (size, mtime) of every source file of 'org_id' (None if missing)."""
+    signature = []
+    for p in get_source_paths(org_id).values():
+        try:
+            stat = os.stat(p)
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+class OrgCache:
+    """
+    Thread-safe LRU cache of prepared organizations with a byte budget.
+
+    Args:
+        budget: maximum total size of cached entries in bytes.
+        loader: function org_id -> prepared result.
+    """
+    def __init__(self, budget: int, loader=prepare_network_elements):
+        self.budget = budget
+        self.loader = loader
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # org_id -> (signature, result, size, revision)
+        self._lock = threading.Lock()
+        self._loading = {}  # org_id -> Lock held while loading, kept for the process
+
+    def get(self, org_id: str) -> dict:
+        """Return the prepared result for 'org_id', loading it on a miss."""
+        signature = source_signature(org_id)
+        entry = self._lookup(org_id, signature)
+        if entry is not None:
+            return entry
+
+        # One lock per org: a load is never run twice at the same time
+        with self._lock:
+            load_lock = self._loading.setdefault(org_id, threading.Lock())
+
+        with load_lock:
+            # Another thread may have loaded it while we waited
+            entry = self._lookup(org_id, signature)
+            if entry is not None:
+                return entry
+            with self._lock:
+                self.misses += 1
+            result = self.loader(org_id)
+            # Sources changed during the load are caught by the next lookup
+            self.put(org_id, result, signature)
+        return result
+
+    def _lookup(self, org_id: str, signature: tuple):
+        """Return a valid cached result and mark it recently used, else None."""
+        with self._lock:
+            entry = self._entries.get(org_id)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(org_id)
+                self.hits += 1
+                result, revision = entry[1], entry[3]
+            else:
+                if entry is not None:
+                    del self._entries[org_id]
+                return None
+
+        # Derived data built since the entry was measured
+        if getattr(result, 'revision', 0) != revision:
+            self._remeasure(org_id, result)
+        return result
+
+    def put(self, org_id: str, result: dict, signature: tuple):
+        """Store 'result', evicting least recently used entries over budget."""
+        revision = getattr(result, 'revision', 0)
+        size = estimate_size(result)
+        with self._lock:
+            self._entries.pop(org_id, None)
+            if size > self.budget:
+                return
+            self._entries[org_id] = (signature, result, size, revision)
+            self._evict()
+
+    def _remeasure(self, org_id: str, result: dict):
+        """Measure the entry of 'result' again, evicting entries over budget."""
+        revision = getattr(result, 'revision', 0)
+        size = estimate_size(result)
+        with self._lock:
+            entry = self._entries.get(org_id)
+            if entry is None or entry[1] is not result:
+                return
+            if size > self.budget:
+                del self._entries[org_id]
+                return
+            self._entries[org_id] = (entry[0], result, size, revision)
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until the total fits the budget (lock held)."""
+        total = sum(e[2] for e in self._entries.values())
+        while total > self.budget:
+            _, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+            total -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self, org_id: str = None):
+        """Drop the entry of 'org_id', or all entries when None."""
+        with self._lock:
+            if org_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(org_id, None)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the measured size of each entry."""
+        with self._lock:
+            sizes = {org_id: e[2] for org_id, e in self._entries.items()}
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'budget': self.budget,
+                'bytes': sum(sizes.values()),
+                'entries': sizes,
+            }
+
+
+org_cache = OrgCache(ORG_CACHE_BUDGET)
+
+
+def get_network_elements(org_id: str) -> dict:
+    """
+    Return prepare_network_elements(org_id) through the process-wide cache.
+    The result is shared and must not be modified.
+    """
+    return org_cache.get(org_id)
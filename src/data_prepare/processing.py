@@ -4,89 +4,155 @@ Provides core data transformation functions for preparing author
 and coauthor information, scaling node coordinates, and computing
 bibliometric metrics.
 """
-import itertools
+import numpy as np
 import pandas as pd
+from scipy import sparse
+from src.names import unique_values, clean_author_names
 
-def standardize_author_names(names: str, replace_dict: dict) -> list:
+def standardize_author_series(authors: pd.Series, replace_dict: dict):
     """
     Given raw 'Authors' column of semicolon-delimited strings,
     explode to individual lowercase names with thesaurus replacement.
+    Each distinct raw name is normalized once.
+
+    Returns:
+        (rows, names): positional row index of each name in 'authors'
+        and the normalized names, as aligned numpy arrays.
     """
-    arr_authors = [name.replace('et al.', '').strip() for name in names.split(';')]
-    res = []
-    for name in arr_authors:
-        res.append(replace_dict.get(name, name).lower())
-    return res
+    parts = authors.fillna('').str.split(';')
+    rows = np.repeat(np.arange(len(parts)), parts.str.len().to_numpy())
+    codes, raw_names = unique_values(np.concatenate(parts.to_numpy()) if len(parts) else [])
+    cleaned = clean_author_names(raw_names)
+    names = cleaned.map(replace_dict).fillna(cleaned).str.lower()
+    return rows, names.to_numpy(dtype=object)[codes]
 
 
-def build_authors_with_inform(publication: pd.DataFrame, replace_dict: dict) -> pd.DataFrame:
+def build_coauthors_map(incidence, edges: pd.DataFrame, max_authors: int = None,
+                        chunk_size: int = 20000) -> pd.DataFrame:
     """
-    Build DataFrame indexed by author, with aggregated lists:
-    - Title, Year, Source title, Cited by, Link
-    plus computed columns First_pub_year, Last_pub_year.
+    Build joint publications of every edge as rows (edge_id, pub_id).
+
+    Works on integer author IDs of the incidence table: the publication
+    rows of both endpoints are intersected with a sparse element-wise
+    product, restricted to pairs present in 'edges' (endpoints resolved
+    to labels). Cost is linear in the endpoints' publication counts, so
+    papers with hundreds of authors add no quadratic pair enumeration.
+
+    Args:
+        incidence: AuthorIncidence of the org.
+        edges: edges with 'first_author' / 'second_author' labels;
+            edge_id is the row position.
+        max_authors: if set, papers with more authors are skipped.
+        chunk_size: number of edges intersected per sparse product.
     """
-    df = (
-        publication.assign(
-            Authors = lambda df: df['Authors'].apply(
-                standardize_author_names,
-                replace_dict=replace_dict
-            )
-        )
-        .explode('Authors')
-        .groupby('Authors', as_index=False)
-        .agg({
-            'Title': list,
-            'Year': list,
-            'Source title': list,
-            'Cited by': list,
-            'Link': list
-        })
-    )
+    src = incidence.author_ids(edges['first_author'])
+    dst = incidence.author_ids(edges['second_author'])
+
+    # The same unordered pair listed twice keeps its last edge
+    pairs = pd.DataFrame({'a': np.minimum(src, dst), 'b': np.maximum(src, dst)})
+    valid = (src >= 0) & (dst >= 0) & (src != dst) & ~pairs.duplicated(keep='last').to_numpy()
+    edge_ids = np.flatnonzero(valid)
 
-    df['First_pub_year'] = df['Year'].apply(lambda yrs: min(yrs) if yrs else None)
-    df['Last_pub_year'] = df['Year'].apply(lambda yrs: max(yrs) if yrs else None)
+    matrix = incidence.to_matrix()
+    if max_authors is not None:
+        authors_per_pub = np.bincount(incidence.pub_ids - 1, minlength=incidence.num_pubs)
+        matrix = matrix @ sparse.diags((authors_per_pub <= max_authors).astype(np.int32), dtype=np.int32)
 
-    return df
+    res_edges, res_pubs = [], []
+    for start in range(0, len(edge_ids), chunk_size):
+        chunk = edge_ids[start:start + chunk_size]
+        joint = matrix[src[chunk]].multiply(matrix[dst[chunk]]).tocsr()
+        joint.eliminate_zeros()
+        joint.sort_indices()
+        res_edges.append(np.repeat(chunk, np.diff(joint.indptr)))
+        res_pubs.append(joint.indices + 1)
 
+    return pd.DataFrame({
+        'edge_id': np.concatenate(res_edges) if res_edges else np.array([], dtype=np.int64),
+        'pub_id': np.concatenate(res_pubs) if res_pubs else np.array([], dtype=np.int32),
+    })
 
-def build_coauthors_map(publication: pd.DataFrame, replace_dict: dict, edges_records: list) -> dict:
+
+def map_edge_ids_to_labels(nodes: pd.DataFrame, edges: pd.DataFrame) -> pd.DataFrame:
     """
-    Build a mapping edge_id -> list of joint publications.
-    - standardizes authors in each paper
-    - for each unordered pair that exists in edges_records,
-      collects (Title, Year, Source title, Cited by, Link)
+    Replace node IDs in 'first_author' / 'second_author' with node labels.
+    Resolves all endpoints with a single indexed lookup against nodes['id'].
+    Raises ValueError if node IDs are duplicated or edges reference unknown IDs.
     """
-    df = (
-        publication.assign(
-            Authors = lambda df: df['Authors'].apply(
-                standardize_author_names,
-                replace_dict=replace_dict
+    ids = pd.Index(nodes['id'])
+    if not ids.is_unique:
+        duplicated = ids[ids.duplicated()].unique().tolist()
+        raise ValueError(f'Duplicate node IDs in nodes map: {duplicated[:10]}')
+
+    labels = nodes['label'].to_numpy()
+    resolved = {}
+    for col in ['first_author', 'second_author']:
+        positions = ids.get_indexer(edges[col])
+        if (positions < 0).any():
+            dangling = edges.loc[positions < 0, col].unique().tolist()
+            raise ValueError(
+                f'Edges reference {len(dangling)} node IDs missing from nodes map: {dangling[:10]}'
             )
-        )
-    )
+        resolved[col] = labels[positions]
+
+    return edges.assign(**resolved)
+
+
+def build_graph_data(nodes: pd.DataFrame, edges: pd.DataFrame) -> dict:
+    """
+    Build the compact columnar graph sent to the browser
+    (edge endpoints already resolved to labels).
+
+    Nodes carry only the fields needed for rendering; their metrics
+    travel as a separate table aligned with node rows and are joined
+    into Cytoscape elements client-side on demand. Edges reference
+    nodes by row; their IDs, labels and colors are derived client-side.
+    """
+    metrics = [
+        'Links', 'Strength', 'Documents', 'Citations', 'Norm_citations',
+        'Avg_pub_year', 'First_pub_year', 'Last_pub_year',
+        'Avg_citations', 'Avg_norm_citations',
+    ]
+    rows = pd.Index(nodes['label'])
 
-    coauthors_id_map = {}
-    for ind, edge in enumerate(edges_records):
-        source, target = sorted([edge['first_author'], edge['second_author']])
-        coauthors_id_map[(source, target)] = ind
-
-    co_map: dict[tuple[str, str], list[tuple]] = {}
-    for _, row in df.iterrows():
-        authors = row['Authors']
-        for a, b in itertools.combinations(sorted(authors), 2):
-            if (a, b) in coauthors_id_map:
-                key = coauthors_id_map[(a, b)]
-                if key not in co_map:
-                    co_map[key] = []
-                co_map[key].append((
-                    row['Title'],
-                    row['Year'],
-                    row['Source title'],
-                    row['Cited by'],
-                    row['Link']
-                ))
-
-    return co_map
+    return {
+        'nodes': {
+            'id': nodes['label'].tolist(),
+            'x': nodes['x'].round(2).tolist(),
+            'y': nodes['y'].round(2).tolist(),
+            'cluster': nodes['cluster'].tolist(),
+            'color': nodes['node_color'].tolist(),
+            'max_edge_weight': nodes['max_edge_weight'].tolist(),
+        },
+        'edges': {
+            'source': rows.get_indexer(edges['first_author']).tolist(),
+            'target': rows.get_indexer(edges['second_author']).tolist(),
+            'weight': edges['weight'].tolist(),
+        },
+        'metrics': {col: nodes[col].tolist() for col in metrics},
+    }
+
+
+def node_publication_csr(labels, authors, offsets: np.ndarray, pub_ids: np.ndarray):
+    """
+    Select the CSR rows of 'authors' (author -> pub_ids) for node 'labels'.
+    Labels without publications get empty rows.
+
+    Returns:
+        (node_offsets, node_pub_ids) int32 arrays: publications of
+        node i are node_pub_ids[node_offsets[i]:node_offsets[i + 1]].
+    """
+    offsets = np.asarray(offsets)
+    pub_ids = np.asarray(pub_ids)
+    author_ids = pd.Index(authors).get_indexer(labels)
+    found = author_ids >= 0
+    starts = np.where(found, offsets[author_ids], 0)
+    counts = np.where(found, offsets[author_ids + 1] - offsets[author_ids], 0)
+
+    node_offsets = np.zeros(len(author_ids) + 1, dtype=np.int64)
+    np.cumsum(counts, out=node_offsets[1:])
+    positions = np.repeat(starts - node_offsets[:-1], counts) + np.arange(node_offsets[-1])
+    return node_offsets.astype(np.int32), pub_ids[positions].astype(np.int32)
 
 
 def scale_coordinates(series: pd.Series, new_min: int = 0, new_max: int = None) -> pd.Series:
@@ -113,6 +179,51 @@ def scale_coordinates(series: pd.Series, new_min: int = 0, new_max: int = None)
     return new_min + (series - old_min) * (new_max - new_min) / (old_max - old_min)
 
 
+def subgraph_statistics(pub_offsets: np.ndarray, pub_ids: np.ndarray, publications,
+                        years: list, rows=None, min_authors: int = 1) -> dict:
+    """
+    Publication statistics of the subgraph made of node 'rows'
+    (all nodes when None), from the node -> pub_ids CSR arrays.
+    A publication belongs to the subgraph when at least 'min_authors'
+    of its authors are among the nodes.
+
+    Returns:
+        dict with keys 'num_authors', 'num_publication', 'num_cites',
+        'h_index' and 'counts_publication_by_year' (aligned with 'years').
+    """
+    pub_offsets = np.asarray(pub_offsets, dtype=np.int64)
+    pub_ids = np.asarray(pub_ids)
+    if rows is None:
+        num_authors = len(pub_offsets) - 1
+        selected_ids = pub_ids
+    else:
+        rows = np.asarray(rows, dtype=np.int64)
+        num_authors = len(rows)
+        starts = pub_offsets[rows]
+        counts = pub_offsets[rows + 1] - starts
+        ends = np.cumsum(counts)
+        positions = np.repeat(starts - (ends - counts), counts) + np.arange(ends[-1] if len(ends) else 0)
+        selected_ids = pub_ids[positions]
+
+    authors_per_pub = np.bincount(selected_ids, minlength=len(publications) + 1)
+    pubs = np.flatnonzero(authors_per_pub[1:] >= min_authors)
+    cites = pd.Series(publications['Cited by'].to_numpy()[pubs]).fillna(0)
+    counts_by_year = (
+        pd.Series(publications['Year'].to_numpy()[pubs])
+        .value_counts()
+        .reindex(years, fill_value=0)
+        .tolist()
+    )
+
+    return {
+        'num_authors': num_authors,
+        'num_publication': len(pubs),
+        'num_cites': int(cites.sum()),
+        'h_index': compute_h_index(cites),
+        'counts_publication_by_year': counts_by_year,
+    }
+
+
 def compute_h_index(citation_counts):
     """
     Compute the h-index.
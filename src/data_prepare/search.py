@@ -0,0 +1,102 @@
+"""
+Module: search
+Author search index of an organization. Node labels are reduced to
+search keys (see names.name_search_keys), so Latin queries match
+Cyrillic names and the other way round. Keys are indexed by character
+trigrams: a query is ranked against every label sharing a trigram with
+it, which tolerates typos and word order, while exact substrings of a
+key rank first and are never cut off.
+
+The index consists of plain arrays (trigrams sorted, keys as fixed-width
+unicode), so it is built with the cache and memory-mapped on load.
+"""
+import numpy as np
+import pandas as pd
+from src.names import name_search_keys
+
+
+def key_trigrams(key: str) -> list:
+    """Trigrams of a search key, padded so that name starts weigh more."""
+    padded = f'$${key}'
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def build_search_index(labels) -> dict:
+    """
+    Index node 'labels' (aligned with node rows) for search_authors.
+
+    Returns:
+        dict of arrays: 'keys' (search key of every row), 'grams' (number
+        of trigrams of every key), 'trigrams' (sorted) and CSR 'offsets',
+        'rows': rows whose key contains trigrams[t] are
+        rows[offsets[t]:offsets[t + 1]].
+    """
+    keys = name_search_keys(pd.Series(labels, dtype=object)).tolist()
+    gram_lists = [sorted(set(key_trigrams(key))) for key in keys]
+
+    grams = np.fromiter((len(g) for g in gram_lists), dtype=np.int32, count=len(keys))
+    codes, trigrams = pd.factorize(pd.Series(
+        [t for g in gram_lists for t in g], dtype=object
+    ), sort=True)
+    rows = np.repeat(np.arange(len(keys), dtype=np.int32), grams)
+    order = np.argsort(codes, kind='stable')
+
+    offsets = np.zeros(len(trigrams) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(trigrams)), out=offsets[1:])
+
+    return {
+        'keys': np.array(keys, dtype=str),
+        'grams': grams,
+        'trigrams': np.array(trigrams, dtype='<U3'),
+        'offsets': offsets,
+        'rows': rows[order],
+    }
+
+
+def search_authors(index: dict, query: str, limit: int = 100, min_score: float = 0.3) -> list:
+    """
+    Rows of labels matching 'query', best first.
+
+    A label scores the share of trigrams it has in common with the query
+    (Jaccard similarity of trigram sets); a query that is a substring of
+    the label's key adds 1. All such labels are returned; of the others,
+    labels scoring below 'min_score' are dropped and at most 'limit'
+    best are kept. Queries shorter than three letters match key
+    prefixes only.
+    """
+    key = name_search_keys(pd.Series([query or ''], dtype=object)).iloc[0]
+    keys = index['keys']
+    if not key:
+        return []
+    if len(key) < 3:
+        return np.flatnonzero(np.char.startswith(keys, key)).tolist()
+
+    query_grams = sorted(set(key_trigrams(key)))
+    trigrams = index['trigrams']
+    positions = np.searchsorted(trigrams, query_grams)
+    found = positions < len(trigrams)
+    found[found] = trigrams[positions[found]] == np.array(query_grams)[found]
+    positions = positions[found]
+    if not len(positions):
+        return []
+    offsets = index['offsets']
+    postings = np.concatenate([index['rows'][offsets[p]:offsets[p + 1]] for p in positions])
+    common = np.bincount(postings, minlength=len(keys))
+
+    candidates = np.flatnonzero(common)
+    shared = common[candidates]
+    scores = shared / (len(query_grams) + index['grams'][candidates] - shared)
+
+    # A key containing the query has all of its inner (unpadded) trigrams
+    inner = sum(1 for t in query_grams if '$' not in t)
+    maybe = np.flatnonzero(shared >= inner)
+    scores[maybe] += np.fromiter((key in keys[row] for row in candidates[maybe]), dtype=float, count=len(maybe))
+
+    keep = scores >= min_score
+    candidates, scores = candidates[keep], scores[keep]
+    order = np.lexsort((candidates, -scores))
+    ranked, scores = candidates[order], scores[order]
+
+    # Substring matches score at least 1 and come first
+    num_exact = int(np.count_nonzero(scores >= 1))
+    return ranked[:num_exact + limit].tolist()
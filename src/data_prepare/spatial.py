@@ -0,0 +1,41 @@
+"""
+Module: spatial
+Builds a uniform grid index over node coordinates. Coordinates are
+fixed once scaled, so the index is built with the prepared org and
+lets the browser pick the nodes of any viewport by grid cells instead
+of scanning all nodes.
+"""
+import numpy as np
+
+
+def build_grid_index(nodes, side: int = 32) -> dict:
+    """
+    Index node rows by cells of a 'side' x 'side' grid covering the
+    bounding box of node coordinates (square cells).
+
+    Returns:
+        dict with 'x0', 'y0' (grid origin), 'cell' (cell size), 'side',
+        and arrays 'rows' (node rows ordered by cell) and 'offsets':
+        rows of cell c = cy * side + cx are rows[offsets[c]:offsets[c + 1]].
+    """
+    x = nodes['x'].to_numpy(dtype=float)
+    y = nodes['y'].to_numpy(dtype=float)
+    x0, y0 = (float(x.min()), float(y.min())) if len(x) else (0.0, 0.0)
+    span = max(float(x.max()) - x0, float(y.max()) - y0) if len(x) else 0.0
+    cell = (span or 1.0) / side
+
+    cx = np.minimum((x - x0) // cell, side - 1).astype(np.int64)
+    cy = np.minimum((y - y0) // cell, side - 1).astype(np.int64)
+    cells = cy * side + cx
+
+    offsets = np.zeros(side * side + 1, dtype=np.int64)
+    np.cumsum(np.bincount(cells, minlength=side * side), out=offsets[1:])
+
+    return {
+        'x0': x0,
+        'y0': y0,
+        'cell': cell,
+        'side': side,
+        'rows': np.argsort(cells, kind='stable').astype(np.int32),
+        'offsets': offsets,
+    }
@@ -0,0 +1,130 @@
+"""
+Module: visibility
+Server-side visibility filtering for orgs too large to send whole.
+
+Applies the same rules as the clientside stylesheet: edges below the
+weight threshold are hidden; nodes whose heaviest edge is below it
+are hidden unless isolates are shown; nodes outside the limits of the
+color metric are hidden, unless the limits clamped to the metric's
+range leave it empty; edges of hidden nodes are hidden too. Edges are
+selected through an index sorted by weight, so a threshold maps to a
+prefix of it. Moving a control yields add/remove deltas between the
+previous and the new filter state.
+
+A filter state is a dict with keys 'threshold', 'isolates' (show),
+'metric', 'vmin', 'vmax'; missing or None values disable a rule.
+"""
+import numpy as np
+import pandas as pd
+
+
+def build_edge_index(nodes, edges) -> dict:
+    """
+    Index edges by descending weight.
+
+    Returns:
+        dict with arrays 'order' (edge IDs by descending weight),
+        'weights' (ascending, aligned with reversed 'order'),
+        'source' and 'target' (node rows of every edge).
+    """
+    weights = edges['weight'].to_numpy()
+    order = np.argsort(-weights, kind='stable').astype(np.int32)
+    rows = pd.Index(nodes['label'])
+    return {
+        'order': order,
+        'weights': np.sort(weights),
+        'source': rows.get_indexer(edges['first_author']).astype(np.int32),
+        'target': rows.get_indexer(edges['second_author']).astype(np.int32),
+    }
+
+
+def visible_nodes(nodes, state: dict) -> np.ndarray:
+    """Boolean mask of nodes visible under filter 'state'."""
+    visible = np.ones(len(nodes), dtype=bool)
+    threshold = state.get('threshold')
+    if threshold is not None and not state.get('isolates', True):
+        visible &= nodes['max_edge_weight'].to_numpy() >= threshold
+
+    metric = state.get('metric')
+    if metric and metric in nodes:
+        values = nodes[metric].to_numpy(dtype=float)
+        vmin, vmax = state.get('vmin'), state.get('vmax')
+
+        # Like the stylesheet: no rule if the limits clamped to the
+        # metric bounds leave an empty (or NaN) range
+        low, high = nodes[metric].min(), nodes[metric].max()
+        if vmin is not None:
+            low = max(low, vmin)
+        if vmax is not None:
+            high = min(high, vmax)
+        if not low <= high:
+            return visible
+
+        # NaN compares False, as in Cytoscape selectors
+        if vmin is not None:
+            visible &= ~(values < vmin)
+        if vmax is not None:
+            visible &= ~(values > vmax)
+    return visible
+
+
+def visible_edges(edge_index: dict, node_mask: np.ndarray, state: dict) -> np.ndarray:
+    """Sorted IDs of edges visible under filter 'state' ('node_mask' from visible_nodes)."""
+    threshold = state.get('threshold')
+    order = edge_index['order']
+    if threshold is not None:
+        weights = edge_index['weights']
+        order = order[:len(weights) - np.searchsorted(weights, threshold, side='left')]
+    ids = order[node_mask[edge_index['source'][order]] & node_mask[edge_index['target'][order]]]
+    return np.sort(ids)
+
+
+def edge_columns(edges, edge_index: dict, ids: np.ndarray) -> dict:
+    """Columnar edges 'ids' in the format of processing.build_graph_data, with their IDs."""
+    return {
+        'id': ids.tolist(),
+        'source': edge_index['source'][ids].tolist(),
+        'target': edge_index['target'][ids].tolist(),
+        'weight': edges['weight'].to_numpy()[ids].tolist(),
+    }
+
+
+def filter_graph_data(graph_data: dict, nodes, edges, edge_index: dict, state: dict) -> dict:
+    """
+    Return a copy of 'graph_data' holding only the edges visible under
+    'state' (with their IDs), the rows of hidden nodes in 'hidden' and
+    the applied state in 'filter'; 'revision' counts deltas applied
+    client-side.
+    """
+    node_mask = visible_nodes(nodes, state)
+    ids = visible_edges(edge_index, node_mask, state)
+    return {
+        **graph_data,
+        'edges': edge_columns(edges, edge_index, ids),
+        'hidden': np.flatnonzero(~node_mask).tolist(),
+        'filter': state,
+        'serverFilter': True,
+        'revision': 0,
+    }
+
+
+def visibility_delta(nodes, edges, edge_index: dict, old: dict, new: dict) -> dict:
+    """
+    Changes between filter states 'old' and 'new'.
+
+    Returns:
+        dict with 'addEdges' (columnar, see edge_columns), 'removeEdges'
+        (edge IDs), 'showNodes' and 'hideNodes' (node rows).
+    """
+    old_mask = visible_nodes(nodes, old)
+    new_mask = visible_nodes(nodes, new)
+    old_ids = visible_edges(edge_index, old_mask, old)
+    new_ids = visible_edges(edge_index, new_mask, new)
+
+    added = np.setdiff1d(new_ids, old_ids, assume_unique=True)
+    return {
+        'addEdges': edge_columns(edges, edge_index, added),
+        'removeEdges': np.setdiff1d(old_ids, new_ids, assume_unique=True).tolist(),
+        'showNodes': np.flatnonzero(new_mask & ~old_mask).tolist(),
+        'hideNodes': np.flatnonzero(old_mask & ~new_mask).tolist(),
+    }
@@ -6,7 +6,6 @@ from dash import html
 from .sidebar import sidebar
 from .graph_area import graph_area
 from .overlays import overlays
-from src.data_prepare import prepare_network_elements
 
 def base_layout(org_map, default_org):
     """
@@ -15,6 +14,10 @@ def base_layout(org_map, default_org):
       - Build the sidebar.
       - Build the main graph area.
 
+    The layout is an empty shell that does not touch org data, so the
+    server can start immediately; the upload_org callback fills the graph
+    and sidebar for 'default_org' on page load while the preloader is shown.
+
     Args:
         org_map (list[dict]): Dropdown options for organization selection.
         default_org (str): Default organization ID to load on app start.
@@ -22,44 +25,13 @@ def base_layout(org_map, default_org):
     Returns:
         html.Div: Root container holding all UI components.
     """
-    # Prepare data for initial organization
-    data = prepare_network_elements(default_org)
-
-    # Unpack network and UI parameters
-    elements = data['elements']
-    basic_stylesheet = data['stylesheet']
-    size_options = data['size_options']
-    metrics_bounds = data['metrics_bounds']
-    color_options = data['color_options']
-    nodes = data['nodes']
-    edges = data['edges']
-    num_publication = data['num_publication']
-    total_cites = data['num_cites']
-    h_index = data['h_index']
-    years = data['years']
-    counts_publication_by_year = data['counts_publication_by_year']
-
     return html.Div([
         # Overlay components and hidden stores
-        overlays(elements, org_map, default_org),
+        overlays(org_map, default_org),
 
         # Main content: sidebar controls + graph view
         html.Div([
-            sidebar(
-                size_options,
-                color_options,
-                nodes,
-                edges,
-                num_publication,
-                total_cites,
-                h_index,
-                years,
-                counts_publication_by_year
-            ),
-            graph_area(
-                elements,
-                basic_stylesheet,
-                metrics_bounds
-            )
+            sidebar(),
+            graph_area([], [], {})
         ], className='content')
     ], className='container')
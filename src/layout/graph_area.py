@@ -28,6 +28,25 @@ def graph_area(
             data=metrics_bounds
         ),
 
+        # Base stylesheet of the organization; the network-graph stylesheet
+        # is rebuilt from it and the current control values
+        dcc.Store(
+            id='base-stylesheet',
+            data=basic_stylesheet
+        ),
+
+        # Store with the compact columnar graph of the organization
+        # (Cytoscape elements are built from it client-side)
+        dcc.Store(id='graph-data'),
+
+        # Ranked node rows matching the author search (search_callbacks)
+        dcc.Store(id='search-matches'),
+
+        # Server-side filtering of large graphs: requested filter state
+        # and the element deltas answering it
+        dcc.Store(id='filter-request'),
+        dcc.Store(id='graph-delta'),
+
         # Tabs for switching between full graph and custom canvases
         dcc.Tabs(
             id='graph-tabs',
@@ -5,7 +5,6 @@ Defines all overlay dialogs and stores for application-level state.
 from dash import dcc, html
 
 def overlays(
-        elements,
         org_map,
         default_org
     ):
@@ -13,12 +12,13 @@ def overlays(
     Build hidden stores and overlay components:
       - current-org store to track selected organization ID
       - canvas-store & active-canvas for custom canvases
+        (the full graph itself lives in graph-data)
+      - canvas-selection with node rows of the active canvas for statistics
       - confirmation dialog when reloading application
       - organization selector overlay
       - detailed info overlay for node/edge publications
 
     Args:
-        elements (list[dict]): Cytoscape elements (nodes + edges) to render
         org_map (list[dict]): Dropdown options for organization selector
         default_org (str): Default selected organization ID
 
@@ -29,11 +29,12 @@ def overlays(
         # Hidden dcc.Store components
         dcc.Store(id='current-org', data=default_org),
         dcc.Store(id='canvas-store', data={
-            'full': elements,
+            'version': None,
             'canvases': [],
             'nextCanvasIndex': 0,
         }),
         dcc.Store(id='active-canvas', data='full'),
+        dcc.Store(id='canvas-selection', data=None),
         dcc.Store(id='selected-item', data=None),
         
         # Full-screen confirmation dialog for reload
@@ -103,5 +104,6 @@ def overlays(
             ],
             id='preloader',
             className='container__preloader',
+            style={'display': 'flex'},
         ),
     ])
@@ -3,34 +3,86 @@ Module: sidebar
 Defines the sidebar layout of application.
 """
 from dash import dcc, html
+import pandas as pd
 import plotly.express as px
 
-def sidebar(
-        size_options,
-        color_options,
-        nodes,
-        edges,
-        num_publication,
-        total_cites,
-        h_index,
-        years,
-        counts_publication_by_year
-    ):
+def publication_figure(years, counts):
+    """
+    Build the line chart of publications per year shown in the sidebar.
+
+    Args:
+        years (list[int]): Range of publication years
+        counts (list[int]): Publication counts per year
+
+    Returns:
+        plotly Figure
+    """
+    return (
+        px.line(
+            pd.DataFrame({'x': years, 'y': counts}),
+            x='x',
+            y='y',
+        )
+        .update_traces(line=dict(color='#EEECE3'))
+        .update_layout(
+            height=200,
+            title=None,
+            font_family='Arial',
+            paper_bgcolor='#373539',
+            plot_bgcolor='#373539',
+            margin=dict(l=0, r=13, t=0, b=0),
+            xaxis=dict(
+                showgrid=False,
+                zeroline=False,
+                showticklabels=True,
+                title=None,
+                showline=True,
+                linecolor='#EEECE3',
+                linewidth=1,
+                ticks='outside',
+                ticklen=3,
+                tickcolor='#EEECE3',
+                tickfont=dict(
+                    color='#EEECE3',
+                    family='Arial',
+                    size=10,
+                ),
+                tickson='labels',
+                ticklabelposition='outside'
+            ),
+            yaxis=dict(
+                showgrid=False,
+                zeroline=False,
+                showticklabels=True,
+                title=None,
+                showline=True,
+                linecolor='#EEECE3',
+                linewidth=1,
+                ticklen=3,
+                tickcolor='#EEECE3',
+                ticks='outside',
+                tickfont=dict(
+                    color='#EEECE3',
+                    family='Arial',
+                    size=10,
+                ),
+                tickson='labels',
+                ticklabelposition='outside'
+            ),
+            dragmode=False,
+        )
+    )
+
+
+def sidebar():
     """
     Build the sidebar component consisting of:
       - Application logo and title
       - Tabs: Organization info, Visualization, Search, Canvas management
 
-    Args:
-        size_options (list[dict]): Dropdown options for node size metrics
-        color_options (list[dict]): Dropdown options for node color metrics
-        nodes (DataFrame): Node metadata (clusters, positions, etc.)
-        edges (DataFrame): Edge metadata (weights, sources, targets)
-        num_publication (int): Total number of publications
-        total_cites (int): Total citation count
-        h_index (int): H-index for the org
-        years (list[int]): Range of publication years
-        counts_publication_by_year (list[int]): Publication counts per year
+    The sidebar is an empty shell: organization stats, dropdown options
+    and control ranges are filled by the upload_org callback once
+    the selected organization is loaded.
 
     Returns:
         html.Div: Sidebar container
@@ -47,27 +99,27 @@ def sidebar(
                 className='content__name-org header'
             ),
             html.Div(
-                [f'Авторов: {len(nodes)}'],
+                [],
                 id='info-organization-authors',
                 className='content__info-org'
             ),
             html.Div(
-                [f'Публикаций: {num_publication}'],
+                [],
                 id='info-organization-publications',
                 className='content__info-org content__info-org_pub'
             ),
             html.Div(
-                [f'Кластеров: {nodes['cluster'].max()}'],
+                [],
                 id='info-organization-cluster',
                 className='content__info-org content__info-org_cluster'
             ),
             html.Div(
-                [f'Цитирований: {total_cites}'],
+                [],
                 id='info-organization-cites',
                 className='content__info-org content__info-org_cites'
             ),
             html.Div(
-                [f'Индекс Хирша: {h_index}'],
+                [],
                 id='info-organization-hindex',
                 className='content__info-org content__info-hindex'
             ),
@@ -79,60 +131,7 @@ def sidebar(
             ),
             dcc.Graph(
                 id='info-organization-graph',
-                figure=(
-                    px.line(
-                        x=years,
-                        y=counts_publication_by_year,
-                    )
-                    .update_traces(line=dict(color='#EEECE3'))
-                    .update_layout(
-                        height=200,
-                        title=None,
-                        font_family='Arial',
-                        paper_bgcolor='#373539',
-                        plot_bgcolor='#373539',
-                        margin=dict(l=0, r=13, t=0, b=0),
-                        xaxis=dict(
-                            showgrid=False,
-                            zeroline=False,
-                            showticklabels=True,
-                            title=None,
-                            showline=True,
-                            linecolor='#EEECE3',
-                            linewidth=1,
-                            ticks='outside',
-                            ticklen=3,
-                            tickcolor='#EEECE3',
-                            tickfont=dict(
-                                color='#EEECE3',
-                                family='Arial',
-                                size=10,
-                            ),
-                            tickson='labels',
-                            ticklabelposition='outside'
-                        ),
-                        yaxis=dict(
-                            showgrid=False,
-                            zeroline=False,
-                            showticklabels=True,
-                            title=None,
-                            showline=True,
-                            linecolor='#EEECE3',
-                            linewidth=1,
-                            ticklen=3,
-                            tickcolor='#EEECE3',
-                            ticks='outside',
-                            tickfont=dict(
-                                color='#EEECE3',
-                                family='Arial',
-                                size=10,
-                            ),
-                            tickson='labels',
-                            ticklabelposition='outside'
-                        ),
-                        dragmode=False,
-                    )
-                ),
+                figure=publication_figure([], []),
                 config={
                     'displayModeBar': False,
                     'staticPlot': True
@@ -161,21 +160,20 @@ def sidebar(
                 html.Label('Размер вершин:'),
                 dcc.Dropdown(
                     id='size-dropdown',
-                    options=size_options,
-                    value=size_options[0]['value']
+                    options=[],
+                    value=None
                 )
             ], className='content__size dropdown'),
 
             # Edge weight threshold input
             html.Div([
                 html.Label('Минимальный вес ребра:'),
+                # Spinner clicks within 0.25 s are coalesced into one update
                 dcc.Input(
                     id='edge-threshold',
                     type='number',
-                    min=int(edges['weight'].min()),
-                    max=int(edges['weight'].max()),
                     step=1,
-                    value=int(edges['weight'].min()),
+                    debounce=0.25,
                 )
             ], className='content__edge-threshold dropdown'),
 
@@ -212,7 +210,7 @@ def sidebar(
                 html.Div([
                         dcc.Dropdown(
                             id='color-by-dropdown',
-                            options=color_options,
+                            options=[],
                             placeholder='Выберите показатель',
                         ),
                     ],
@@ -227,9 +225,9 @@ def sidebar(
                             data={'vmin': None, 'vmax': None}
                         ),
                         html.Label('Порог минимума:'),
-                        dcc.Input(id='node-color-min', type='number'),
+                        dcc.Input(id='node-color-min', type='number', debounce=0.25),
                         html.Label('Порог максимума:'),
-                        dcc.Input(id='node-color-max', type='number'),
+                        dcc.Input(id='node-color-max', type='number', debounce=0.25),
                     ],
                     id='color-thresholds-container',
                     style={'display': 'none'}
@@ -251,8 +249,6 @@ def sidebar(
                     dcc.Input(
                         id='cluster-filter',
                         type='number',
-                        min=int(nodes['cluster'].min()),
-                        max=int(nodes['cluster'].max()),
                         placeholder='Введите номер',
                         debounce=True
                     )
@@ -275,7 +271,8 @@ def sidebar(
                         id='person-search',
                         type='text',
                         placeholder='Иванов И.И.',
-                        debounce=True
+                        # Search as you type; keystrokes within 0.3 s are coalesced
+                        debounce=0.3
                     )
                 ], className='search__input'),
 
@@ -0,0 +1,85 @@
+"""
+Module: names
+Author name normalization shared by the thesaurus builder and
+the data preparation pipeline.
+
+Callers pass whole columns; work is done once per distinct name.
+Transliteration uses a translation table generated from the
+'transliterate' Russian pack: all of its reversed rules replace a single
+Cyrillic character, so a batch is converted by str.translate instead
+of one translit() call per name. Transliterated names are memoized
+process-wide, so every organization prepared by the same process
+(the server or a pre-build worker) reuses them.
+"""
+import functools
+import threading
+import numpy as np
+import pandas as pd
+from transliterate import translit
+
+# Character ranges handled by the 'ru' language pack
+CYRILLIC_RANGE = range(0x0400, 0x0530)
+
+# Maximum number of memoized transliterations
+TRANSLIT_CACHE_SIZE = 1_000_000
+
+_translit_cache = {}
+_translit_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def translit_table() -> dict:
+    """Translation table equivalent to translit(value, 'ru', reversed=True)."""
+    return {code: translit(chr(code), 'ru', reversed=True) for code in CYRILLIC_RANGE}
+
+
+def unique_values(values: pd.Series):
+    """
+    Deduplicate 'values' (no missing values).
+
+    Returns:
+        (codes, uniques): uniques[codes] restores 'values'.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    return codes, pd.Series(uniques, dtype=object)
+
+
+def transliterate_names(names: pd.Series) -> pd.Series:
+    """
+    Transliterate Cyrillic characters of 'names' to Latin, as
+    translit(name, 'ru', reversed=True) does for each name.
+    Results are memoized per distinct name for the lifetime of the process.
+    """
+    codes, uniques = unique_values(names)
+    values = [_translit_cache.get(name) for name in uniques.tolist()]
+    missing = [k for k, value in enumerate(values) if value is None]
+
+    if missing:
+        converted = uniques.iloc[missing].str.translate(translit_table()).tolist()
+        for k, value in zip(missing, converted):
+            values[k] = value
+        with _translit_lock:
+            if len(_translit_cache) + len(missing) > TRANSLIT_CACHE_SIZE:
+                _translit_cache.clear()
+            _translit_cache.update(zip(uniques.iloc[missing].tolist(), converted))
+
+    return pd.Series(np.asarray(values, dtype=object)[codes], index=names.index, dtype=object)
+
+
+def clean_author_names(names: pd.Series) -> pd.Series:
+    """Remove 'et al.' and surrounding whitespace from author names."""
+    return (
+        names
+        .str.replace('et al.', '', regex=False)
+        .str.strip()
+    )
+
+
+def name_search_keys(names: pd.Series) -> pd.Series:
+    """
+    Search keys of author names: lowercase letters only, Cyrillic
+    transliterated to Latin as for thesaurus matching, so that
+    'Иванов И.И.' and 'ivanov i. i.' share the key 'ivanovii'.
+    """
+    letters = names.astype(str).str.lower().str.replace(r'[^а-яa-zё]', '', regex=True)
+    return transliterate_names(letters).str.replace(r'[^a-z]', '', regex=True)
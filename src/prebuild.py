@@ -0,0 +1,131 @@
+"""
+Module: prebuild
+Command-line entry point that builds or refreshes caches of all
+organizations listed in org_data/org.txt.
+
+Usage (from the project root):
+    python -m src.prebuild [--workers N] [--shard K/N] [--force] [ORG_ID ...]
+
+Orgs whose caches match their source fingerprints are skipped.
+Builds run in a process pool. With --shard K/N each machine builds
+only its share of the org list (stable hash of the org ID), so several
+machines can share org_data/processed; a per-org lock file keeps two
+builders from working on the same org at once.
+"""
+import os
+import sys
+import time
+import zlib
+import socket
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.orgs import load_orgs
+from src.data_prepare import prepare_network_elements, get_fresh_cache
+from src.data_prepare.constants import BASE_PATH
+
+LOCK_FILE = '.build.lock'
+LOCK_TIMEOUT = 3 * 60 * 60
+
+
+def in_shard(org_id: str, shard: int, num_shards: int) -> bool:
+    """Return True if 'org_id' belongs to shard 'shard' of 'num_shards'."""
+    return zlib.crc32(org_id.encode('utf-8')) % num_shards == shard
+
+
+def acquire_lock(org_id: str, timeout: int = LOCK_TIMEOUT):
+    """
+    Create the build lock of 'org_id'. Returns the lock path, or None
+    if another builder holds a lock younger than 'timeout' seconds.
+    """
+    path = os.path.join(BASE_PATH, org_id, LOCK_FILE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) < timeout:
+                    return None
+                os.remove(path)  # stale lock of a crashed builder
+            except OSError:
+                return None
+            continue
+        with os.fdopen(fd, 'w') as f:
+            f.write(f'{socket.gethostname()} {os.getpid()}\n')
+        return path
+    return None
+
+
+def build_org(org_id: str, force: bool = False) -> tuple:
+    """
+    Build caches of one org (runs in a worker process).
+
+    Returns:
+        (org_id, status, seconds, error) with status one of
+        'fresh', 'built', 'locked', 'failed'.
+    """
+    start = time.perf_counter()
+    if not force and get_fresh_cache(org_id):
+        return org_id, 'fresh', 0.0, ''
+
+    lock = acquire_lock(org_id)
+    if lock is None:
+        return org_id, 'locked', 0.0, ''
+    try:
+        # Another machine may have finished while we waited for the lock
+        if not force and get_fresh_cache(org_id):
+            return org_id, 'fresh', time.perf_counter() - start, ''
+        prepare_network_elements(org_id, force=force)
+        if not get_fresh_cache(org_id):
+            raise RuntimeError('cache was not written')
+        return org_id, 'built', time.perf_counter() - start, ''
+    except Exception as e:
+        return org_id, 'failed', time.perf_counter() - start, f'{type(e).__name__}: {e}'
+    finally:
+        try:
+            os.remove(lock)
+        except OSError:
+            pass
+
+
+def parse_shard(value: str) -> tuple:
+    """Parse 'K/N' into (K, N)."""
+    try:
+        shard, num_shards = (int(v) for v in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError('shard must look like K/N, e.g. 0/4')
+    if num_shards < 1 or not 0 <= shard < num_shards:
+        raise argparse.ArgumentTypeError('shard must satisfy 0 <= K < N')
+    return shard, num_shards
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description='Build caches of all organizations.')
+    parser.add_argument('orgs', nargs='*', help='org IDs to build (default: all from org.txt)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    parser.add_argument('--shard', type=parse_shard, default=(0, 1), help='build only shard K of N (K/N)')
+    parser.add_argument('--force', action='store_true', help='rebuild even if caches are fresh')
+    args = parser.parse_args(argv)
+
+    org_ids = args.orgs or sorted(load_orgs()[1])
+    shard, num_shards = args.shard
+    org_ids = [org_id for org_id in org_ids if in_shard(org_id, shard, num_shards)]
+    print(f'Shard {shard}/{num_shards}: {len(org_ids)} organizations, {args.workers} workers')
+
+    start = time.perf_counter()
+    counts = {'fresh': 0, 'built': 0, 'locked': 0, 'failed': 0}
+    with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+        futures = [pool.submit(build_org, org_id, args.force) for org_id in org_ids]
+        for future in as_completed(futures):
+            org_id, status, seconds, error = future.result()
+            counts[status] += 1
+            line = f'{org_id:>12}  {status:<7} {seconds:8.2f}s'
+            print(f'{line}  {error}' if error else line, flush=True)
+
+    summary = ', '.join(f'{k}: {v}' for k, v in counts.items())
+    print(f'Done in {time.perf_counter() - start:.2f}s ({summary})')
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,77 +1,219 @@
 """
 Module: thesaurus_builder
 Builds a thesaurus of author name variants for a given organization.
+
+Next to the thesaurus, an index (thesaurus_index.npz, no pickle) keeps
+every author name already processed and, for similarity-based thesauri,
+the canonical names with the TF-IDF vocabulary of their surnames.
+With it, update_author_thesaurus compares only newly seen names with
+the canonical set and appends their variants; existing mappings never change.
 """
 
 import os
+import numpy as np
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from transliterate import translit
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+from src.names import transliterate_names
 
-def build_author_thesaurus(org_id: str, similarity_coefficient: float = 0.8, surname_diff: int = 3) -> None:
+NAMES_COL = 'Authors'
+IDS_COL = 'Author(s) ID'
+THESAURUS_FILE = 'thesaurus_authors.txt'
+INDEX_FILE = 'thesaurus_index.npz'
+
+
+def explode_semicolon(series: pd.Series) -> pd.DataFrame:
     """
-    Generate and save a mapping of similar author names to a canonical form.
+    Split semicolon-delimited cells into stripped, non-empty parts.
 
-    Args:
-        org_id: ID of the organization.
-        similarity_coefficient: Minimum cosine similarity for two surnames to be considered similar.
-        surname_diff: Max length difference between surnames to consider.
+    Returns:
+        DataFrame with columns 'row' (position in 'series'), 'pos'
+        (position of the part among the row's non-empty parts) and 'value'.
+    """
+    cells = series.reset_index(drop=True)
+    cells = cells[cells.notna()].astype(str)
+    parts = cells.str.split(';').explode().str.strip()
+    parts = parts[parts != '']
+    exploded = pd.DataFrame({'row': parts.index.to_numpy(), 'value': parts.to_numpy(dtype=object)})
+    exploded['pos'] = exploded.groupby('row').cumcount()
+    return exploded
 
-    Reads publications from:
-        org_data/processed/{org_id}/publications.csv
-    Writes the thesaurus to:
-        org_data/processed/{org_id}/thesaurus_authors.txt
+
+def feature_rank(matrix) -> np.ndarray:
+    """Rank of every column of 'matrix': rarest (fewest nonzero rows) first."""
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    rank = np.empty(matrix.shape[1], dtype=np.int64)
+    rank[np.argsort(df, kind='stable')] = np.arange(matrix.shape[1])
+    return rank
+
+
+def prefix_matrix(matrix, threshold: float, rank: np.ndarray):
     """
-    base_path = os.path.join('org_data', 'processed', org_id)
-    input_file = os.path.join(base_path, 'publications.csv')
-    output_file = os.path.join(base_path, 'thesaurus_authors.txt')
+    Blocking keys of the rows of 'matrix' (CSR, rows of unit norm):
+    the row's features in 'rank' order, up to the point where the
+    remaining ones have a norm below 'threshold'.
 
-    # Load author names
-    df = pd.read_csv(input_file)
+    Two rows with cosine similarity >= 'threshold' share a key: if
+    they did not, their dot product would come only from the rest of
+    one of them, of norm < threshold (AllPairs prefix filtering).
 
-    names_col = "Authors"
-    ids_col = "Author(s) ID"
+    Returns:
+        binary CSR matrix of the same shape holding the keys.
+    """
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    entry_rank = rank[matrix.indices]
 
-    # If ID column present -> use ID-based grouping (strict pairing by position)
-    if ids_col in df.columns:
-        # Assembling a thesaurus
-        thesaurus = {}
-        id_to_canonical = {}
-
-        def split_semicolon(cell: str):
-            if pd.isna(cell):
-                return []
-            return [p.strip() for p in str(cell).split(';') if p.strip()]
-
-        for _, row in df.iterrows():
-            raw_names = row.get(names_col, '')
-            raw_ids = row.get(ids_col, '')
-
-            names = split_semicolon(raw_names)
-            ids = split_semicolon(raw_ids)
-
-            for aid, aname in zip(ids, names):
-                aid = str(aid).strip()
-                aname = aname.strip()
-
-                if aid not in id_to_canonical:
-                    id_to_canonical[aid] = aname
-                else:
-                    canonical = id_to_canonical[aid]
-                    if aname != canonical:
-                        thesaurus[aname] = canonical
+    # Within each row, most frequent features first: the running sum of
+    # squares is the squared norm of the rest starting at each feature
+    order = np.lexsort((-entry_rank, rows))
+    squares = matrix.data[order] ** 2
+    running = np.cumsum(squares)
+    row_starts = matrix.indptr[:-1][rows[order]]
+    rest = running - np.concatenate([[0.0], running])[row_starts]
+    keep = order[rest >= threshold ** 2 - 1e-9]
 
-        # Write out thesaurus file
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write("Label\tReplace by\n")
-            for label, replace_by in thesaurus.items():
-                f.write(f"{label}\t{replace_by}\n")
-        return
+    keys = csr_matrix(
+        (np.ones(len(keep)), (rows[keep], matrix.indices[keep])),
+        shape=matrix.shape
+    )
+    keys.sort_indices()
+    return keys
+
+
+def pair_similarity(first, second, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Cosine similarities of rows first[u] and second[v] (CSR, rows of unit norm)."""
+    return np.asarray(first[u].multiply(second[v]).sum(axis=1)).ravel()
+
+
+def find_similar_pairs(matrix, lengths: np.ndarray, similarity_coefficient: float,
+                       max_length_diff: int, chunk_size: int = 1000):
+    """
+    Find pairs of rows of 'matrix' (sparse TF-IDF) with cosine similarity
+    of at least 'similarity_coefficient' whose 'lengths' differ by at most
+    'max_length_diff'.
+
+    Rows are blocked twice: sorted by length, a chunk of rows is only
+    compared with the rows of the length window it can match, and within
+    the window only with rows sharing a blocking key (see prefix_matrix).
+    Similarities of these candidates are computed exactly, so the pairs
+    equal those of cosine_similarity(matrix); memory per chunk is bounded
+    by its candidates, no N x N matrix is built.
+
+    Returns:
+        (first, second, similarity) arrays with first <= second
+        (a row is paired with itself unless it has no features).
+    """
+    matrix = normalize(matrix).tocsr()
+    lengths = np.asarray(lengths)
+    order = np.argsort(lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    matrix = matrix[order]
+    keys = prefix_matrix(matrix, similarity_coefficient, feature_rank(matrix))
+
+    res_u, res_v, res_sim = [], [], []
+    for start in range(0, len(order), chunk_size):
+        stop = min(start + chunk_size, len(order))
+        window_stop = np.searchsorted(sorted_lengths, sorted_lengths[stop - 1] + max_length_diff, side='right')
+        candidates = (keys[start:stop] @ keys[start:window_stop].T).tocoo()
 
+        u = candidates.row + start
+        v = candidates.col + start
+        keep = (v >= u) & (sorted_lengths[v] - sorted_lengths[u] <= max_length_diff)
+        u, v = u[keep], v[keep]
+        similarity = pair_similarity(matrix, matrix, u, v)
+        keep = similarity >= similarity_coefficient
+        res_u.append(order[u[keep]])
+        res_v.append(order[v[keep]])
+        res_sim.append(similarity[keep])
+
+    if not res_u:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([])
+    u = np.concatenate(res_u)
+    v = np.concatenate(res_v)
+    return np.minimum(u, v), np.maximum(u, v), np.concatenate(res_sim)
+
+
+def find_similar_pairs_to(queries, query_lengths: np.ndarray, matrix, lengths: np.ndarray,
+                          similarity_coefficient: float, max_length_diff: int, chunk_size: int = 1000):
+    """
+    Like find_similar_pairs, but pairs rows of 'queries' with rows of
+    'matrix' (both sparse TF-IDF over the same vocabulary).
+
+    Returns:
+        (query_rows, matrix_rows, similarity) arrays.
+    """
+    queries = normalize(queries).tocsr()
+    matrix = normalize(matrix).tocsr()
+    lengths = np.asarray(lengths)
+    order = np.argsort(lengths, kind='stable')
+    sorted_lengths = lengths[order]
+    matrix = matrix[order]
+    query_lengths = np.asarray(query_lengths)
+    query_order = np.argsort(query_lengths, kind='stable')
+    sorted_query_lengths = query_lengths[query_order]
+    queries = queries[query_order]
+
+    # Keys of both sides follow the same feature order
+    rank = feature_rank(matrix)
+    query_keys = prefix_matrix(queries, similarity_coefficient, rank)
+    keys = prefix_matrix(matrix, similarity_coefficient, rank)
+
+    res_u, res_v, res_sim = [], [], []
+    for start in range(0, len(query_order), chunk_size):
+        stop = min(start + chunk_size, len(query_order))
+        window_start = np.searchsorted(sorted_lengths, sorted_query_lengths[start] - max_length_diff, side='left')
+        window_stop = np.searchsorted(sorted_lengths, sorted_query_lengths[stop - 1] + max_length_diff, side='right')
+        candidates = (query_keys[start:stop] @ keys[window_start:window_stop].T).tocoo()
+
+        u = candidates.row + start
+        v = candidates.col + window_start
+        keep = np.abs(sorted_query_lengths[u] - sorted_lengths[v]) <= max_length_diff
+        u, v = u[keep], v[keep]
+        similarity = pair_similarity(queries, matrix, u, v)
+        keep = similarity >= similarity_coefficient
+        res_u.append(query_order[u[keep]])
+        res_v.append(order[v[keep]])
+        res_sim.append(similarity[keep])
+
+    if not res_u:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([])
+    return np.concatenate(res_u), np.concatenate(res_v), np.concatenate(res_sim)
+
+
+def expand_surname_pairs(codes: np.ndarray, first: np.ndarray, second: np.ndarray):
+    """
+    Expand pairs of similar surnames (positions in the surname vocabulary,
+    as returned by find_similar_pairs) into pairs of authors.
+    'codes' is the surname position of every author.
+
+    Returns:
+        (i, j) author positions with i < j, sorted by (i, j).
+    """
+    num_surnames = codes.max() + 1 if len(codes) else 0
+    members = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes, minlength=num_surnames)
+    offsets = np.zeros(num_surnames + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    su, sv = first, second
+    sizes = counts[su] * counts[sv]
+    pair = np.repeat(np.arange(len(su)), sizes)
+    k = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    i = members[offsets[su[pair]] + k // counts[sv[pair]]]
+    j = members[offsets[sv[pair]] + k % counts[sv[pair]]]
+
+    i, j = np.minimum(i, j), np.maximum(i, j)
+    keep = i < j
+    i, j = i[keep], j[keep]
+    order = np.lexsort((j, i))
+    return i[order], j[order]
+
+
+def extract_author_names(df: pd.DataFrame) -> pd.Series:
+    """Return distinct author names of the 'Authors' column (without 'et al.')."""
     authors_series = (
-        df['Authors']
+        df[NAMES_COL]
         .dropna()
         .str.split('; ')
         .explode()
@@ -81,81 +223,315 @@ def build_author_thesaurus(org_id: str, similarity_coefficient: float = 0.8, sur
 
     # Filter out "et al" entries
     mask = ~authors_series.str.lower().str.endswith(('et al.', 'et al'))
-    authors_series = authors_series[mask].reset_index(drop=True)
+    return authors_series[mask].reset_index(drop=True)
+
+
+def join_initials(name: str) -> str:
+    """
+    Normalize initials: drop trailing dots and glue initials to one token
+    ('ivanov a. b.' -> 'ivanov a.b').
+    """
+    if len(name) > 0:
+        name = name.rstrip('.')
+        arr = name.split()
+        name = arr[0] + ' ' + ''.join(arr[1:]) if arr else ''
+    return name
 
+
+def prepare_author_names(authors_series: pd.Series) -> pd.DataFrame:
+    """
+    Split author names into transliterated surnames and initials.
+
+    Returns:
+        DataFrame with columns 'Authors', 'Surnames', 'Initials'.
+    """
     # Prepare a DataFrame for processing
-    authors_df = pd.DataFrame({'Authors': authors_series})
+    authors_df = pd.DataFrame({'Authors': authors_series.reset_index(drop=True)})
 
     # Normalize: remove all non-letters/dots, lowercase
     authors_df['Ready'] = (
-        authors_series
+        authors_df['Authors']
         .str.lower()
         .str.replace(r'[^а-яa-zё .]', '', regex=True)
     )
 
-    def transliterate_name(name: str) -> str:
-        """
-        Transliterate Cyrillic to Latin and normalize initials.
-        """
-        if len(name) > 0:
-            name = name.rstrip('.')
-            arr = name.split()
-            name = arr[0] + ' ' + ''.join(arr[1:])
-        return translit(name, 'ru', reversed=True)
-
-    # Apply transliteration
-    authors_df['Ready'] = authors_df['Ready'].apply(transliterate_name)
+    # Transliterate Cyrillic to Latin (batched, memoized per name)
+    authors_df['Ready'] = transliterate_names(authors_df['Ready'].apply(join_initials))
 
     # Split into surname and initials
     authors_df['Surnames'] = authors_df['Ready'].str.split().str[0].fillna('')
     authors_df['Initials'] = authors_df['Ready'].str.split().str[1].fillna('')
+    return authors_df[['Authors', 'Surnames', 'Initials']]
 
-    # Algorithm for searching for similar surnames
-    vectorizer = TfidfVectorizer(analyzer='char', ngram_range=(1, 2))
-    matrix = vectorizer.fit_transform(authors_df['Surnames'])
-    similarity = cosine_similarity(matrix)
 
-    # Assembling a thesaurus
+def assign_variants(authors_df: pd.DataFrame, candidates_i: np.ndarray, candidates_j: np.ndarray,
+                    surname_diff: int) -> dict:
+    """
+    Apply the initials, surname-length and feminine-ending rules to
+    candidate pairs (i < j, sorted by (i, j)) and map each matching
+    author j to author i.
+
+    Returns:
+        dict variant name -> canonical name.
+    """
+    # Rules, applied to all candidate pairs at once
+    initials = authors_df['Initials'].to_numpy(dtype=str)
+    surnames = authors_df['Surnames']
+    initials1 = initials[candidates_i]
+    initials2 = initials[candidates_j]
+
+    # Initials: equal, or one is a leading part of the other ('a' ~ 'a.b')
+    initials_match = (
+        (initials1 == initials2)
+        | np.char.startswith(initials2, np.char.add(initials1, '.'))
+        | np.char.startswith(initials1, np.char.add(initials2, '.'))
+    )
+
+    # Surname length difference
+    lengths = surnames.str.len().to_numpy()
+    length_match = np.abs(lengths[candidates_i] - lengths[candidates_j]) <= surname_diff
+
+    # Exclude male/female surname mismatch (ending in 'a')
+    feminine = (surnames.str[-1:] == 'a').to_numpy()
+    gender_match = feminine[candidates_i] == feminine[candidates_j]
+
+    keep = initials_match & length_match & gender_match
+    candidates_i = candidates_i[keep]
+    candidates_j = candidates_j[keep]
+
+    # Assembling a thesaurus: walk pairs in the order i, then j; an author
+    # mapped to a canonical form is neither canonical nor remapped later
     thesaurus = {}
-    total = len(similarity)
+    authors = authors_df['Authors'].tolist()
+    mapped = np.zeros(len(authors), dtype=bool)
 
-    for i in range(total):
-        if authors_df['Authors'][i] in thesaurus:
+    for i, j in zip(candidates_i.tolist(), candidates_j.tolist()):
+        if mapped[i] or mapped[j]:
             continue
+        mapped[j] = True
 
-        for j in range(i+1, total):
-            if authors_df['Authors'][j] in thesaurus:
-                continue
-
-            if similarity[i][j] < similarity_coefficient:
-                continue
-
-            # Checking initials
-            initials1 = authors_df['Initials'][i].split('.')
-            initials2 = authors_df['Initials'][j].split('.')
-            
-            if len(initials1) != len(initials2):
-                shorter, longer = sorted([initials1, initials2], key=len)
-                if shorter != longer[:len(shorter)]:
-                    continue
-            elif initials1 != initials2:
-                continue
-
-            # Check surname length difference
-            surname1, surname2 = authors_df['Surnames'][i], authors_df['Surnames'][j]
-            if abs(len(surname1) - len(surname2)) > surname_diff:
-                continue
-                
-            # Exclude male/female surname mismatch (ending in 'a')
-            if (surname1[-1] == 'a') ^ (surname2[-1] == 'a'):
-                continue
-
-            # Map the variant to the canonical form
-            thesaurus[authors_df['Authors'][j]] = authors_df['Authors'][i]
+        # Map the variant to the canonical form
+        thesaurus[authors[j]] = authors[i]
 
-    # Write out thesaurus file
+    return thesaurus
+
+
+def build_id_thesaurus(df: pd.DataFrame, id_canonical: dict = None):
+    """
+    Build the thesaurus from the 'Author(s) ID' column.
+    IDs in 'id_canonical' keep their known canonical name.
+
+    Returns:
+        (thesaurus, names, id_canonical): dict variant name -> canonical
+        name, the distinct names paired with an ID and dict ID -> canonical
+        name (including the known IDs).
+    """
+    # Pair the k-th name of a row with its k-th ID (extra parts are ignored)
+    names = explode_semicolon(df.get(NAMES_COL, pd.Series(index=df.index, dtype=object)))
+    ids = explode_semicolon(df[IDS_COL])
+    pairs = (
+        names.rename(columns={'value': 'name'})
+        .merge(ids.rename(columns={'value': 'id'}), on=['row', 'pos'])
+        .sort_values(['row', 'pos'], kind='stable')
+    )
+
+    # Canonical name of an ID is its first occurrence
+    pairs['canonical'] = pairs.groupby('id', sort=False)['name'].transform('first')
+    if id_canonical:
+        pairs['canonical'] = pairs['id'].map(id_canonical).fillna(pairs['canonical'])
+    variants = pairs[pairs['name'] != pairs['canonical']]
+
+    # Names in order of first appearance, each replaced by
+    # the canonical name of its last occurrence
+    thesaurus = variants.groupby('name', sort=False)['canonical'].last().to_dict()
+    id_canonical = {**pairs.groupby('id', sort=False)['canonical'].first().to_dict(), **(id_canonical or {})}
+    return thesaurus, pairs['name'].drop_duplicates().tolist(), id_canonical
+
+
+def write_thesaurus(output_file: str, thesaurus: dict, append: bool = False):
+    """Write (or append) thesaurus entries as 'Label\tReplace by' lines."""
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("Label\tReplace by\n")
+    with open(output_file, 'a' if append else 'w', encoding='utf-8') as f:
+        if not append:
+            f.write("Label\tReplace by\n")
         for label, replace_by in thesaurus.items():
             f.write(f"{label}\t{replace_by}\n")
+
+
+def save_index(index_file: str, **arrays):
+    """Atomically save the thesaurus index (string arrays are stored as unicode)."""
+    tmp_path = f'{index_file}.tmp-{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **{key: np.asarray(value) if not isinstance(value, list) else np.array(value, dtype=str)
+                       for key, value in arrays.items()})
+    os.replace(tmp_path, index_file)
+
+
+def load_index(index_file: str):
+    """Load the thesaurus index as a dict of arrays, or None if missing or unreadable."""
+    try:
+        with np.load(index_file, allow_pickle=False) as data:
+            return {key: data[key] for key in data.files}
+    except (OSError, ValueError):
+        return None
+
+
+def surname_vectorizer(terms: np.ndarray, idf: np.ndarray) -> TfidfVectorizer:
+    """Rebuild the fitted surname TF-IDF vectorizer from a saved vocabulary."""
+    vectorizer = TfidfVectorizer(
+        analyzer='char', ngram_range=(1, 2),
+        vocabulary={term: k for k, term in enumerate(terms.tolist())}
+    )
+    vectorizer.idf_ = idf
+    return vectorizer
+
+
+def build_author_thesaurus(org_id: str, similarity_coefficient: float = 0.8, surname_diff: int = 3) -> None:
+    """
+    Generate and save a mapping of similar author names to a canonical form.
+
+    Args:
+        org_id: ID of the organization.
+        similarity_coefficient: Minimum cosine similarity for two surnames to be considered similar.
+        surname_diff: Max length difference between surnames to consider.
+
+    Reads publications from:
+        org_data/processed/{org_id}/publications.csv
+    Writes the thesaurus to:
+        org_data/processed/{org_id}/thesaurus_authors.txt
+    """
+    base_path = os.path.join('org_data', 'processed', org_id)
+    input_file = os.path.join(base_path, 'publications.csv')
+    output_file = os.path.join(base_path, THESAURUS_FILE)
+    index_file = os.path.join(base_path, INDEX_FILE)
+
+    # Load author names
+    df = pd.read_csv(input_file)
+
+    # If ID column present -> use ID-based grouping (strict pairing by position)
+    if IDS_COL in df.columns:
+        thesaurus, names, id_canonical = build_id_thesaurus(df)
+
+        # Write out thesaurus file
+        write_thesaurus(output_file, thesaurus)
+        save_index(
+            index_file, mode='ids', names=names,
+            ids=list(id_canonical), id_names=list(id_canonical.values())
+        )
+        return
+
+    authors_df = prepare_author_names(extract_author_names(df))
+
+    # Algorithm for searching for similar surnames: compare each distinct
+    # surname only with surnames of compatible length (sparse, blocked)
+    codes, unique_surnames = pd.factorize(authors_df['Surnames'])
+    vectorizer = TfidfVectorizer(analyzer='char', ngram_range=(1, 2))
+    vectorizer.fit(authors_df['Surnames'])
+    matrix = vectorizer.transform(unique_surnames)
+    first, second, _ = find_similar_pairs(
+        matrix, unique_surnames.str.len().to_numpy(), similarity_coefficient, surname_diff
+    )
+    candidates_i, candidates_j = expand_surname_pairs(codes, first, second)
+    thesaurus = assign_variants(authors_df, candidates_i, candidates_j, surname_diff)
+
+    # Write out thesaurus file
+    write_thesaurus(output_file, thesaurus)
+
+    # Index: all processed names and the canonical ones for later updates
+    canonical = ~authors_df['Authors'].isin(list(thesaurus)).to_numpy()
+    save_index(
+        index_file,
+        mode='similarity',
+        names=authors_df['Authors'].tolist(),
+        canonical=authors_df['Authors'][canonical].tolist(),
+        terms=vectorizer.get_feature_names_out().tolist(),
+        idf=vectorizer.idf_,
+        similarity_coefficient=similarity_coefficient,
+        surname_diff=surname_diff,
+    )
+
+
+def update_author_thesaurus(org_id: str, df: pd.DataFrame) -> bool:
+    """
+    Add variants of author names in 'df' (e.g. newly appended publication
+    rows) that are not in the thesaurus index yet. New names are compared
+    only with canonical names and with each other; existing mappings
+    are kept as is, so earlier publications normalize the same way.
+    Labels already in the thesaurus file are not appended again, so an
+    update interrupted before saving the index can simply be repeated.
+
+    Returns:
+        False if there is no thesaurus index to update, else True.
+    """
+    base_path = os.path.join('org_data', 'processed', org_id)
+    output_file = os.path.join(base_path, THESAURUS_FILE)
+    index_file = os.path.join(base_path, INDEX_FILE)
+
+    index = load_index(index_file)
+    if index is None or not os.path.exists(output_file):
+        return False
+    known = pd.Index(index['names'].tolist())
+    existing = set(pd.read_csv(output_file, sep='\t')['Label'])
+
+    if str(index['mode']) == 'ids':
+        if IDS_COL not in df.columns:
+            return False
+        id_canonical = dict(zip(index['ids'].tolist(), index['id_names'].tolist()))
+        thesaurus, names, id_canonical = build_id_thesaurus(df, id_canonical)
+        new_names = [name for name in names if name not in known]
+        thesaurus = {
+            label: replace_by for label, replace_by in thesaurus.items()
+            if label not in known and label not in existing
+        }
+        write_thesaurus(output_file, thesaurus, append=True)
+        save_index(
+            index_file, mode='ids', names=known.tolist() + new_names,
+            ids=list(id_canonical), id_names=list(id_canonical.values())
+        )
+        return True
+
+    surname_diff = int(index['surname_diff'])
+    names = extract_author_names(df)
+    new_names = names[~names.isin(known)].tolist()
+    if not new_names:
+        return True
+
+    # Canonical authors first, then new ones: a new name prefers an
+    # existing canonical form over another new name
+    canonical = index['canonical'].tolist()
+    authors_df = prepare_author_names(pd.Series(canonical + new_names, dtype=object))
+    num_canonical = len(canonical)
+
+    codes, unique_surnames = pd.factorize(authors_df['Surnames'])
+    vectorizer = surname_vectorizer(index['terms'], index['idf'])
+    matrix = vectorizer.transform(unique_surnames)
+    lengths = unique_surnames.str.len().to_numpy()
+
+    # Compare surnames of new authors with all surnames
+    queries = np.unique(codes[num_canonical:])
+    rows, cols, _ = find_similar_pairs_to(
+        matrix[queries], lengths[queries], matrix, lengths,
+        float(index['similarity_coefficient']), surname_diff
+    )
+    rows = queries[rows]
+    pairs = np.unique(np.stack([np.minimum(rows, cols), np.maximum(rows, cols)]), axis=1)
+    candidates_i, candidates_j = expand_surname_pairs(codes, pairs[0], pairs[1])
+
+    # Only new authors may become variants
+    new_variant = candidates_j >= num_canonical
+    thesaurus = assign_variants(authors_df, candidates_i[new_variant], candidates_j[new_variant], surname_diff)
+    write_thesaurus(output_file, {
+        label: replace_by for label, replace_by in thesaurus.items() if label not in existing
+    }, append=True)
+
+    save_index(
+        index_file,
+        mode='similarity',
+        names=known.tolist() + new_names,
+        canonical=canonical + [name for name in new_names if name not in thesaurus],
+        terms=index['terms'],
+        idf=index['idf'],
+        similarity_coefficient=index['similarity_coefficient'],
+        surname_diff=index['surname_diff'],
+    )
+    return True
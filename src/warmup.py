@@ -0,0 +1,55 @@
+"""
+Module: warmup
+Prepares organizations in a background thread after startup and
+reports readiness, so the server can listen before caches are hot.
+"""
+import time
+import logging
+import threading
+from src.data_prepare import get_network_elements
+
+logger = logging.getLogger(__name__)
+
+_state = {
+    'status': 'cold',  # cold -> warming -> warm | failed
+    'orgs': [],
+    'seconds': None,
+    'error': None,
+}
+_lock = threading.Lock()
+
+
+def _warm(org_ids: list):
+    """Load 'org_ids' into the process-wide org cache (worker thread)."""
+    start = time.perf_counter()
+    try:
+        for org_id in org_ids:
+            get_network_elements(org_id)
+    except Exception as e:
+        logger.exception('Warmup failed')
+        with _lock:
+            _state.update(status='failed', error=f'{type(e).__name__}: {e}')
+        return
+    with _lock:
+        _state.update(status='warm', seconds=round(time.perf_counter() - start, 3))
+
+
+def start_warmup(org_ids: list) -> threading.Thread:
+    """
+    Start preparing 'org_ids' in a daemon thread.
+    Requests for these orgs made meanwhile wait for the same load
+    instead of building it a second time.
+    """
+    with _lock:
+        _state.update(status='warming', orgs=list(org_ids), seconds=None, error=None)
+    thread = threading.Thread(target=_warm, args=(list(org_ids),), name='org-warmup', daemon=True)
+    thread.start()
+    return thread
+
+
+def readiness() -> dict:
+    """Return a copy of the warmup state; 'ready' is True once caches are hot."""
+    with _lock:
+        state = dict(_state)
+    state['ready'] = state['status'] == 'warm'
+    return state
@@ -0,0 +1,59 @@
+"""
+Shared fixtures: tests run from a temporary working directory, where
+org data is read from and written to 'org_data/'.
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Sample org: 'orphan x.' has no publications, 'кузнецов к.к.' none
+# until rows are appended (see test_incremental)
+SAMPLE_NODES = pd.DataFrame({
+    'id': [1, 2, 3, 4, 5],
+    'label': ['иванов и.и.', 'петров п.п.', 'smith j.', 'кузнецов к.к.', 'orphan x.'],
+    'x': [0.0, 1.0, 0.5, -1.0, 2.0],
+    'y': [0.0, 0.5, 1.0, -0.5, 2.0],
+    'cluster': [1, 1, 2, 2, 3],
+    'weight<Links>': [2, 2, 1, 1, 0],
+    'weight<Total link strength>': [3, 3, 1, 1, 0],
+    'weight<Documents>': [3, 3, 2, 2, 0],
+    'weight<Citations>': [10, 5, 3, 1, 0],
+    'weight<Norm. citations>': [1.0, 0.5, 0.3, 0.1, 0.0],
+    'score<Avg. pub. year>': [2019.0, 2020.0, 2018.0, 2021.0, 2020.0],
+    'score<Avg. citations>': [3.3, 1.7, 1.5, 0.5, 0.0],
+    'score<Avg. norm. citations>': [0.3, 0.2, 0.1, 0.1, 0.0],
+})
+SAMPLE_EDGES = [(1, 2, 2), (1, 3, 1), (2, 4, 1)]
+SAMPLE_PUBLICATIONS = pd.DataFrame({
+    'Authors': ['Иванов И.И.; Петров П.П.', 'Иванов И.; Smith J.', 'Петров П.П.; Иванов И.И.'],
+    'Title': ['A', 'B', 'C'],
+    'Year': [2018, 2019, 2020],
+    'Source title': ['S', 'S', 'T'],
+    'Cited by': [4, 3, 1],
+    'Link': ['a', 'b', 'c'],
+})
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Temporary working directory with an empty 'org_data/processed'."""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join('org_data', 'processed'))
+    return tmp_path
+
+
+@pytest.fixture
+def sample_org(workdir) -> str:
+    """Write the source files of the sample org and return its ID."""
+    org_id = '1'
+    path = os.path.join('org_data', 'processed', org_id)
+    os.makedirs(path)
+    SAMPLE_NODES.to_csv(os.path.join(path, 'map.txt'), sep='\t', index=False)
+    with open(os.path.join(path, 'network.txt'), 'w', encoding='utf-8') as f:
+        f.writelines(f'{a}\t{b}\t{w}\n' for a, b, w in SAMPLE_EDGES)
+    SAMPLE_PUBLICATIONS.to_csv(os.path.join(path, 'publications.csv'), index=False)
+    return org_id
@@ -0,0 +1,59 @@
+"""
+Tests of base: a cached org loads without reading table columns,
+entries derived from them are built on first access, and caches built
+from sources edited meanwhile are not taken as fresh.
+"""
+import os
+
+import numpy as np
+
+from src.data_prepare.base import build_network_bundle, get_fresh_cache, prepare_network_elements
+from src.data_prepare.constants import BASE_PATH
+from src.data_prepare.processing import build_graph_data, node_publication_csr
+
+
+def test_cached_load_is_lazy(sample_org):
+    built = prepare_network_elements(sample_org)
+    loaded = prepare_network_elements(sample_org)
+
+    for name in ['nodes', 'edges', 'publications']:
+        assert not loaded[name]._cache, name
+    assert 'graph_data' not in loaded.keys()
+
+    graph_data = loaded['graph_data']
+    assert loaded.revision == 1
+    assert graph_data['nodes'] == built['graph_data']['nodes']
+    assert graph_data['edges'] == build_graph_data(built['nodes'], built['edges'])['edges']
+
+
+def test_node_publications_are_stored(sample_org):
+    prepare_network_elements(sample_org)
+    loaded = prepare_network_elements(sample_org)
+
+    pub_offsets = np.asarray(loaded['pub_offsets'])
+    pub_ids = np.asarray(loaded['pub_ids'])
+    rows = {
+        label: sorted(pub_ids[pub_offsets[k]:pub_offsets[k + 1]].tolist())
+        for k, label in enumerate(loaded['nodes']['label'])
+    }
+    assert rows == {
+        'иванов и.и.': [1, 2, 3],
+        'петров п.п.': [1, 3],
+        'smith j.': [2],
+        'кузнецов к.к.': [],
+        'orphan x.': [],
+    }
+
+
+def test_source_edited_during_build_is_not_fresh(sample_org, monkeypatch):
+    from src.data_prepare import base
+
+    def build_then_edit(org_id):
+        bundle = build_network_bundle(org_id)
+        with open(os.path.join(BASE_PATH, org_id, 'publications.csv'), 'a', encoding='utf-8') as f:
+            f.write('Сидоров С.С.,G,2024,S,0,g\n')
+        return bundle
+
+    monkeypatch.setattr(base, 'build_network_bundle', build_then_edit)
+    prepare_network_elements(sample_org)
+    assert get_fresh_cache(sample_org) is None
@@ -0,0 +1,91 @@
+"""
+Tests of incremental: merging rows appended to publications.csv into
+the cached bundle gives the same tables as a full rebuild.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_prepare.base import build_network_bundle, get_fresh_cache, prepare_network_elements
+from src.data_prepare.constants import BASE_PATH
+from src.data_prepare.incremental import update_network_bundle
+from src.thesaurus_builder import INDEX_FILE
+
+# 'кузнецов к.к.' first appears in the appended rows, 'orphan x.' never
+APPENDED = pd.DataFrame({
+    'Authors': ['Petrov P.P.; Кузнецов К.К.', 'Smith J.A.; Кузнецов К.', 'Иванов И.И.'],
+    'Title': ['D', 'E', 'F'],
+    'Year': [2021, 2022, 2017],
+    'Source title': ['T', 'U', 'U'],
+    'Cited by': [2, 0, 5],
+    'Link': ['d', 'e', 'f'],
+})
+# Rows without authors
+APPENDED_ANONYMOUS = pd.DataFrame({
+    'Authors': [None, None],
+    'Title': ['G', 'H'],
+    'Year': [2023, 2023],
+    'Source title': ['U', 'U'],
+    'Cited by': [0, 1],
+    'Link': ['g', 'h'],
+})
+
+
+def author_publications(bundle: dict) -> dict:
+    """Author name -> sorted pub_ids of the bundle's incidence."""
+    names = bundle['tables']['authors']['name'].tolist()
+    offsets = np.asarray(bundle['arrays']['author_offsets'])
+    pub_ids = np.asarray(bundle['arrays']['author_pub_ids'])
+    return {
+        name: sorted(pub_ids[offsets[k]:offsets[k + 1]].tolist())
+        for k, name in enumerate(names)
+    }
+
+
+@pytest.mark.parametrize('appended', [APPENDED, APPENDED_ANONYMOUS], ids=['authors', 'anonymous'])
+def test_append_then_update_equals_full_rebuild(sample_org, appended):
+    prepare_network_elements(sample_org)
+
+    appended.to_csv(os.path.join(BASE_PATH, sample_org, 'publications.csv'), mode='a', header=False, index=False)
+    updated = update_network_bundle(sample_org)
+    assert updated is not None
+
+    # The full rebuild reads the thesaurus extended by the update
+    rebuilt = build_network_bundle(sample_org)
+
+    for name in ['nodes', 'edges', 'publications']:
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(updated['tables'][name]).reset_index(drop=True),
+            pd.DataFrame(rebuilt['tables'][name]).reset_index(drop=True),
+            check_dtype=False,
+        )
+    assert author_publications(updated) == author_publications(rebuilt)
+
+    # Indexes derived from nodes and edges are carried over
+    for name, values in rebuilt['arrays'].items():
+        if not name.startswith('author_'):
+            np.testing.assert_array_equal(np.asarray(updated['arrays'][name]), values, err_msg=name)
+    for key in ['clusters', 'metrics_bounds', 'num_publication', 'num_cites', 'h_index', 'years', 'counts_publication_by_year']:
+        assert updated['meta'][key] == rebuilt['meta'][key], key
+    assert np.isnan(updated['tables']['nodes'].set_index('label').loc['orphan x.', 'Last_pub_year'])
+
+
+def test_thesaurus_without_index_needs_full_rebuild(sample_org):
+    prepare_network_elements(sample_org)
+    # A thesaurus built before it had an index
+    os.remove(os.path.join(BASE_PATH, sample_org, INDEX_FILE))
+
+    APPENDED.to_csv(os.path.join(BASE_PATH, sample_org, 'publications.csv'), mode='a', header=False, index=False)
+    assert update_network_bundle(sample_org) is None
+
+
+def test_incremental_update_is_fresh(sample_org):
+    prepare_network_elements(sample_org)
+    APPENDED.to_csv(os.path.join(BASE_PATH, sample_org, 'publications.csv'), mode='a', header=False, index=False)
+
+    result = prepare_network_elements(sample_org)
+    assert result['num_publication'] == 6
+    # The manifest covers the thesaurus extended by the update
+    assert get_fresh_cache(sample_org) is not None
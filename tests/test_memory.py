@@ -0,0 +1,63 @@
+"""
+Tests of memory: the org cache validates entries against the source
+signature taken before loading, runs one load per org at a time and
+charges lazily loaded data.
+"""
+import os
+import threading
+import time
+
+from src.data_prepare.base import prepare_network_elements
+from src.data_prepare.memory import OrgCache
+from src.data_prepare.utils import get_source_paths
+
+
+def test_sources_changed_during_load_are_reloaded(sample_org):
+    def loader(org_id):
+        result = prepare_network_elements(org_id)
+        # The source changes while the load runs
+        path = get_source_paths(org_id)['nodes']
+        os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+        return result
+
+    cache = OrgCache(1 << 30, loader=loader)
+    cache.get(sample_org)
+    cache.get(sample_org)
+    assert cache.misses == 2
+
+
+def test_concurrent_gets_share_one_load(sample_org):
+    calls = []
+
+    def loader(org_id):
+        calls.append(org_id)
+        time.sleep(0.05)
+        return {'org': org_id}
+
+    cache = OrgCache(1 << 30, loader=loader)
+    threads = [threading.Thread(target=cache.get, args=(sample_org,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [sample_org]
+
+    # The lock of the org outlives its loads
+    lock = cache._loading[sample_org]
+    cache.invalidate()
+    cache.get(sample_org)
+    assert cache._loading[sample_org] is lock
+    assert len(calls) == 2
+
+
+def test_lazy_data_is_charged(sample_org):
+    prepare_network_elements(sample_org)
+    cache = OrgCache(1 << 30)
+    result = cache.get(sample_org)
+    stored = cache.stats()['entries'][sample_org]
+    # Tables are charged in full before any column is read
+    assert stored >= sum(result[name].memory_usage() for name in ['nodes', 'edges', 'publications']) > 0
+
+    result['graph_data']
+    cache.get(sample_org)
+    assert cache.stats()['entries'][sample_org] > stored
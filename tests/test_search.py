@@ -0,0 +1,34 @@
+"""
+Tests of search: substring matches are never truncated, fuzzy matches
+are capped, and short queries match key prefixes.
+"""
+from src.data_prepare.columnar import load_bundle, prefix_arrays, save_bundle, select_arrays
+from src.data_prepare.search import build_search_index, search_authors
+
+LABELS = ['иванов и.и.', 'ivanova a.', 'petrov p.', 'ivanenko v.', 'sivanov s.'] + [
+    f'ivanov{k} x.' for k in range(5)
+]
+INDEX = build_search_index(LABELS)
+
+
+def test_all_substring_matches_are_returned():
+    rows = search_authors(INDEX, 'Иванов', limit=2)
+    assert sorted(rows[:8]) == [0, 1, 4, 5, 6, 7, 8, 9]
+    # Only the fuzzy tail is capped
+    assert rows[8:] == [3]
+
+
+def test_typo_matches():
+    assert search_authors(INDEX, 'petrof')[0] == 2
+
+
+def test_short_query_matches_prefixes():
+    assert search_authors(INDEX, 'pe') == [2]
+    assert search_authors(INDEX, 'ov') == []
+
+
+def test_index_round_trips_through_the_cache(tmp_path):
+    gen_path = save_bundle(str(tmp_path), {}, prefix_arrays('search', INDEX), {})
+    loaded = select_arrays(load_bundle(gen_path)['arrays'], 'search')
+    for query in ['Иванов', 'petrof', 'pe', 'iv']:
+        assert search_authors(loaded, query) == search_authors(INDEX, query)
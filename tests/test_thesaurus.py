@@ -0,0 +1,125 @@
+"""
+Tests of thesaurus_builder: the vectorized builder writes the same
+thesaurus as the original pairwise implementation, blocked pair search
+finds the same pairs as brute force, and updates are idempotent.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.thesaurus_builder import (
+    INDEX_FILE, THESAURUS_FILE, build_author_thesaurus, find_similar_pairs, find_similar_pairs_to,
+    update_author_thesaurus,
+)
+
+# Thesauri written by the original (pairwise) build_author_thesaurus
+SIMILARITY_AUTHORS = [
+    'Иванов И.И.; Петров П.П.; Smith J.',
+    'Иванов И.; Петрова А.А.; Smith J.A.',
+    'Ivanov I.I.; Петров П.; Сидоров С.С.',
+    'Сидорова С.С.; Smyth J.; Кузнецов К.К.',
+    'Кузнецов К.; Kuznetsov K.K.; Петров П.П.',
+    'Сидоров С.; Ivanov I.; et al.',
+]
+SIMILARITY_THESAURUS = (
+    'Label\tReplace by\n'
+    'Иванов И.\tИванов И.И.\n'
+    'Ivanov I.I.\tИванов И.И.\n'
+    'Ivanov I.\tИванов И.И.\n'
+    'Петров П.\tПетров П.П.\n'
+    'Smith J.A.\tSmith J.\n'
+    'Сидоров С.\tСидоров С.С.\n'
+    'Кузнецов К.\tКузнецов К.К.\n'
+    'Kuznetsov K.K.\tКузнецов К.К.\n'
+)
+
+ID_AUTHORS = ['Иванов И.И.; Петров П.П.', 'Ivanov I.; Петров П.', 'Иванов И.; Sidorov S.', 'Petrov P.P.']
+ID_IDS = ['1; 2', '1; 2', '1; 3', '2']
+ID_THESAURUS = (
+    'Label\tReplace by\n'
+    'Ivanov I.\tИванов И.И.\n'
+    'Петров П.\tПетров П.П.\n'
+    'Иванов И.\tИванов И.И.\n'
+    'Petrov P.P.\tПетров П.П.\n'
+)
+
+
+def write_publications(org_id: str, df: pd.DataFrame):
+    os.makedirs(os.path.join('org_data', 'processed', org_id), exist_ok=True)
+    df.to_csv(os.path.join('org_data', 'processed', org_id, 'publications.csv'), index=False)
+
+
+def read_thesaurus(org_id: str) -> str:
+    with open(os.path.join('org_data', 'processed', org_id, THESAURUS_FILE), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_similarity_thesaurus_matches_original(workdir):
+    write_publications('1', pd.DataFrame({'Authors': SIMILARITY_AUTHORS, 'Year': 2020}))
+    build_author_thesaurus('1')
+    assert read_thesaurus('1') == SIMILARITY_THESAURUS
+
+
+def test_id_thesaurus_matches_original(workdir):
+    write_publications('1', pd.DataFrame({'Authors': ID_AUTHORS, 'Author(s) ID': ID_IDS, 'Year': 2020}))
+    build_author_thesaurus('1')
+    assert read_thesaurus('1') == ID_THESAURUS
+
+
+def test_repeated_update_appends_labels_once(workdir):
+    write_publications('1', pd.DataFrame({'Authors': SIMILARITY_AUTHORS[:3], 'Year': 2020}))
+    build_author_thesaurus('1')
+    index_file = os.path.join('org_data', 'processed', '1', INDEX_FILE)
+    with open(index_file, 'rb') as f:
+        saved_index = f.read()
+
+    added = pd.DataFrame({'Authors': SIMILARITY_AUTHORS[3:], 'Year': 2021})
+    assert update_author_thesaurus('1', added)
+    updated = read_thesaurus('1')
+
+    # As if the update was interrupted before the index was saved
+    with open(index_file, 'wb') as f:
+        f.write(saved_index)
+    assert update_author_thesaurus('1', added)
+    assert read_thesaurus('1') == updated
+
+
+def synthetic_surnames(count: int, seed: int = 0) -> np.ndarray:
+    """Random surnames with near-duplicates (typos, feminine endings)."""
+    rng = np.random.RandomState(seed)
+    syllables = ['iv', 'an', 'ov', 'pet', 'rov', 'kuz', 'net', 'sov', 'smi', 'sid', 'or', 'ko', 'va',
+                 'lev', 'ich', 'en', 'mak', 'zh', 'uk', 'bel', 'tsev', 'in', 'ski', 'gor', 'nik', 'son']
+    base = [''.join(rng.choice(syllables, rng.randint(2, 5))) for _ in range(count)]
+    variants = []
+    for name in rng.choice(base, count // 2):
+        k = rng.randint(len(name))
+        variants.append(name[:k] + rng.choice(list('aeiouxyz')) + name[k + 1:])
+    variants += [name + 'a' for name in rng.choice(base, count // 4)]
+    return np.array(sorted(set(base + variants)), dtype=object)
+
+
+def brute_force_pairs(similarity: np.ndarray, row_lengths: np.ndarray, col_lengths: np.ndarray,
+                      threshold: float, max_diff: int) -> set:
+    close = (similarity >= threshold) & (np.abs(row_lengths[:, None] - col_lengths[None, :]) <= max_diff)
+    return set(zip(*np.nonzero(close)))
+
+
+def test_similar_pairs_match_brute_force():
+    surnames = synthetic_surnames(1500)
+    lengths = np.array([len(s) for s in surnames])
+    matrix = TfidfVectorizer(analyzer='char', ngram_range=(1, 2)).fit_transform(surnames)
+    similarity = cosine_similarity(matrix)
+    expected = {(u, v) for u, v in brute_force_pairs(similarity, lengths, lengths, 0.8, 3) if u <= v}
+
+    first, second, found = find_similar_pairs(matrix, lengths, 0.8, 3, chunk_size=100)
+    assert set(zip(first.tolist(), second.tolist())) == expected
+    assert np.allclose(found, similarity[first, second])
+
+    queries = np.arange(0, len(surnames), 7)
+    rows, cols, found = find_similar_pairs_to(matrix[queries], lengths[queries], matrix, lengths, 0.8, 3)
+    expected = brute_force_pairs(similarity[queries], lengths[queries], lengths, 0.8, 3)
+    assert set(zip(rows.tolist(), cols.tolist())) == expected
+    assert np.allclose(found, similarity[queries][rows, cols])
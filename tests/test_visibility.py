@@ -0,0 +1,65 @@
+"""
+Tests of visibility: server-side filtering hides the nodes and edges
+the stylesheet would hide, and deltas between filter states add up.
+"""
+import numpy as np
+import pandas as pd
+
+from src.data_prepare.visibility import build_edge_index, visibility_delta, visible_edges, visible_nodes
+
+NODES = pd.DataFrame({
+    'label': ['a', 'b', 'c', 'd', 'e'],
+    'max_edge_weight': [5, 5, 3, 1, 0],
+    'Citations': [10.0, 20.0, 30.0, np.nan, 40.0],
+})
+EDGES = pd.DataFrame({
+    'first_author': ['a', 'a', 'b', 'c'],
+    'second_author': ['b', 'c', 'c', 'd'],
+    'weight': [5, 3, 2, 1],
+})
+EDGE_INDEX = build_edge_index(NODES, EDGES)
+
+
+def state(threshold=None, isolates=True, metric=None, vmin=None, vmax=None) -> dict:
+    return {'threshold': threshold, 'isolates': isolates, 'metric': metric, 'vmin': vmin, 'vmax': vmax}
+
+
+def visible(filter_state: dict):
+    """Visible node labels and edge IDs under 'filter_state'."""
+    mask = visible_nodes(NODES, filter_state)
+    return NODES['label'][mask].tolist(), visible_edges(EDGE_INDEX, mask, filter_state).tolist()
+
+
+def test_threshold_and_isolates():
+    assert visible(state(threshold=3)) == (['a', 'b', 'c', 'd', 'e'], [0, 1])
+    assert visible(state(threshold=3, isolates=False)) == (['a', 'b', 'c'], [0, 1])
+
+
+def test_metric_limits():
+    # NaN metric values are never outside the limits
+    assert visible(state(metric='Citations', vmin=15, vmax=35)) == (['b', 'c', 'd'], [2, 3])
+
+
+def test_metric_limits_clamped_to_bounds():
+    # Limits above the data maximum leave an empty range: no rule, as in the stylesheet
+    assert visible(state(metric='Citations', vmin=50, vmax=60)) == (['a', 'b', 'c', 'd', 'e'], [0, 1, 2, 3])
+    # Limits partly outside the data still apply
+    assert visible(state(metric='Citations', vmin=25, vmax=100)) == (['c', 'd', 'e'], [3])
+
+
+def test_delta_round_trip():
+    old = state(threshold=2, isolates=False)
+    new = state(threshold=1, metric='Citations', vmin=15, vmax=35)
+    labels, ids = visible(old)
+    rows = set(NODES.index[NODES['label'].isin(labels)])
+
+    forward = visibility_delta(NODES, EDGES, EDGE_INDEX, old, new)
+    rows_new = (rows | set(forward['showNodes'])) - set(forward['hideNodes'])
+    ids_new = (set(ids) | set(forward['addEdges']['id'])) - set(forward['removeEdges'])
+    labels_new, expected_ids = visible(new)
+    assert rows_new == set(NODES.index[NODES['label'].isin(labels_new)])
+    assert ids_new == set(expected_ids)
+
+    back = visibility_delta(NODES, EDGES, EDGE_INDEX, new, old)
+    assert (rows_new | set(back['showNodes'])) - set(back['hideNodes']) == rows
+    assert (ids_new | set(back['addEdges']['id'])) - set(back['removeEdges']) == set(ids)